@@ -22,7 +22,7 @@ excluded_imports = [
     'PySide6.QtXml', 'PySide6.QtXmlPatterns',
     
     # Librerie scientifiche non necessarie
-    'numpy', 'pandas', 'scipy', 'matplotlib', 'scikit_learn', 'tensorflow', 'torch',
+    'pandas', 'scipy', 'matplotlib', 'scikit_learn', 'tensorflow', 'torch',
     
     # Interfacce grafiche non utilizzate
     'tkinter', 'tcl', 'tk', 'ttk', 'wx', 'kivy', 'pyglet', 'pygame',
@@ -37,14 +37,14 @@ excluded_imports = [
     'email', 'http', 'xml', 'html', 'ftplib', 'poplib', 'smtplib', 'imaplib',
     'urllib3', 'requests', 'aiohttp', 'asyncio', 'twisted', 'websocket',
     
-    # Concorrenza non necessaria
-    'concurrent', 'multiprocessing', 'multiprocess', 'joblib',
+    # Concorrenza non necessaria (concurrent e multiprocessing servono all'analisi del volume)
+    'multiprocess', 'joblib',
     
     # Documentazione e debug
     'pdb', 'ipdb', 'pudb', 'pygments', 'sphinx', 'pydoc', 'pylint', 'flake8',
     
-    # Database
-    'sqlalchemy', 'sqlite3', 'pymysql', 'psycopg2', 'pymongo', 'redis',
+    # Database (sqlite3 serve all'indice della libreria)
+    'sqlalchemy', 'pymysql', 'psycopg2', 'pymongo', 'redis',
     
     # Altro
     'notebook', 'jupyter', 'IPython', 'spyder'  # qtpy is not used in this app
@@ -0,0 +1,328 @@
+"""
+Analysis Module
+
+Background loudness analysis used to normalize the level of library sounds.
+Each sound is measured in a worker process: integrated loudness following
+ITU-R BS.1770 (K-weighting applied per 100 ms segment in the frequency
+domain, 400 ms gated blocks) and sample peak, all with vectorized NumPy.
+Results are kept in a persistent index keyed by file path, size and
+modification time, so only new or changed files are measured again; files
+that cannot be measured are recorded too and skipped until they change.
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+from PySide6.QtCore import QObject, QStandardPaths, Signal
+
+
+SEGMENT_SECONDS = 0.1  # Blocks are 400 ms long and overlap by 75%, so they are built from 100 ms segments
+BLOCK_SEGMENTS = 4
+ABSOLUTE_GATE = -70.0  # LUFS
+RELATIVE_GATE = -10.0  # LU below the absolute-gated loudness
+CHUNK_SEGMENTS = 300  # Segments measured per pass, to bound memory on long files
+
+TARGET_LOUDNESS = -23.0  # LUFS every sound is normalized to
+MAX_NORMALIZATION_GAIN = 4.0
+PEAK_CEILING = 1.0  # Normalization never pushes the sample peak above full scale
+
+
+def _biquad_power(b, a, frequencies: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Evaluate |H|^2 of a biquad at the given frequencies."""
+    z = np.exp(-2j * np.pi * frequencies / sample_rate)
+    numerator = b[0] + b[1] * z + b[2] * z * z
+    denominator = a[0] + a[1] * z + a[2] * z * z
+    return np.abs(numerator / denominator) ** 2
+
+
+def k_weighting(frequencies: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Get the power response of the BS.1770 K-weighting filter at the given frequencies."""
+    # Stage 1: high shelf, +4 dB above about 1.5 kHz
+    gain, q, fc = 4.0, 1 / np.sqrt(2), 1500.0
+    amp = 10 ** (gain / 40)
+    w0 = 2 * np.pi * fc / sample_rate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    shelf_b = (amp * ((amp + 1) + (amp - 1) * cos_w0 + 2 * np.sqrt(amp) * alpha),
+               -2 * amp * ((amp - 1) + (amp + 1) * cos_w0),
+               amp * ((amp + 1) + (amp - 1) * cos_w0 - 2 * np.sqrt(amp) * alpha))
+    shelf_a = ((amp + 1) - (amp - 1) * cos_w0 + 2 * np.sqrt(amp) * alpha,
+               2 * ((amp - 1) - (amp + 1) * cos_w0),
+               (amp + 1) - (amp - 1) * cos_w0 - 2 * np.sqrt(amp) * alpha)
+
+    # Stage 2: high pass at about 38 Hz
+    q, fc = 0.5, 38.0
+    w0 = 2 * np.pi * fc / sample_rate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    highpass_b = ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2)
+    highpass_a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+
+    return (_biquad_power(shelf_b, shelf_a, frequencies, sample_rate)
+            * _biquad_power(highpass_b, highpass_a, frequencies, sample_rate))
+
+
+def measure(source, sample_rate: int) -> Optional[Dict[str, float]]:
+    """
+    Measure the loudness and peak of a PCM source.
+
+    Args:
+        source: Object with ``frames``, ``channels`` and ``read_into(start, out)``
+        sample_rate: Sample rate of the source
+
+    Returns:
+        Dictionary with 'loudness' (LUFS), 'peak' (linear) and 'duration' (seconds),
+        or None if the source holds less than one block
+    """
+    segment = int(sample_rate * SEGMENT_SECONDS)
+    segments = source.frames // segment
+    if segments < BLOCK_SEGMENTS:
+        return None
+
+    weights = k_weighting(np.fft.rfftfreq(segment, 1.0 / sample_rate), sample_rate)
+    powers = np.empty(segments, dtype=np.float64)
+    peak = 0.0
+    buffer = np.empty((CHUNK_SEGMENTS * segment, source.channels), dtype=np.float32)
+    for first in range(0, segments, CHUNK_SEGMENTS):
+        count = min(CHUNK_SEGMENTS, segments - first)
+        chunk = buffer[:count * segment]
+        source.read_into(first * segment, chunk)
+        peak = max(peak, float(np.abs(chunk).max()))
+        # Parseval: the mean square of the filtered segment is its weighted spectrum energy
+        spectra = np.fft.rfft(chunk.reshape(count, segment, source.channels), axis=1)
+        energy = (np.abs(spectra) ** 2) * weights[None, :, None]
+        nyquist = -1 if segment % 2 == 0 else None
+        energy[:, 1:nyquist] *= 2  # One-sided spectrum
+        powers[first:first + count] = energy.sum(axis=(1, 2)) / (segment * segment)
+
+    # 400 ms blocks with 75% overlap, as the mean of four consecutive segments
+    cumulative = np.concatenate(([0.0], np.cumsum(powers)))
+    blocks = (cumulative[BLOCK_SEGMENTS:] - cumulative[:-BLOCK_SEGMENTS]) / BLOCK_SEGMENTS
+    with np.errstate(divide="ignore"):
+        block_loudness = -0.691 + 10 * np.log10(blocks)
+
+    gated = blocks[block_loudness > ABSOLUTE_GATE]
+    if len(gated) == 0:
+        loudness = float("-inf")
+    else:
+        threshold = -0.691 + 10 * np.log10(gated.mean()) + RELATIVE_GATE
+        gated = blocks[block_loudness > max(ABSOLUTE_GATE, threshold)]
+        loudness = float(-0.691 + 10 * np.log10(gated.mean()))
+
+    return {"loudness": loudness, "peak": peak, "duration": source.frames / sample_rate}
+
+
+def normalization_gain(result: Optional[Dict[str, float]], target: float = TARGET_LOUDNESS) -> float:
+    """Get the linear gain bringing a measured sound to the target loudness without clipping its peak."""
+    if not result or not np.isfinite(result["loudness"]):
+        return 1.0
+    gain = 10 ** ((target - result["loudness"]) / 20)
+    if result["peak"] > 0:
+        gain = min(gain, PEAK_CEILING / result["peak"])
+    return float(min(gain, MAX_NORMALIZATION_GAIN))
+
+
+_worker_app = None
+
+
+def _init_worker() -> None:
+    """Give each worker process the Qt application object decoding needs."""
+    global _worker_app
+    from PySide6.QtCore import QCoreApplication
+    _worker_app = QCoreApplication.instance() or QCoreApplication([])
+
+
+def _analyze_file(file_path: str, sample_rate: int, channels: int, cache_dir: str) -> Optional[Dict[str, float]]:
+    """Measure one file in a worker process, reading it from the PCM cache when possible."""
+    from core.pcm_cache import PCMCache
+
+    source = PCMCache(cache_dir).open(file_path, sample_rate, channels)
+    if source is None:
+        from core.decoder import decode_file
+        from core.engine import ArraySource
+
+        data = decode_file(file_path, sample_rate, channels)
+        if data is None:
+            return None
+        source = ArraySource(data)
+    return measure(source, sample_rate)
+
+
+class LoudnessIndex:
+    """Persistent loudness measurements keyed by file path, size and modification time."""
+
+    FILE_NAME = "loudness.json"
+    VERSION = 1
+
+    def __init__(self, index_path: str = None):
+        if index_path is None:
+            base_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+            index_path = os.path.join(base_dir or os.getcwd(), self.FILE_NAME)
+        self.index_path = Path(index_path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._load()
+
+    @staticmethod
+    def _signature(file_path: str) -> Optional[list]:
+        """Size and modification time identifying the measured version of a file."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _load(self) -> None:
+        """Read the index from disk, starting empty if it is missing or unreadable."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.VERSION:
+            self._entries = data.get("files", {})
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        with self._lock:
+            data = {"version": self.VERSION, "files": dict(self._entries)}
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"Error saving loudness index: {e}")
+
+    def _current(self, file_path: str) -> Optional[dict]:
+        """Get the entry of a file if it was made for the file's current version."""
+        key = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry["signature"] != self._signature(file_path):
+            return None
+        return entry
+
+    def get(self, file_path: str) -> Optional[Dict[str, float]]:
+        """Get the measurement of a file if it is still current and could be measured."""
+        entry = self._current(file_path)
+        return entry["result"] if entry is not None else None
+
+    def set(self, file_path: str, result: Optional[Dict[str, float]]) -> None:
+        """Record the measurement of a file, or None if it cannot be measured."""
+        signature = self._signature(file_path)
+        if signature is None:
+            return
+        with self._lock:
+            self._entries[os.path.abspath(file_path)] = {"signature": signature, "result": result}
+
+    def stale(self, file_paths: Iterable[str]) -> List[str]:
+        """Get the files that are new or changed since they were measured."""
+        return [path for path in file_paths if self._current(path) is None]
+
+    def prune(self, known_files: Iterable[str]) -> None:
+        """Forget files that left the library."""
+        known = {os.path.abspath(path) for path in known_files}
+        with self._lock:
+            for key in [key for key in self._entries if key not in known]:
+                del self._entries[key]
+
+    def normalization_gain(self, file_path: str) -> float:
+        """Get the normalization gain of a file, or unity if it has not been measured."""
+        return normalization_gain(self.get(file_path))
+
+
+class LoudnessAnalyzer(QObject):
+    """Measures library sounds across a process pool in the background."""
+
+    analyzed = Signal(str)  # Emitted with the path of each newly measured sound
+    finished = Signal(int)  # Emitted with the number of sounds measured once a batch is done
+
+    def __init__(self, index: LoudnessIndex, sample_rate: int, channels: int, cache_dir: str,
+                 max_workers: int = None, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._measured = 0
+        self._in_flight: Set[str] = set()  # Files submitted and not done yet
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Check if a batch is being analyzed."""
+        return self._pending > 0
+
+    def analyze(self, file_paths: Iterable[str]) -> int:
+        """
+        Measure every new or changed file in the background.
+
+        Files already being measured are not queued again.
+
+        Returns:
+            Number of files queued
+        """
+        stale = self.index.stale(dict.fromkeys(file_paths))
+        with self._lock:
+            queued = [path for path in stale if path not in self._in_flight]
+            self._in_flight.update(queued)
+            self._pending += len(queued)
+        if not queued:
+            return 0
+        if self._executor is None:
+            # Spawned workers do not inherit the audio and Qt threads of this process
+            self._executor = ProcessPoolExecutor(self.max_workers, multiprocessing.get_context("spawn"),
+                                                 initializer=_init_worker)
+        for path in queued:
+            future = self._executor.submit(_analyze_file, path, self.sample_rate, self.channels, self.cache_dir)
+            future.add_done_callback(lambda f, p=path: self._on_done(p, f))
+        return len(queued)
+
+    def _on_done(self, file_path: str, future) -> None:
+        """Record one result (executor thread) and report it to the GUI thread."""
+        result = None
+        completed = False  # The worker got through the file, whether or not it could be measured
+        if not future.cancelled():
+            try:
+                result = future.result()
+                completed = True
+            except Exception as e:
+                print(f"Error analyzing {file_path}: {e}")
+        if completed:
+            # An unreadable or too short file is recorded as such, so it is not decoded again until it changes
+            self.index.set(file_path, result)
+        with self._lock:
+            self._in_flight.discard(file_path)
+            self._pending -= 1
+            if result is not None:
+                self._measured += 1
+            done = self._pending == 0
+            measured = self._measured
+            if done:
+                self._measured = 0
+        try:
+            if result is not None:
+                self.analyzed.emit(file_path)
+            if done:
+                self.index.save()
+                self.finished.emit(measured)
+        except RuntimeError:
+            pass  # Analyzer was deleted while the pool was still working
+
+    def shutdown(self) -> None:
+        """Cancel queued work and stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.index.save()
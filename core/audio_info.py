@@ -0,0 +1,175 @@
+"""
+Audio Info Module
+
+Reads duration, sample rate, channel count and bitrate of sound files from
+their headers, without decoding any audio. Supports RIFF/WAVE, Ogg
+(Vorbis and Opus) and MPEG audio (with Xing/Info/VBRI frame counts or a
+constant-bitrate estimate).
+"""
+
+import os
+import struct
+from typing import Any, Dict, Optional
+
+
+_MP3_BITRATES = {
+    # (MPEG-1, layer) and (MPEG-2/2.5, layer) bitrate tables in kbps
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],   # MPEG-2.5
+}
+
+
+def _info(duration: float, sample_rate: int, channels: int, bitrate: int) -> Dict[str, Any]:
+    """Build the info dictionary returned by probe()."""
+    return {
+        "duration": duration,
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "bitrate": bitrate,
+    }
+
+
+def _probe_wav(f, file_size: int) -> Optional[Dict[str, Any]]:
+    """Read a RIFF/WAVE header."""
+    header = f.read(12)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return None
+    fmt = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, chunk_size = struct.unpack("<4sI", chunk)
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", f.read(16))
+            f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            _, channels, sample_rate, byte_rate, _, _ = fmt
+            data_size = min(chunk_size, file_size - f.tell())
+            duration = data_size / byte_rate if byte_rate else 0.0
+            return _info(duration, sample_rate, channels, byte_rate * 8)
+        else:
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+def _probe_ogg(f, file_size: int) -> Optional[Dict[str, Any]]:
+    """Read the identification header and last granule position of an Ogg stream."""
+    first_page = f.read(4096)
+    if first_page[:4] != b"OggS":
+        return None
+
+    vorbis = first_page.find(b"\x01vorbis")
+    opus = first_page.find(b"OpusHead")
+    if vorbis >= 0:
+        _, channels, sample_rate, _, nominal, _ = struct.unpack_from("<IBIiii", first_page, vorbis + 7)
+        granule_rate = sample_rate
+        pre_skip = 0
+        bitrate = max(0, nominal)
+    elif opus >= 0:
+        _, channels, pre_skip, sample_rate = struct.unpack_from("<BBHI", first_page, opus + 8)
+        granule_rate = 48000  # Opus granules always count 48 kHz samples
+        bitrate = 0
+    else:
+        return None
+
+    tail_size = min(file_size, 65536)
+    f.seek(file_size - tail_size)
+    tail = f.read(tail_size)
+    last_page = tail.rfind(b"OggS")
+    duration = 0.0
+    if last_page >= 0 and last_page + 14 <= len(tail):
+        granule = struct.unpack_from("<q", tail, last_page + 6)[0]
+        if granule > 0:
+            duration = max(0, granule - pre_skip) / granule_rate
+    if not bitrate and duration:
+        bitrate = int(file_size * 8 / duration)
+    return _info(duration, sample_rate or granule_rate, channels, bitrate)
+
+
+def _probe_mp3(f, file_size: int) -> Optional[Dict[str, Any]]:
+    """Read the first MPEG audio frame header and any VBR frame count."""
+    start = 0
+    tag = f.read(10)
+    if tag[:3] == b"ID3" and len(tag) == 10:
+        size = (tag[6] << 21) | (tag[7] << 14) | (tag[8] << 7) | tag[9]
+        start = 10 + size + (10 if tag[5] & 0x10 else 0)
+    f.seek(start)
+    data = f.read(65536)
+
+    for offset in range(len(data) - 4):
+        if data[offset] != 0xFF or (data[offset + 1] & 0xE0) != 0xE0:
+            continue
+        header = struct.unpack_from(">I", data, offset)[0]
+        version_bits = (header >> 19) & 0x3
+        layer_bits = (header >> 17) & 0x3
+        bitrate_index = (header >> 12) & 0xF
+        rate_index = (header >> 10) & 0x3
+        if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+            continue
+
+        version = 1 if version_bits == 3 else 2
+        layer = 4 - layer_bits
+        sample_rate = _MP3_SAMPLE_RATES[version_bits][rate_index]
+        channels = 1 if ((header >> 6) & 0x3) == 3 else 2
+        bitrate = _MP3_BITRATES[(version, layer)][bitrate_index] * 1000
+        if layer == 1:
+            samples_per_frame = 384
+        elif layer == 3 and version == 2:
+            samples_per_frame = 576
+        else:
+            samples_per_frame = 1152
+
+        # Xing/Info header sits after the side information of the first frame
+        side_info = (17 if channels == 1 else 32) if version == 1 else (9 if channels == 1 else 17)
+        xing = offset + 4 + side_info
+        frame_count = None
+        if data[xing:xing + 4] in (b"Xing", b"Info"):
+            flags = struct.unpack_from(">I", data, xing + 4)[0]
+            if flags & 0x1:
+                frame_count = struct.unpack_from(">I", data, xing + 8)[0]
+        elif data[offset + 36:offset + 40] == b"VBRI":
+            frame_count = struct.unpack_from(">I", data, offset + 36 + 14)[0]
+
+        audio_bytes = file_size - start - offset
+        if frame_count:
+            duration = frame_count * samples_per_frame / sample_rate
+            bitrate = int(audio_bytes * 8 / duration) if duration else bitrate
+        else:
+            duration = audio_bytes * 8 / bitrate
+        return _info(duration, sample_rate, channels, bitrate)
+    return None
+
+
+def probe(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read basic stream information from a sound file's headers.
+
+    Args:
+        file_path: Path of the sound file (.wav, .ogg or .mp3)
+
+    Returns:
+        Dictionary with duration (seconds), sample_rate, channels and bitrate
+        (bits per second), or None if the file could not be parsed
+    """
+    probers = {".wav": _probe_wav, ".ogg": _probe_ogg, ".mp3": _probe_mp3}
+    prober = probers.get(os.path.splitext(file_path)[1].lower())
+    if prober is None:
+        return None
+    try:
+        file_size = os.path.getsize(file_path)
+        with open(file_path, "rb") as f:
+            return prober(f, file_size)
+    except (OSError, struct.error) as e:
+        print(f"Error reading audio info from {file_path}: {e}")
+        return None
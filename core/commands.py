@@ -0,0 +1,87 @@
+"""
+Commands Module
+
+Lock-free hand-off of parameter changes from the GUI thread to the audio thread.
+Commands are written into preallocated slots of a single-producer,
+single-consumer ring: the GUI only ever advances the write index and the
+audio thread only the read index, so neither side takes a lock and the audio
+thread never waits on the GUI.
+"""
+
+import time
+from typing import Any, Callable
+
+
+# Track commands, applied by EngineTrack.apply_command
+PLAY = 1
+PAUSE = 2
+STOP = 3
+SET_VOLUME = 4  # value: linear gain
+SET_LOOP = 5  # value: bool
+SET_AUTOMATION = 6  # value: speed index, or None to disable
+SET_SOURCE = 7  # value: (source, loop source)
+SET_TRIM = 8  # value: linear normalization gain
+SET_FADE = 9  # value: (target fade angle, frames to reach it)
+
+# Mixer commands, applied by the audio thread itself
+ADD_TRACK = 10
+REMOVE_TRACK = 11
+PAUSE_MIX = 12  # value: bool
+FIRE_VOICE = 13  # target: track; starts a one-shot voice of its sound
+SET_VOICE_LIMITS = 14  # value: (voices in the whole mix, voices per track)
+SET_AUTO_PLAYBACK = 15  # target: track; value: (interval, interval type, random stream), or None to disable
+SET_MASTER = 16  # value: (master gain, limiter enabled, soft clipper enabled)
+
+
+class CommandRing:
+    """
+    Preallocated single-producer, single-consumer command queue.
+
+    Each slot holds an opcode, a target object and a value. Index updates
+    are single attribute stores, which are atomic under the interpreter lock.
+    """
+
+    DEFAULT_CAPACITY = 4096
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._ops = [0] * capacity
+        self._targets = [None] * capacity
+        self._values = [None] * capacity
+        self._write = 0  # Only advanced by the producer
+        self._read = 0  # Only advanced by the consumer
+
+    def __len__(self) -> int:
+        return self._write - self._read
+
+    def push(self, op: int, target: Any = None, value: Any = None) -> None:
+        """Queue a command (producer side). Waits briefly only if the consumer has fallen a full ring behind."""
+        write = self._write
+        while write - self._read >= self.capacity:
+            time.sleep(0.001)
+        index = write % self.capacity
+        self._ops[index] = op
+        self._targets[index] = target
+        self._values[index] = value
+        self._write = write + 1  # Publish only once the slot is filled
+
+    def drain(self, apply: Callable[[int, Any, Any], None]) -> int:
+        """
+        Apply every queued command in order (consumer side).
+
+        Returns:
+            Number of commands applied
+        """
+        read = self._read
+        write = self._write
+        count = write - read
+        while read < write:
+            index = read % self.capacity
+            target = self._targets[index]
+            value = self._values[index]
+            self._targets[index] = None  # Release references held by the slot
+            self._values[index] = None
+            apply(self._ops[index], target, value)
+            read += 1
+        self._read = read
+        return count
@@ -0,0 +1,188 @@
+"""
+Audio Decoder Module
+
+Decodes sound files to float32 PCM frames using QAudioDecoder.
+Decoding runs synchronously on the calling thread with a private event loop,
+so it is meant to be called from worker threads rather than the GUI thread.
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+from PySide6.QtCore import QEventLoop, QUrl
+from PySide6.QtMultimedia import QAudioBuffer, QAudioDecoder, QAudioFormat
+
+from core.audio_info import probe
+from core.resample import resample
+
+
+def buffer_to_array(buffer: QAudioBuffer) -> np.ndarray:
+    """Convert a QAudioBuffer to a float32 array shaped (frames, channels)."""
+    fmt = buffer.format()
+    channels = max(1, fmt.channelCount())
+    sample_format = fmt.sampleFormat()
+    raw = buffer.constData()
+
+    if sample_format == QAudioFormat.SampleFormat.Float:
+        samples = np.frombuffer(raw, dtype=np.float32, count=buffer.sampleCount()).copy()
+    elif sample_format == QAudioFormat.SampleFormat.Int16:
+        samples = np.frombuffer(raw, dtype=np.int16, count=buffer.sampleCount()).astype(np.float32)
+        samples *= 1.0 / 32768.0
+    elif sample_format == QAudioFormat.SampleFormat.Int32:
+        samples = np.frombuffer(raw, dtype=np.int32, count=buffer.sampleCount()).astype(np.float32)
+        samples *= 1.0 / 2147483648.0
+    elif sample_format == QAudioFormat.SampleFormat.UInt8:
+        samples = np.frombuffer(raw, dtype=np.uint8, count=buffer.sampleCount()).astype(np.float32)
+        samples = (samples - 128.0) * (1.0 / 128.0)
+    else:
+        return np.zeros((0, channels), dtype=np.float32)
+
+    frames = len(samples) // channels
+    return samples[:frames * channels].reshape(frames, channels)
+
+
+def convert_channels(data: np.ndarray, channels: int) -> np.ndarray:
+    """Up- or down-mix frames to the requested channel count."""
+    source_channels = data.shape[1]
+    if source_channels == channels:
+        return data
+    if source_channels == 1:
+        return np.repeat(data, channels, axis=1)
+    if channels == 1:
+        return data.mean(axis=1, keepdims=True, dtype=np.float32)
+    # Keep the first channels and fold any extra ones into them
+    mixed = data[:, :channels].copy()
+    for extra in range(channels, source_channels):
+        mixed[:, extra % channels] += data[:, extra]
+    mixed *= channels / source_channels
+    return mixed
+
+
+def convert_rate(data: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Linearly resample frames when the decoder did not honour the requested rate."""
+    if source_rate == target_rate or len(data) == 0:
+        return data
+    target_frames = int(round(len(data) * target_rate / source_rate))
+    positions = np.arange(target_frames, dtype=np.float64) * (source_rate / target_rate)
+    source_positions = np.arange(len(data), dtype=np.float64)
+    resampled = np.empty((target_frames, data.shape[1]), dtype=np.float32)
+    for channel in range(data.shape[1]):
+        resampled[:, channel] = np.interp(positions, source_positions, data[:, channel])
+    return resampled
+
+
+def convert_buffer(buffer: QAudioBuffer, sample_rate: int, channels: int) -> np.ndarray:
+    """Convert a decoded buffer to float32 frames in the requested rate and channel count."""
+    chunk = buffer_to_array(buffer)
+    chunk = convert_channels(chunk, channels)
+    return convert_rate(chunk, buffer.format().sampleRate(), sample_rate)
+
+
+def create_decoder(file_path: str, sample_rate: int, channels: int) -> QAudioDecoder:
+    """Create a QAudioDecoder for a file, asking for float32 output in the given format."""
+    fmt = QAudioFormat()
+    fmt.setSampleRate(sample_rate)
+    fmt.setChannelCount(channels)
+    fmt.setSampleFormat(QAudioFormat.SampleFormat.Float)
+
+    decoder = QAudioDecoder()
+    decoder.setAudioFormat(fmt)
+    decoder.setSource(QUrl.fromLocalFile(file_path))
+    return decoder
+
+
+def decode_stream(file_path: str, sample_rate: int, channels: int,
+                  on_chunk: Callable[[np.ndarray], bool]) -> bool:
+    """
+    Decode a sound file chunk by chunk without keeping it in memory.
+
+    Args:
+        file_path: Path of the sound file
+        sample_rate: Sample rate of the chunks
+        channels: Channel count of the chunks
+        on_chunk: Called with each float32 chunk shaped (frames, channels);
+            returning False stops decoding early
+
+    Returns:
+        True if the file was decoded to the end (or stopped by on_chunk), False on error
+    """
+    decoder = create_decoder(file_path, sample_rate, channels)
+
+    errors = []
+    done = []
+    loop = QEventLoop()
+
+    def on_buffer_ready():
+        while not done and decoder.bufferAvailable():
+            buffer = decoder.read()
+            if buffer.isValid() and on_chunk(convert_buffer(buffer, sample_rate, channels)) is False:
+                on_finished()
+
+    def on_finished():
+        done.append(True)
+        loop.quit()
+
+    def on_error(error):
+        errors.append(decoder.errorString())
+        on_finished()
+
+    decoder.bufferReady.connect(on_buffer_ready)
+    decoder.finished.connect(on_finished)
+    decoder.error.connect(on_error)
+
+    decoder.start()
+    if not done:
+        loop.exec()
+    on_buffer_ready()
+    decoder.stop()
+
+    if errors:
+        print(f"Error decoding {file_path}: {errors[0]}")
+        return False
+    return True
+
+
+def decode_file(file_path: str, sample_rate: int, channels: int) -> Optional[np.ndarray]:
+    """
+    Decode a whole sound file to float32 frames.
+
+    Args:
+        file_path: Path of the sound file
+        sample_rate: Sample rate of the returned frames
+        channels: Channel count of the returned frames
+
+    Returns:
+        Array shaped (frames, channels), or None if decoding failed
+    """
+    chunks = []
+    if not decode_stream(file_path, sample_rate, channels, chunks.append):
+        return None
+    if not chunks:
+        return np.zeros((0, channels), dtype=np.float32)
+    return np.ascontiguousarray(np.concatenate(chunks), dtype=np.float32)
+
+
+def decode_converted(file_path: str, sample_rate: int, channels: int) -> Optional[np.ndarray]:
+    """
+    Decode a whole sound file in its own format and convert it once.
+
+    Unlike decode_file, the backend is not asked to convert: the file is
+    decoded at its native rate and channel count, then down- or up-mixed and
+    resampled in one pass with the windowed-sinc resampler.
+
+    Args:
+        file_path: Path of the sound file
+        sample_rate: Sample rate of the returned frames
+        channels: Channel count of the returned frames
+
+    Returns:
+        Array shaped (frames, channels), or None if decoding failed
+    """
+    info = probe(file_path)
+    if not info or not info["sample_rate"] or not info["channels"]:
+        return decode_file(file_path, sample_rate, channels)
+    data = decode_file(file_path, info["sample_rate"], info["channels"])
+    if data is None:
+        return None
+    data = convert_channels(data, channels)
+    return np.ascontiguousarray(resample(data, info["sample_rate"], sample_rate), dtype=np.float32)
@@ -0,0 +1,160 @@
+"""
+Diagnostics Module
+
+Runtime instrumentation of the audio output.
+The audio thread records into plain counters and a fixed-size histogram,
+which costs two clock reads and a few integer updates per period and takes
+no lock. Readers only ever look at snapshots, so nothing is aggregated or
+formatted unless the diagnostics panel is open or an export is requested.
+"""
+
+import csv
+import json
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class AudioDiagnostics:
+    """Counters written by the audio thread and read as snapshots from the GUI."""
+
+    BIN_US = 50  # Width of a block time histogram bin in microseconds
+    BINS = 1000  # Bins up to 50 ms; slower blocks land in one overflow bin
+    MAX_EVENTS = 200
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear every counter."""
+        self.started = time.time()
+        self.blocks = 0
+        self.underruns = 0
+        self.histogram = [0] * (self.BINS + 1)
+        self.max_block_us = 0
+        self.period_us = 0
+        self.buffer_bytes = 0
+        self.fill_bytes = 0
+        self.min_fill_bytes: Optional[int] = None
+        self.voices = 0
+        self.max_voices = 0
+        self.sink_state = ""
+        self.sink_errors = 0
+        self.events = deque(maxlen=self.MAX_EVENTS)
+
+    # Audio thread side
+
+    def record_block(self, seconds: float) -> None:
+        """Record the time taken to mix one period."""
+        us = int(seconds * 1000000)
+        self.blocks += 1
+        self.histogram[min(us // self.BIN_US, self.BINS)] += 1
+        if us > self.max_block_us:
+            self.max_block_us = us
+
+    def record_fill(self, fill_bytes: int, buffer_bytes: int) -> None:
+        """Record how much audio the sink held before being topped up."""
+        self.fill_bytes = fill_bytes
+        self.buffer_bytes = buffer_bytes
+        if self.min_fill_bytes is None or fill_bytes < self.min_fill_bytes:
+            self.min_fill_bytes = fill_bytes
+
+    def record_voices(self, voices: int) -> None:
+        """Record the number of tracks being mixed."""
+        self.voices = voices
+        if voices > self.max_voices:
+            self.max_voices = voices
+
+    def record_underrun(self) -> None:
+        """Record that the sink ran out of audio before it was topped up."""
+        self.underruns += 1
+        self.log("underrun", f"buffer drained after {self.blocks} blocks")
+
+    def record_sink_state(self, state: Any, error: Any) -> None:
+        """Record a state change reported by the output backend."""
+        self.sink_state = getattr(state, "name", str(state))
+        error_name = getattr(error, "name", str(error))
+        if error_name != "NoError":
+            self.sink_errors += 1
+            self.log("sink", f"{self.sink_state}: {error_name}")
+
+    def log(self, kind: str, detail: str) -> None:
+        """Append an event to the bounded event log."""
+        self.events.append((time.time(), kind, detail))
+
+    # Reader side
+
+    def percentile(self, fraction: float) -> float:
+        """Get the block time in milliseconds below which ``fraction`` of blocks completed."""
+        histogram = list(self.histogram)
+        total = sum(histogram)
+        if not total:
+            return 0.0
+        target = fraction * total
+        seen = 0
+        for index, count in enumerate(histogram):
+            seen += count
+            if seen >= target:
+                if index == self.BINS:
+                    return self.max_block_us / 1000.0
+                return (index + 1) * self.BIN_US / 1000.0
+        return self.max_block_us / 1000.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a consistent-enough copy of every counter for display or export."""
+        histogram = list(self.histogram)
+        period_ms = self.period_us / 1000.0
+        p99 = self.percentile(0.99)
+        return {
+            "time": time.time(),
+            "uptime_s": time.time() - self.started,
+            "blocks": self.blocks,
+            "underruns": self.underruns,
+            "block_ms": {
+                "p50": self.percentile(0.50),
+                "p95": self.percentile(0.95),
+                "p99": p99,
+                "max": self.max_block_us / 1000.0,
+            },
+            "period_ms": period_ms,
+            "load_p99": p99 / period_ms if period_ms else 0.0,
+            "buffer_fill": self.fill_bytes / self.buffer_bytes if self.buffer_bytes else 0.0,
+            "buffer_fill_min": (self.min_fill_bytes or 0) / self.buffer_bytes if self.buffer_bytes else 0.0,
+            "voices": self.voices,
+            "voices_max": self.max_voices,
+            "sink_state": self.sink_state,
+            "sink_errors": self.sink_errors,
+            "histogram_us": [[index * self.BIN_US, count] for index, count in enumerate(histogram) if count],
+            "events": [list(event) for event in list(self.events)],
+        }
+
+
+def export_json(snapshot: Dict[str, Any], file_path: str) -> None:
+    """Write a diagnostics snapshot as JSON."""
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=2)
+
+
+def export_csv(snapshot: Dict[str, Any], file_path: str) -> None:
+    """
+    Write a diagnostics snapshot as CSV rows of (section, key, value).
+
+    Scalar values go to the "summary" section (nested ones as parent.key),
+    histogram bins to "histogram" keyed by their lower bound in microseconds,
+    and the event log to "event" keyed by its timestamp.
+    """
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["section", "key", "value"])
+        for key, value in snapshot.items():
+            if key in ("histogram_us", "events"):
+                continue
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    writer.writerow(["summary", f"{key}.{sub_key}", sub_value])
+            else:
+                writer.writerow(["summary", key, value])
+        for lower_us, count in snapshot.get("histogram_us", []):
+            writer.writerow(["histogram", lower_us, count])
+        for timestamp, kind, detail in snapshot.get("events", []):
+            writer.writerow(["event", f"{timestamp:.3f}", f"{kind}: {detail}"])
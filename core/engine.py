@@ -0,0 +1,1128 @@
+"""
+Mixer Engine Module
+
+Software mixing engine shared by every track in the mixer.
+Decoded PCM from all active tracks is summed in NumPy blocks and fed to a
+single QAudioSink, so adding a layer costs one array multiply-add per block
+instead of a full media pipeline and OS audio stream. Decoded sounds are kept
+in the on-disk PCM cache and played straight from memory-mapped entries;
+files longer than the streaming threshold are decoded on the fly instead.
+Sources are only loaded when a track first plays, and sources released by
+removed tracks are pooled so reloading a session reuses them.
+Auto-playback triggers are timed on the mixer's sample clock and start
+one-shot voices from a preallocated pool, so overlapping triggers layer
+instead of being dropped and a seeded session always plays the same way.
+Tracks can fade in and out along equal-power curves, which lets a whole
+session crossfade into another without a dip in loudness. The summed mix
+goes through a master bus (gain, soft clipper, look-ahead limiter) before
+it reaches the device.
+Inaudible tracks (paused, at zero volume or faded out) are skipped instead
+of mixed, with their positions kept moving, and the output device sleeps
+while nothing is audible.
+Mixing and feeding the device run on a dedicated high-priority audio thread;
+the GUI hands it changes through a lock-free command ring and the render path
+reuses preallocated buffers, so it neither waits on the GUI nor allocates
+arrays in steady state.
+"""
+
+import heapq
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from PySide6.QtCore import QIODevice, QObject, QRunnable, Qt, QThread, QThreadPool, QTimer, Signal, Slot
+from PySide6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices
+
+from core.automation import VolumeEnvelope, playback_interval, playback_rng
+from core.commands import (ADD_TRACK, FIRE_VOICE, PAUSE, PAUSE_MIX, PLAY, REMOVE_TRACK, SET_AUTO_PLAYBACK,
+                           SET_AUTOMATION, SET_FADE, SET_LOOP, SET_MASTER, SET_SOURCE, SET_TRIM, SET_VOICE_LIMITS, SET_VOLUME, STOP,
+                           CommandRing)
+from core.decoder import decode_file
+from core.diagnostics import AudioDiagnostics
+from core.looping import LoopSource, find_loop_region
+from core.master import MasterBus
+from core.pcm_cache import PCMCache
+from core.streaming import StreamingSource
+
+
+BLOCK_FRAMES = 1024
+_RAMP = np.arange(1, BLOCK_FRAMES + 1, dtype=np.float32)  # Per-frame steps of a gain ramp
+FADE_AUDIBLE = math.pi / 2  # Fade angle of a fully audible track; the fade gain is sin(angle)
+
+
+class ArraySource:
+    """In-memory PCM source holding float32 frames shaped (frames, channels)."""
+
+    def __init__(self, data: np.ndarray):
+        self.data = data
+        self.frames = len(data)
+        self.channels = data.shape[1]
+
+    def read_into(self, start: int, out: np.ndarray) -> None:
+        """Copy len(out) frames starting at ``start`` into ``out``."""
+        out[:] = self.data[start:start + len(out)]
+
+
+class EngineTrack(QObject):
+    """
+    Playback state of a single sound inside the mixing engine.
+
+    Setters may be called from the GUI thread: when the track belongs to a
+    running engine they are queued on its command ring and applied by the
+    audio thread between blocks, otherwise they are applied immediately.
+    """
+
+    finished = Signal()  # Emitted when a non-looping track reaches its end
+    ready = Signal()  # Emitted once the sound has been decoded
+    failed = Signal()  # Emitted if the sound could not be decoded
+
+    def __init__(self, sound_file: str, loader: Callable[["EngineTrack"], None] = None,
+                 commands: CommandRing = None, parent=None):
+        super().__init__(parent)
+        self.sound_file = sound_file
+        self._loader = loader  # Called once, on first play, to load the source
+        self.commands = commands
+        self.source = None
+        self.loop_source: Optional[LoopSource] = None
+        self.position = 0
+        self.gain = 0.5
+        self.trim = 1.0  # Loudness normalization applied on top of the volume
+        self.loop = True
+        self.playing = False
+        self.automation: Optional[VolumeEnvelope] = None
+        self.voices: List["Voice"] = []  # One-shot voices of this track, oldest first (audio thread)
+        self.auto_playback: Optional[tuple] = None  # (interval, interval type, random stream) (audio thread)
+        self.auto_serial = 0  # Invalidates queued triggers when auto-playback changes
+        self._applied_gain = self.gain  # Gain reached at the end of the last block
+        self._fade_angle = FADE_AUDIBLE  # Equal-power fade position, from 0 (silent) to FADE_AUDIBLE
+        self._fade_target: Optional[float] = None  # None when no fade is running or held
+        self._fade_step = 0.0  # Angle change per frame
+        self._fade_curve = np.empty(BLOCK_FRAMES, dtype=np.float64)
+
+    @property
+    def is_ready(self) -> bool:
+        """Check if the sound has been decoded and can produce audio."""
+        return self.source is not None
+
+    def _post(self, op: int, value: Any = None) -> None:
+        """Hand a change to the audio thread, or apply it now when there is none."""
+        if self.commands is None:
+            self.apply_command(op, value)
+        else:
+            self.commands.push(op, self, value)
+
+    def set_source(self, source, loop_source: LoopSource = None) -> None:
+        """Attach decoded PCM and its gapless loop view to the track."""
+        self._post(SET_SOURCE, (source, loop_source))
+
+    def _active_source(self):
+        """Get the source currently played: the loop view when looping, else the raw sound."""
+        if self.loop and self.loop_source is not None:
+            return self.loop_source
+        return self.source
+
+    def load(self) -> None:
+        """Load the source now instead of waiting for the first play."""
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            loader(self)
+
+    def play(self) -> None:
+        """Start or resume playback, loading the source on first use."""
+        self._post(PLAY)
+        self.load()
+
+    def pause(self) -> None:
+        """Pause playback, keeping the current position."""
+        self._post(PAUSE)
+
+    def stop(self) -> None:
+        """Stop playback and rewind to the start."""
+        self._post(STOP)
+
+    @property
+    def current_volume(self) -> float:
+        """Get the gain currently heard, following automation when enabled."""
+        automation = self.automation
+        return automation.value if automation else self.gain
+
+    def set_volume(self, volume: float) -> None:
+        """Set the linear track gain (0.0 - 1.0)."""
+        self._post(SET_VOLUME, max(0.0, min(1.0, volume)))
+
+    def set_trim(self, trim: float) -> None:
+        """Set the loudness normalization gain applied on top of the volume."""
+        self._post(SET_TRIM, max(0.0, trim))
+
+    def set_volume_automation(self, enabled: bool, speed: int = 1) -> None:
+        """Enable or disable volume automation at a Slow/Medium/Fast speed index."""
+        self._post(SET_AUTOMATION, speed if enabled else None)
+
+    def set_loop(self, loop: bool) -> None:
+        """Enable or disable looping, keeping the playback position."""
+        self._post(SET_LOOP, bool(loop))
+
+    def fade(self, audible: bool, frames: int = 0) -> None:
+        """
+        Fade the track in or out along an equal-power curve.
+
+        A faded-out track stays silent, voices included, until it is faded
+        in again. With ``frames`` at 0 the change is immediate.
+        """
+        self._post(SET_FADE, (FADE_AUDIBLE if audible else 0.0, max(0, int(frames))))
+
+    def apply_command(self, op: int, value: Any) -> None:
+        """Apply a queued change (audio thread)."""
+        if op == PLAY:
+            self.playing = True
+        elif op == PAUSE:
+            self.playing = False
+        elif op == STOP:
+            self.playing = False
+            self.position = 0
+            for voice in self.voices:
+                voice.done = True
+        elif op == SET_VOLUME:
+            self.gain = value
+            if self.automation:
+                # A manual move while automated restarts the sweep from the new level
+                self.automation.value = value
+        elif op == SET_TRIM:
+            self.trim = value
+        elif op == SET_AUTOMATION:
+            if value is None:
+                if self.automation:
+                    self.gain = self.automation.value
+                self.automation = None
+            elif self.automation:
+                self.automation.set_speed(value)
+            else:
+                self.automation = VolumeEnvelope(self.gain, value)
+        elif op == SET_LOOP:
+            if value != self.loop and self.loop_source is not None:
+                if value:
+                    self.position = self.loop_source.to_loop_position(self.position)
+                else:
+                    self.position = self.loop_source.to_source_position(self.position)
+            self.loop = value
+        elif op == SET_SOURCE:
+            self.source, self.loop_source = value
+            self.position = 0
+            self.ready.emit()
+        elif op == SET_FADE:
+            target, frames = value
+            if frames == 0:
+                self._fade_angle = target
+            self._fade_target = None if self._fade_angle == target == FADE_AUDIBLE else target
+            self._fade_step = (target - self._fade_angle) / frames if frames else 0.0
+
+    def _block_gains(self, gains: np.ndarray, sample_rate: int):
+        """Compute the gain for the next block as a scalar or a per-frame ramp, including any fade."""
+        block_gains = self._volume_gains(gains, sample_rate)
+        if self._fade_target is None:
+            return block_gains
+        if self._fade_angle == self._fade_target:
+            return 0.0  # Held silent after fading out
+
+        # Advance the fade angle across the block and scale by its sine
+        frames = len(gains)
+        curve = self._fade_curve[:frames]
+        np.multiply(_RAMP[:frames], self._fade_step, out=curve)
+        curve += self._fade_angle
+        if self._fade_step > 0:
+            np.minimum(curve, self._fade_target, out=curve)
+        else:
+            np.maximum(curve, self._fade_target, out=curve)
+        self._fade_angle = float(curve[-1])
+        np.sin(curve, out=curve)
+        if isinstance(block_gains, float):
+            np.multiply(curve, block_gains, out=gains)
+        else:
+            gains *= curve
+        if self._fade_angle == self._fade_target == FADE_AUDIBLE:
+            self._fade_target = None
+        return gains[:, None]
+
+    def _volume_gains(self, gains: np.ndarray, sample_rate: int):
+        """Compute the volume for the next block as a scalar or a per-frame ramp."""
+        if self.automation:
+            self.automation.fill(gains, sample_rate)
+            if self.trim != 1.0:
+                gains *= self.trim
+            self._applied_gain = self.automation.value * self.trim
+            return gains[:, None]
+        target = self.gain * self.trim
+        if target == self._applied_gain:
+            return target
+        # Ramp linearly to the new gain across the block to avoid zipper noise
+        frames = len(gains)
+        np.multiply(_RAMP[:frames], (target - self._applied_gain) / frames, out=gains)
+        gains += self._applied_gain
+        self._applied_gain = target
+        return gains[:, None]
+
+    def apply_state(self, state: Dict[str, Any]) -> None:
+        """Apply the volume, loop and volume automation fields of a saved track state."""
+        self.set_volume(state.get("volume", 50) / 100.0)
+        self.set_loop(state.get("loop", True) and not state.get("playback_auto", False))
+        self.set_volume_automation(state.get("volume_auto", False), state.get("speed", 1))
+
+    @property
+    def is_audible(self) -> bool:
+        """Check if the track would add sound to the next block (audio thread)."""
+        if not (self.playing or self.voices) or self.source is None:
+            return False
+        if self._fade_target is not None:
+            return self._fade_angle != self._fade_target  # Fading, or held silent once faded out
+        return self.automation is not None or self._applied_gain != 0.0 or self.gain * self.trim != 0.0
+
+    def skip(self, frames: int) -> None:
+        """
+        Advance an inaudible track by ``frames`` without reading or mixing any audio.
+
+        Playback and voices move on as if heard, so the track resumes at the
+        right position. Streaming sources keep their decoder in step, dropping
+        the skipped frames: it cannot seek, so a stopped one would have to
+        decode the file from the start again.
+        """
+        source = self.source
+        if source is None or source.frames == 0:
+            return
+        if self.playing:
+            active = self._active_source()
+            if isinstance(active, StreamingSource):
+                active.skip(self.position, frames)
+            self.position += frames
+            if self.position >= active.frames:
+                if self.loop:
+                    self.position %= active.frames
+                else:
+                    self.playing = False
+                    self.position = 0
+                    self.finished.emit()
+        for voice in self.voices:
+            voice.position += frames
+            if voice.releasing or voice.position >= source.frames:
+                voice.done = True
+
+    def mix_into(self, out: np.ndarray, scratch: np.ndarray, gains: np.ndarray, sample_rate: int) -> None:
+        """Add this track's next len(out) frames and those of its voices, scaled by its gain envelope, to ``out``."""
+        if self.source is None or self.source.frames == 0:
+            return
+
+        block_gains = self._block_gains(gains[:len(out)], sample_rate)
+        if self.playing:
+            self._mix_playback(out, scratch, block_gains)
+        for voice in self.voices:
+            if not voice.done:
+                self._mix_voice(voice, out, scratch, block_gains)
+
+    def _mix_playback(self, out: np.ndarray, scratch: np.ndarray, block_gains) -> None:
+        """Add the next frames of the track's own playback, looping or stopping at the end."""
+        source = self._active_source()
+        frames = len(out)
+        per_frame = not isinstance(block_gains, float)
+        written = 0
+        while written < frames:
+            available = source.frames - self.position
+            if available <= 0:
+                if self.loop:
+                    self.position = 0
+                    continue
+                self.playing = False
+                self.position = 0
+                self.finished.emit()
+                return
+
+            count = min(available, frames - written)
+            chunk = scratch[:count]
+            source.read_into(self.position, chunk)
+            chunk *= block_gains[written:written + count] if per_frame else block_gains
+            out[written:written + count] += chunk
+            written += count
+            self.position += count
+
+    def _mix_voice(self, voice: "Voice", out: np.ndarray, scratch: np.ndarray, block_gains) -> None:
+        """Add the next frames of a one-shot voice, fading it out within the block if it was stolen."""
+        count = min(self.source.frames - voice.position, len(out))
+        if count > 0:
+            chunk = scratch[:count]
+            self.source.read_into(voice.position, chunk)
+            chunk *= block_gains if isinstance(block_gains, float) else block_gains[:count]
+            if voice.releasing:
+                chunk *= _RAMP[count - 1::-1, None]
+                chunk *= 1.0 / (count + 1)
+            out[:count] += chunk
+            voice.position += count
+        if voice.releasing or voice.position >= self.source.frames:
+            voice.done = True
+
+
+class Voice:
+    """One-shot playback of a track's sound, owned by the mixer's voice pool."""
+
+    __slots__ = ("track", "position", "releasing", "done")
+
+    def __init__(self):
+        self.track: Optional[EngineTrack] = None
+        self.position = 0
+        self.releasing = False  # Stolen: fades out over the next block
+        self.done = False  # Finished: returned to the pool after the block
+
+
+class VoicePool:
+    """
+    Preallocated one-shot voices with a cap for the whole mix and per track.
+
+    When a cap is reached, a sounding voice is stolen to make room: the
+    oldest voice of the same track, or else the quietest voice in the mix
+    (the oldest among equally quiet ones). Stolen voices fade out over one
+    block in a spare slot, so stealing does not click.
+    """
+
+    DEFAULT_MAX_VOICES = 32
+    DEFAULT_MAX_TRACK_VOICES = 4
+    SPARE_VOICES = 8  # Slots for voices fading out after being stolen
+
+    def __init__(self, max_voices: int = DEFAULT_MAX_VOICES,
+                 max_track_voices: int = DEFAULT_MAX_TRACK_VOICES):
+        self.active: List[Voice] = []  # Oldest first
+        self._free: List[Voice] = []
+        self.set_limits(max_voices, max_track_voices)
+
+    def set_limits(self, max_voices: int, max_track_voices: int) -> None:
+        """Change the caps, growing the preallocated voices if needed."""
+        self.max_voices = max(1, max_voices)
+        self.max_track_voices = max(1, max_track_voices)
+        while len(self._free) + len(self.active) < self.max_voices + self.SPARE_VOICES:
+            self._free.append(Voice())
+
+    def fire(self, track: EngineTrack) -> Optional[Voice]:
+        """Start a voice of a track from its beginning, stealing one if a cap is reached."""
+        if track.source is None or track.source.frames == 0:
+            return None
+        sounding = 0
+        own_count = 0
+        own_oldest = None
+        quietest = None
+        quietest_level = 0.0
+        for voice in self.active:
+            if voice.releasing or voice.done:
+                continue
+            sounding += 1
+            if voice.track is track:
+                own_count += 1
+                if own_oldest is None:
+                    own_oldest = voice
+            level = voice.track.current_volume * voice.track.trim
+            if quietest is None or level < quietest_level:
+                quietest = voice
+                quietest_level = level
+        if own_count >= self.max_track_voices:
+            own_oldest.releasing = True
+        elif sounding >= self.max_voices:
+            quietest.releasing = True
+
+        if not self._free:
+            # Every spare slot is still fading out: cut the oldest fade short
+            for voice in self.active:
+                if voice.releasing or voice.done:
+                    self._reclaim(voice)
+                    break
+        voice = self._free.pop()
+        voice.track = track
+        voice.position = 0
+        voice.releasing = False
+        voice.done = False
+        self.active.append(voice)
+        track.voices.append(voice)
+        return voice
+
+    def collect(self) -> None:
+        """Return finished voices to the pool (after each block)."""
+        index = len(self.active) - 1
+        while index >= 0:
+            voice = self.active[index]
+            if voice.done:
+                self._reclaim(voice)
+            index -= 1
+
+    def stop_track(self, track: EngineTrack) -> None:
+        """Return every voice of a track to the pool at once."""
+        while track.voices:
+            self._reclaim(track.voices[0])
+
+    def _reclaim(self, voice: Voice) -> None:
+        """Detach a voice from its track and make it available again."""
+        self.active.remove(voice)
+        voice.track.voices.remove(voice)
+        voice.track = None
+        self._free.append(voice)
+
+
+class Mixer:
+    """Sums the playing tracks into blocks of float32 frames."""
+
+    BLOCK_FRAMES = BLOCK_FRAMES
+
+    def __init__(self, sample_rate: int, channels: int):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.tracks: List[EngineTrack] = []
+        self.voices = VoicePool()
+        self.master = MasterBus(sample_rate, channels, self.BLOCK_FRAMES)
+        self.clock = 0  # Frames mixed so far; auto-playback triggers are due on this clock
+        self._triggers: List[tuple] = []  # Heap of (due frame, sequence, track, auto serial)
+        self._trigger_seq = 0
+        self._scratch = np.zeros((self.BLOCK_FRAMES, channels), dtype=np.float32)
+        self._gains = np.zeros(self.BLOCK_FRAMES, dtype=np.float32)
+        self.audible = False  # Whether any track was mixed during the last render
+
+    def add_track(self, track: EngineTrack) -> None:
+        """Add a track to the mix."""
+        if track not in self.tracks:
+            self.tracks.append(track)
+
+    def remove_track(self, track: EngineTrack) -> None:
+        """Remove a track and its voices from the mix."""
+        if track in self.tracks:
+            self.tracks.remove(track)
+        self.voices.stop_track(track)
+        self.set_auto_playback(track, None)
+
+    def fire(self, track: EngineTrack) -> None:
+        """Start a one-shot voice of a track."""
+        if isinstance(track.source, StreamingSource):
+            # Streams are decoded in order and cannot sound twice at once
+            if not track.playing:
+                track.apply_command(PLAY, None)
+            return
+        self.voices.fire(track)
+
+    def set_auto_playback(self, track: EngineTrack, value: Optional[tuple]) -> None:
+        """
+        Start or stop firing a track's voices at intervals on the sample clock.
+
+        Args:
+            track: Track to trigger
+            value: (interval seconds, interval type, random stream), or None to stop;
+                the first trigger falls one interval from now
+        """
+        track.auto_serial += 1
+        track.auto_playback = value
+        if value is not None:
+            self._schedule_trigger(track, self.clock)
+
+    def _schedule_trigger(self, track: EngineTrack, now: int) -> None:
+        """Queue a track's next trigger one interval after ``now``."""
+        interval, interval_type, rng = track.auto_playback
+        # Always a frame or more ahead, or _fire_due would never catch up with the clock
+        due = now + max(1, playback_interval(interval, interval_type, rng) * self.sample_rate)
+        heapq.heappush(self._triggers, (due, self._trigger_seq, track, track.auto_serial))
+        self._trigger_seq += 1
+
+    def _fire_due(self) -> None:
+        """Fire every trigger due at the current clock and queue the following ones."""
+        while self._triggers and self._triggers[0][0] <= self.clock:
+            due, _, track, serial = heapq.heappop(self._triggers)
+            if serial != track.auto_serial:
+                continue  # Auto-playback was changed or stopped since this was queued
+            self.fire(track)
+            self._schedule_trigger(track, due)
+
+    def render(self, frames: int) -> np.ndarray:
+        """Mix the next ``frames`` frames and return them as a new array."""
+        output = np.empty((frames, self.channels), dtype=np.float32)
+        self.render_into(output)
+        return output
+
+    def has_audible(self) -> bool:
+        """Check if any track would add sound to the next block."""
+        for track in self.tracks:
+            if track.is_audible:
+                return True
+        return False
+
+    def skip(self, frames: int) -> int:
+        """
+        Advance the clock, tracks and triggers by up to ``frames`` without mixing.
+
+        Used while nothing is audible. Stops early if a trigger makes a
+        track audible, so no sound is skipped.
+
+        Returns:
+            Frames actually skipped
+        """
+        start = 0
+        while start < frames:
+            end = frames
+            if self._triggers and self._triggers[0][0] < self.clock + end - start:
+                end = start + max(0, self._triggers[0][0] - self.clock)
+            if end > start:
+                for track in self.tracks:
+                    track.skip(end - start)
+                self.voices.collect()
+                self.clock += end - start
+                start = end
+            self._fire_due()
+            if self.has_audible():
+                break
+        return start
+
+    def render_into(self, out: np.ndarray) -> None:
+        """Mix the next len(out) frames into a caller-owned buffer, splitting blocks at due triggers."""
+        frames = len(out)
+        self.audible = False
+        start = 0
+        while start < frames:
+            end = min(frames, start + self.BLOCK_FRAMES)
+            if self._triggers and self._triggers[0][0] < self.clock + end - start:
+                end = start + max(0, self._triggers[0][0] - self.clock)
+            if end > start:
+                self._render_block(out[start:end])
+                self.clock += end - start
+                start = end
+            self._fire_due()
+
+    def _render_block(self, block: np.ndarray) -> None:
+        """Mix one block of at most BLOCK_FRAMES frames in place."""
+        block.fill(0.0)
+        for track in self.tracks:
+            if track.is_audible:
+                track.mix_into(block, self._scratch, self._gains, self.sample_rate)
+                self.audible = True
+            else:
+                track.skip(len(block))
+        self.voices.collect()
+        self.master.process(block)
+        np.clip(block, -1.0, 1.0, out=block)
+
+
+class _AudioWorker(QObject):
+    """
+    Feeds the audio sink from the dedicated audio thread.
+
+    The sink is opened in push mode and topped up from a timer on the audio
+    thread's own event loop, so a busy GUI thread cannot starve it. Each
+    period is mixed into one preallocated buffer that is written to the sink
+    as is, and queued commands are applied between periods. The sink holds
+    the configured buffer of audio, and the timer wakes twice per period.
+    When nothing has been audible for a whole buffer, the sink is suspended
+    and the timer slows down; the mixer's clock keeps following real time so
+    auto-playback triggers still fall on time and wake the output.
+    """
+
+    IDLE_INTERVAL_MS = 50  # Timer interval while the output sleeps
+
+    track_released = Signal(object)  # A removed track is no longer used by the audio thread
+    latency_changed = Signal(float)  # Milliseconds of audio the opened sink buffers
+
+    def __init__(self, mixer: Mixer, commands: CommandRing, audio_format: QAudioFormat,
+                 period_frames: int, buffer_frames: int, diagnostics: AudioDiagnostics):
+        super().__init__()
+        self.mixer = mixer
+        self.commands = commands
+        self.audio_format = audio_format
+        self.diagnostics = diagnostics
+        self.period_frames = period_frames
+        self.buffer_frames = max(buffer_frames, period_frames)
+        self.periods_per_buffer = -(-self.buffer_frames // period_frames)
+        self.paused = False
+        self.sink: Optional[QAudioSink] = None
+        self.io: Optional[QIODevice] = None
+        self.timer: Optional[QTimer] = None
+        self._primed = False  # The sink has been written to since it was opened or resumed
+        self._silent_periods = 0  # Periods mixed in a row with nothing audible
+        self._asleep = False  # Sink suspended because nothing is audible
+        self._slept_at = 0.0  # perf_counter() when the output went to sleep
+        self._skipped = 0  # Frames the mixer has been advanced since then
+        self._block_bytes = bytearray(period_frames * mixer.channels * 4)
+        self._block = np.frombuffer(self._block_bytes, dtype=np.float32).reshape(period_frames, mixer.channels)
+
+    @Slot()
+    def start_output(self) -> None:
+        """Open the default output device and start feeding it."""
+        self.stop_output()
+        if self.timer is None:
+            self.timer = QTimer(self)
+            self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+            self.timer.timeout.connect(self._feed)
+        self.sink = QAudioSink(QMediaDevices.defaultAudioOutput(), self.audio_format, self)
+        self.sink.stateChanged.connect(self._on_sink_state)
+        self._primed = False
+        self._silent_periods = 0
+        self._asleep = False
+        frame_bytes = self.mixer.channels * 4
+        self.sink.setBufferSize(self.buffer_frames * frame_bytes)
+        self.io = self.sink.start()
+        if self.paused:
+            self.sink.suspend()
+        # The backend may round the buffer; report what it actually holds
+        buffered_frames = (self.sink.bufferSize() or self.buffer_frames * frame_bytes) // frame_bytes
+        self.latency_changed.emit(buffered_frames * 1000.0 / self.mixer.sample_rate)
+        self.diagnostics.period_us = self.period_frames * 1000000 // self.mixer.sample_rate
+        self.timer.start(self._feed_interval())
+
+    def _feed_interval(self) -> int:
+        """Timer interval in milliseconds while the output is awake: half a period."""
+        return max(1, self.period_frames * 1000 // self.mixer.sample_rate // 2)
+
+    def _sleep(self) -> None:
+        """Suspend the sink and slow the timer down while nothing is audible."""
+        self._asleep = True
+        self._slept_at = time.perf_counter()
+        self._skipped = 0
+        self.sink.suspend()
+        self.timer.setInterval(self.IDLE_INTERVAL_MS)
+
+    def _wake(self) -> None:
+        """Resume the sink at the normal feeding rate."""
+        self._asleep = False
+        self._primed = False
+        self._silent_periods = 0
+        self.sink.resume()
+        self.timer.setInterval(self._feed_interval())
+
+    @Slot()
+    def stop_output(self) -> None:
+        """Stop feeding and close the output device."""
+        if self.timer:
+            self.timer.stop()
+        if self.sink:
+            self.sink.stop()
+            self.sink.deleteLater()
+            self.sink = None
+            self.io = None
+
+    def _on_sink_state(self, state) -> None:
+        """Pass backend state changes and errors on to the diagnostics."""
+        if self.sink:
+            self.diagnostics.record_sink_state(state, self.sink.error())
+
+    def _feed(self) -> None:
+        """Apply queued commands, then top the sink buffer up with whole periods."""
+        self.commands.drain(self._apply)
+        if self.io is None or self.paused:
+            return
+        if self._asleep:
+            # Keep the clock on real time so triggers are not delayed by the sleep
+            due = int((time.perf_counter() - self._slept_at) * self.mixer.sample_rate) - self._skipped
+            if due > 0:
+                self._skipped += self.mixer.skip(due)
+            if not self.mixer.has_audible():
+                return
+            self._wake()
+        diagnostics = self.diagnostics
+        free = self.sink.bytesFree()
+        size = self.sink.bufferSize()
+        if self._primed and free >= size:
+            diagnostics.record_underrun()
+        diagnostics.record_fill(size - free, size)
+        diagnostics.record_voices(sum(1 for track in self.mixer.tracks if track.playing)
+                                  + len(self.mixer.voices.active))
+        for _ in range(self.periods_per_buffer):
+            if free < len(self._block_bytes):
+                break
+            started = time.perf_counter()
+            self.mixer.render_into(self._block)
+            diagnostics.record_block(time.perf_counter() - started)
+            self.io.write(self._block_bytes)
+            free -= len(self._block_bytes)
+            self._primed = True
+            self._silent_periods = 0 if self.mixer.audible else self._silent_periods + 1
+        if self._silent_periods > self.periods_per_buffer:
+            self._sleep()  # The sink has played out everything that was audible
+
+    def _apply(self, op: int, target, value) -> None:
+        """Apply one queued command."""
+        if op == ADD_TRACK:
+            self.mixer.add_track(target)
+        elif op == REMOVE_TRACK:
+            self.mixer.remove_track(target)
+            self.track_released.emit(target)
+        elif op == FIRE_VOICE:
+            self.mixer.fire(target)
+        elif op == SET_VOICE_LIMITS:
+            self.mixer.voices.set_limits(*value)
+        elif op == SET_AUTO_PLAYBACK:
+            self.mixer.set_auto_playback(target, value)
+        elif op == SET_MASTER:
+            self.mixer.master.configure(*value)
+        elif op == PAUSE_MIX:
+            self.paused = value
+            self._primed = False
+            if self.sink:
+                if value:
+                    self.sink.suspend()
+                elif self._asleep:
+                    # Stay asleep; the paused time does not advance the clock
+                    self._slept_at = time.perf_counter()
+                    self._skipped = 0
+                else:
+                    self.sink.resume()
+        else:
+            target.apply_command(op, value)
+
+
+def load_sound(sound_file: str, sample_rate: int, channels: int,
+               cache: PCMCache, crossfade_frames: int) -> tuple:
+    """
+    Get a sound as a playable source, decoding it only on a cache miss.
+
+    Returns:
+        Tuple of (source, loop source), or (None, None) if decoding failed
+    """
+    source = cache.open(sound_file, sample_rate, channels)
+    if source is None:
+        data = decode_file(sound_file, sample_rate, channels)
+        if data is None:
+            return None, None
+        # Fall back to the decoded array if the cache cannot be written
+        source = cache.store(sound_file, data, sample_rate) or ArraySource(data)
+
+    loop_source = None
+    if source.frames > 0:
+        start, end = find_loop_region(source, sample_rate)
+        loop_source = LoopSource(source, start, end, crossfade_frames)
+    return source, loop_source
+
+
+class SourcePool:
+    """Keeps sources released by removed tracks for reuse by new tracks of the same file."""
+
+    DEFAULT_CAPACITY = 32
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _signature(sound_file: str):
+        """Size and modification time identifying the file version a source was loaded from."""
+        try:
+            stat = os.stat(sound_file)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def acquire(self, sound_file: str) -> Optional[tuple]:
+        """Take a pooled (source, loop source) pair for a file, if one is still current."""
+        entry = self._entries.pop(sound_file, None)
+        if entry is None:
+            return None
+        signature, source, loop_source = entry
+        if signature != self._signature(sound_file):
+            self._close(source)
+            return None
+        if isinstance(source, StreamingSource):
+            source.open()  # Restart decoding here rather than on the audio thread
+        return source, loop_source
+
+    def release(self, sound_file: str, source, loop_source) -> None:
+        """Return a source to the pool, dropping the least recently released ones beyond capacity."""
+        if source is None:
+            return
+        if isinstance(source, StreamingSource):
+            source.close()  # Stop decoding; the resident head is kept for a fast restart
+        previous = self._entries.pop(sound_file, None)
+        if previous is not None and previous[1] is not source:
+            self._close(previous[1])
+        self._entries[sound_file] = (self._signature(sound_file), source, loop_source)
+        while len(self._entries) > self.capacity:
+            _, (_, oldest, _) = self._entries.popitem(last=False)
+            self._close(oldest)
+
+    def clear(self) -> None:
+        """Drop every pooled source."""
+        for _, source, _ in self._entries.values():
+            self._close(source)
+        self._entries.clear()
+
+    @staticmethod
+    def _close(source) -> None:
+        """Release resources held by a source."""
+        if isinstance(source, StreamingSource):
+            source.close()
+
+
+class _LoadSignals(QObject):
+    """Signals used by load tasks to hand decoded audio back to the engine."""
+
+    loaded = Signal(object, object, object)  # EngineTrack, source (or None on failure), LoopSource
+
+
+class _LoadTask(QRunnable):
+    """Decodes a sound file on a worker thread."""
+
+    def __init__(self, track: EngineTrack, sample_rate: int, channels: int,
+                 cache: PCMCache, crossfade_frames: int, signals: _LoadSignals):
+        super().__init__()
+        self.track = track
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.cache = cache
+        self.crossfade_frames = crossfade_frames
+        self.signals = signals
+
+    def run(self):
+        source, loop_source = load_sound(self.track.sound_file, self.sample_rate, self.channels,
+                                         self.cache, self.crossfade_frames)
+        try:
+            self.signals.loaded.emit(self.track, source, loop_source)
+        except RuntimeError:
+            pass  # Engine was destroyed while the file was decoding
+
+
+class MixerEngine(QObject):
+    """Owns the audio thread and the tracks being mixed on it."""
+
+    CHANNELS = 2
+    DEFAULT_SAMPLE_RATE = 44100
+    DEFAULT_LOOP_CROSSFADE_MS = 25
+    DEFAULT_STREAMING_THRESHOLD = 600.0  # Seconds; longer files are streamed
+    DEFAULT_STREAM_LOOKAHEAD = 10.0  # Seconds decoded ahead by streaming tracks
+    DEFAULT_BUFFER_MS = 92  # Audio held by the sink
+    DEFAULT_PERIOD_MS = 23  # Audio mixed and written per wakeup
+
+    latency_changed = Signal(float)  # Milliseconds buffered by the output sink
+
+    _restart_output = Signal()
+    _stop_output = Signal()
+
+    def __init__(self, cache: PCMCache = None,
+                 duration_lookup: Callable[[str], Optional[float]] = None, parent=None,
+                 buffer_ms: int = DEFAULT_BUFFER_MS, period_ms: int = DEFAULT_PERIOD_MS):
+        super().__init__(parent)
+        self.cache = cache if cache is not None else PCMCache()
+        self.duration_lookup = duration_lookup
+        self.loop_crossfade_ms = self.DEFAULT_LOOP_CROSSFADE_MS
+        self.streaming_threshold = self.DEFAULT_STREAMING_THRESHOLD
+        self.stream_lookahead = self.DEFAULT_STREAM_LOOKAHEAD
+        self.buffer_ms = self.DEFAULT_BUFFER_MS
+        self.period_ms = self.DEFAULT_PERIOD_MS
+        self.latency_ms = 0.0  # Reported by the audio thread once the sink is open
+        self.diagnostics = AudioDiagnostics()
+        self.seed = 0  # Session seed of the auto-playback random streams
+        self.normalization_lookup: Optional[Callable[[str], float]] = None  # Loudness gain per file
+        device = QMediaDevices.defaultAudioOutput()
+        sample_rate = device.preferredFormat().sampleRate() if not device.isNull() else 0
+        self.sample_rate = sample_rate or self.DEFAULT_SAMPLE_RATE
+
+        # The mixer belongs to the audio thread; it is only changed through the command ring
+        self.mixer = Mixer(self.sample_rate, self.CHANNELS)
+        self.commands = CommandRing()
+        self.tracks: List[EngineTrack] = []  # Tracks in the mix, as seen from the GUI thread
+        self.pool = SourcePool()
+        self.paused = False
+        self._thread: Optional[QThread] = None
+        self._worker: Optional[_AudioWorker] = None
+
+        self._load_signals = _LoadSignals()
+        self._load_signals.loaded.connect(self._on_track_loaded)
+
+        self._media_devices = QMediaDevices(self)
+        self._media_devices.audioOutputsChanged.connect(self._on_outputs_changed)
+
+        # Sized before the first start, so the device is opened once
+        self.set_buffering(buffer_ms, period_ms)
+        self.start()
+
+    def audio_format(self) -> QAudioFormat:
+        """Get the PCM format fed to the audio sink."""
+        fmt = QAudioFormat()
+        fmt.setSampleRate(self.sample_rate)
+        fmt.setChannelCount(self.CHANNELS)
+        fmt.setSampleFormat(QAudioFormat.SampleFormat.Float)
+        return fmt
+
+    def start(self) -> None:
+        """Start the audio thread, which opens the default output device and feeds it."""
+        self.stop()
+        self._thread = QThread()
+        period_frames = max(1, self.period_ms * self.sample_rate // 1000)
+        buffer_frames = max(period_frames, self.buffer_ms * self.sample_rate // 1000)
+        self._worker = _AudioWorker(self.mixer, self.commands, self.audio_format(), period_frames, buffer_frames,
+                                    self.diagnostics)
+        self._worker.paused = self.paused
+        self._worker.moveToThread(self._thread)
+        self._worker.track_released.connect(self._on_track_released)
+        self._worker.latency_changed.connect(self._on_latency_changed)
+        self._thread.started.connect(self._worker.start_output)
+        self._restart_output.connect(self._worker.start_output)
+        self._stop_output.connect(self._worker.stop_output, Qt.ConnectionType.BlockingQueuedConnection)
+        self._thread.start(QThread.Priority.TimeCriticalPriority)
+
+    def stop(self) -> None:
+        """Close the output device and stop the audio thread."""
+        if self._thread:
+            self._stop_output.emit()
+            self._thread.quit()
+            self._thread.wait()
+            self._restart_output.disconnect(self._worker.start_output)
+            self._stop_output.disconnect(self._worker.stop_output)
+            self._thread = None
+            self._worker = None
+
+    def set_buffering(self, buffer_ms: int, period_ms: int) -> None:
+        """
+        Change how much audio the sink holds and how much is mixed per wakeup.
+
+        Smaller values react faster to changes; larger ones wake the CPU less
+        often. The output is reopened only if the sizes actually change.
+
+        Args:
+            buffer_ms: Audio held by the sink, in milliseconds
+            period_ms: Audio mixed and written per wakeup, in milliseconds
+        """
+        period_ms = max(1, int(period_ms))
+        buffer_ms = max(period_ms, int(buffer_ms))
+        if (buffer_ms, period_ms) == (self.buffer_ms, self.period_ms):
+            return
+        self.buffer_ms = buffer_ms
+        self.period_ms = period_ms
+        if self._thread:
+            self.start()
+
+    def _on_latency_changed(self, latency_ms: float) -> None:
+        """Keep the latency reported by the audio thread."""
+        self.latency_ms = latency_ms
+        self.latency_changed.emit(latency_ms)
+
+    def pause(self) -> None:
+        """Suspend the whole mix; every track keeps its position."""
+        self.paused = True
+        self.commands.push(PAUSE_MIX, None, True)
+
+    def resume(self) -> None:
+        """Resume a paused mix."""
+        self.paused = False
+        self.commands.push(PAUSE_MIX, None, False)
+
+    def create_track(self, sound_file: str) -> EngineTrack:
+        """Create a track for a sound file; its audio is loaded when it first plays."""
+        track = EngineTrack(sound_file, self._load_track, self.commands, self)
+        self.tracks.append(track)
+        self.commands.push(ADD_TRACK, track)
+        self._apply_normalization(track)
+        return track
+
+    def fire(self, track: EngineTrack) -> None:
+        """Start a one-shot voice of a track over whatever it is already playing."""
+        track.load()
+        self.commands.push(FIRE_VOICE, track)
+
+    def set_auto_playback(self, track: EngineTrack, enabled: bool, interval: int = 20,
+                          interval_type: int = 0) -> None:
+        """
+        Fire a track's voices automatically at fixed or random intervals.
+
+        Intervals are drawn from the track's own stream of the session seed
+        and counted in mixed frames, so the same session triggers on the same
+        frames every time, live or rendered offline. Each call restarts the
+        stream and the first trigger falls one interval from now.
+        """
+        value = None
+        if enabled:
+            track.load()  # Have the sound ready for the first trigger
+            value = (interval, interval_type, playback_rng(self.seed, track.sound_file))
+        self.commands.push(SET_AUTO_PLAYBACK, track, value)
+
+    def crossfade(self, fade_in: List[EngineTrack], fade_out: List[EngineTrack], seconds: float) -> None:
+        """
+        Fade one set of tracks in and another out with equal-power curves.
+
+        The gains follow sine and cosine of the same angle, so the summed
+        power of uncorrelated layers stays constant across the fade.
+        """
+        frames = int(max(0.0, seconds) * self.sample_rate)
+        for track in fade_in:
+            track.fade(True, frames)
+        for track in fade_out:
+            track.fade(False, frames)
+
+    def set_voice_limits(self, max_voices: int, max_track_voices: int) -> None:
+        """Cap the one-shot voices sounding in the whole mix and per track."""
+        self.commands.push(SET_VOICE_LIMITS, None, (max_voices, max_track_voices))
+
+    def set_master(self, gain: float, limiter: bool = True, soft_clip: bool = False) -> None:
+        """Set the master gain (linear) and switch the master limiter and soft clipper."""
+        self.commands.push(SET_MASTER, None, (max(0.0, gain), bool(limiter), bool(soft_clip)))
+
+    def take_gain_reduction(self) -> float:
+        """Get the deepest master limiter gain reduction in dB since the last call."""
+        return self.mixer.master.take_reduction()
+
+    def set_normalization(self, lookup: Optional[Callable[[str], float]]) -> None:
+        """Set the per-file loudness normalization gain lookup (None disables it) and apply it to every track."""
+        self.normalization_lookup = lookup
+        for track in self.tracks:
+            self._apply_normalization(track)
+
+    def update_normalization(self, sound_file: str) -> None:
+        """Re-apply normalization to the tracks of a file whose loudness was just measured."""
+        for track in self.tracks:
+            if track.sound_file == sound_file:
+                self._apply_normalization(track)
+
+    def _apply_normalization(self, track: EngineTrack) -> None:
+        """Set a track's normalization gain from the lookup."""
+        lookup = self.normalization_lookup
+        track.set_trim(lookup(track.sound_file) if lookup else 1.0)
+
+    def _load_track(self, track: EngineTrack) -> None:
+        """Give a track a pooled source, or start loading one in the background."""
+        sound_file = track.sound_file
+        pooled = self.pool.acquire(sound_file)
+        if pooled is not None:
+            track.set_source(*pooled)
+            return
+
+        duration = self.duration_lookup(sound_file) if self.duration_lookup else None
+        if duration and duration > self.streaming_threshold:
+            # Long beds stream through a fixed window instead of being decoded whole
+            source = StreamingSource(sound_file, self.sample_rate, self.CHANNELS,
+                                     int(duration * self.sample_rate),
+                                     int(self.stream_lookahead * self.sample_rate))
+            track.set_source(source)
+            return
+
+        crossfade_frames = self.sample_rate * self.loop_crossfade_ms // 1000
+        task = _LoadTask(track, self.sample_rate, self.CHANNELS, self.cache,
+                         crossfade_frames, self._load_signals)
+        QThreadPool.globalInstance().start(task)
+
+    def remove_track(self, track: EngineTrack) -> None:
+        """Stop a track and drop it from the mix; its source is pooled once the audio thread lets go."""
+        track.stop()
+        if track in self.tracks:
+            self.tracks.remove(track)
+        self.commands.push(REMOVE_TRACK, track)
+
+    def _on_track_released(self, track: EngineTrack) -> None:
+        """Pool the source of a removed track for reuse."""
+        self.pool.release(track.sound_file, track.source, track.loop_source)
+        track.deleteLater()
+
+    def _on_track_loaded(self, track: EngineTrack, source, loop_source) -> None:
+        """Attach decoded audio to its track once the worker is done."""
+        if track not in self.tracks:
+            # Track was removed while decoding; keep the work for the next one
+            self.pool.release(track.sound_file, source, loop_source)
+            return
+        if source is None:
+            print(f"Could not decode sound file: {track.sound_file}")
+            self.diagnostics.log("decode", f"could not decode {track.sound_file}")
+            track.failed.emit()
+            return
+        track.set_source(source, loop_source)
+
+    def _on_outputs_changed(self) -> None:
+        """Reopen the sink on the new default device when outputs change."""
+        if self._thread:
+            self._restart_output.emit()
@@ -0,0 +1,241 @@
+"""
+Library Index Module
+
+Persistent SQLite index of the sound library.
+Each category directory is stored with its modification time, and each sound
+with its category, size, modification time and the stream metadata read from
+its header. A rescan stats the directories and only lists the ones whose
+modification time changed, so an unchanged library on a slow or network
+mount costs one stat per directory instead of a full walk.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Collection, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from PySide6.QtCore import QStandardPaths
+
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sounds (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    category TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    probed INTEGER NOT NULL DEFAULT 0,
+    duration REAL,
+    sample_rate INTEGER,
+    channels INTEGER,
+    bitrate INTEGER
+);
+CREATE INDEX IF NOT EXISTS sounds_category ON sounds (category, path);
+CREATE INDEX IF NOT EXISTS sounds_directory ON sounds (directory);
+"""
+
+
+class LibraryChanges(NamedTuple):
+    """Sounds added, removed and modified by a rescan, as (category, path) pairs."""
+
+    added: List[Tuple[str, str]]
+    removed: List[Tuple[str, str]]
+    modified: List[Tuple[str, str]]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+class LibraryIndex:
+    """SQLite-backed list of library sounds, rescanned incrementally."""
+
+    FILE_NAME = "library.sqlite3"
+    VERSION = 1  # Stored as the database user_version; a mismatch rebuilds the index
+    SETTLE_NS = 2 * 1000000000  # Directories changed this recently are listed again next time
+
+    def __init__(self, index_path: str = None):
+        if index_path is None:
+            base_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+            index_path = os.path.join(base_dir or os.getcwd(), self.FILE_NAME)
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._db = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, falling back to memory if the file cannot be used."""
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            db = sqlite3.connect(self.index_path, check_same_thread=False)
+            if db.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+                db.executescript("DROP TABLE IF EXISTS sounds; DROP TABLE IF EXISTS directories;")
+            db.executescript(_SCHEMA)
+            db.execute(f"PRAGMA user_version = {self.VERSION}")
+            db.commit()
+            return db
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error opening library index, keeping it in memory: {e}")
+            db = sqlite3.connect(":memory:", check_same_thread=False)
+            db.executescript(_SCHEMA)
+            return db
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    def rescan(self, directories: Iterable[Tuple[str, str]], force: Collection[str] = ()) -> LibraryChanges:
+        """
+        Bring the index up to date with a set of category directories.
+
+        Directories whose modification time is unchanged are trusted as is;
+        the others are listed once and only new, changed or removed sounds
+        are written. Directories no longer given are dropped with their sounds.
+
+        Args:
+            directories: (directory path, category name) pairs
+            force: Directories to list even if their modification time is unchanged,
+                e.g. because a watcher reported a change inside them
+
+        Returns:
+            The sounds added, removed and modified
+        """
+        changes = LibraryChanges([], [], [])
+        seen = set()
+        now_ns = time.time_ns()
+        with self._lock, self._db:
+            stored = {path: (category, mtime_ns) for path, category, mtime_ns
+                      in self._db.execute("SELECT path, category, mtime_ns FROM directories")}
+            for directory, category in directories:
+                seen.add(directory)
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                if stored.get(directory) == (category, mtime_ns) and directory not in force:
+                    continue
+                self._scan_directory(directory, category, changes)
+                # A directory written to just now may change again within its timestamp resolution
+                recorded = mtime_ns if now_ns - mtime_ns > self.SETTLE_NS else 0
+                self._db.execute("INSERT OR REPLACE INTO directories (path, category, mtime_ns) VALUES (?, ?, ?)",
+                                 (directory, category, recorded))
+            for directory in stored.keys() - seen:
+                changes.removed.extend(self._db.execute(
+                    "SELECT category, path FROM sounds WHERE directory = ? ORDER BY path", (directory,)))
+                self._db.execute("DELETE FROM sounds WHERE directory = ?", (directory,))
+                self._db.execute("DELETE FROM directories WHERE path = ?", (directory,))
+        return changes
+
+    def _scan_directory(self, directory: str, category: str, changes: LibraryChanges) -> None:
+        """List one directory and sync its sounds, recording what changed (lock held)."""
+        known = {path: (size, mtime_ns, known_category) for path, size, mtime_ns, known_category in self._db.execute(
+            "SELECT path, size, mtime_ns, category FROM sounds WHERE directory = ?", (directory,))}
+        found = set()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            path = os.path.join(directory, entry.name)
+            found.add(path)
+            previous = known.get(path)
+            if previous == (stat.st_size, stat.st_mtime_ns, category):
+                continue
+            # New or modified: metadata is read again on demand
+            self._db.execute(
+                "INSERT OR REPLACE INTO sounds (path, directory, category, size, mtime_ns, probed) "
+                "VALUES (?, ?, ?, ?, ?, 0)", (path, directory, category, stat.st_size, stat.st_mtime_ns))
+            if previous is None:
+                changes.added.append((category, path))
+            elif previous[2] != category:
+                changes.removed.append((previous[2], path))
+                changes.added.append((category, path))
+            else:
+                changes.modified.append((category, path))
+        gone = sorted(known.keys() - found)
+        if gone:
+            self._db.executemany("DELETE FROM sounds WHERE path = ?", [(path,) for path in gone])
+            changes.removed.extend((known[path][2], path) for path in gone)
+
+    def categories(self) -> Dict[str, List[str]]:
+        """Get every indexed sound path grouped by category, each list sorted."""
+        categories: Dict[str, List[str]] = {}
+        with self._lock:
+            rows = self._db.execute("SELECT category, path FROM sounds ORDER BY category, path").fetchall()
+        for category, path in rows:
+            categories.setdefault(category, []).append(path)
+        return categories
+
+    def get_info(self, file_path: str) -> Optional[Tuple[int, int, bool, Optional[Dict[str, Any]]]]:
+        """
+        Get the indexed size, modification time and metadata of a sound.
+
+        Returns:
+            Tuple of (size, mtime_ns, probed, info), or None if the path is not indexed;
+            info is None when the header has not been read or could not be parsed
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size, mtime_ns, probed, duration, sample_rate, channels, bitrate FROM sounds WHERE path = ?",
+                (file_path,)).fetchone()
+        if row is None:
+            return None
+        size, mtime_ns, probed, duration, sample_rate, channels, bitrate = row
+        info = None
+        if probed and duration is not None:
+            info = {"duration": duration, "sample_rate": sample_rate, "channels": channels, "bitrate": bitrate}
+        return size, mtime_ns, bool(probed), info
+
+    def all_info(self) -> Dict[str, Dict[str, Any]]:
+        """Get the metadata of every sound whose header has been read successfully."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT path, duration, sample_rate, channels, bitrate FROM sounds "
+                "WHERE probed = 1 AND duration IS NOT NULL").fetchall()
+        return {path: {"duration": duration, "sample_rate": sample_rate, "channels": channels, "bitrate": bitrate}
+                for path, duration, sample_rate, channels, bitrate in rows}
+
+    def unprobed(self) -> List[str]:
+        """Get the sounds whose header has not been read since they were indexed or changed."""
+        with self._lock:
+            return [path for path, in self._db.execute("SELECT path FROM sounds WHERE probed = 0 ORDER BY path")]
+
+    def set_info(self, file_path: str, size: int, mtime_ns: int, info: Optional[Dict[str, Any]]) -> None:
+        """Store the metadata read from a sound's header, if the sound is indexed."""
+        self.set_infos([(file_path, size, mtime_ns, info)])
+
+    def set_infos(self, rows: Iterable[Tuple[str, int, int, Optional[Dict[str, Any]]]]) -> None:
+        """
+        Store the metadata of several sounds in one transaction.
+
+        Each row is only written if the sound is indexed with the same size
+        and modification time; a file changed since then is left for the
+        next rescan to report as modified.
+
+        Args:
+            rows: (path, size, mtime_ns, info) tuples, info being None for unreadable headers
+        """
+        values = []
+        for file_path, size, mtime_ns, info in rows:
+            info = info or {}
+            values.append((info.get("duration"), info.get("sample_rate"), info.get("channels"), info.get("bitrate"),
+                           file_path, size, mtime_ns))
+        with self._lock, self._db:
+            self._db.executemany(
+                "UPDATE sounds SET probed = 1, duration = ?, sample_rate = ?, channels = ?, bitrate = ? "
+                "WHERE path = ? AND size = ? AND mtime_ns = ?", values)
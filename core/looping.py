@@ -0,0 +1,101 @@
+"""
+Looping Module
+
+Gapless loop playback for decoded sounds.
+Encoder delay and padding show up as near-silent frames at the edges of the
+decoded audio; they are trimmed once when a sound is loaded. The seam where
+the loop wraps is pre-rendered as a short equal-power crossfade of the tail
+into the head, so wrapping is just an index reset with no seek or decode.
+"""
+
+import numpy as np
+
+
+SILENCE_THRESHOLD = 1.0e-4  # About -80 dBFS
+MAX_TRIM_SECONDS = 0.1  # Longer than any MP3/Vorbis encoder delay or padding
+
+
+def find_loop_region(source, sample_rate: int) -> tuple:
+    """
+    Find the audible region of a source, skipping near-silent edge padding.
+
+    Args:
+        source: PCM source with ``frames``, ``channels`` and ``read_into``
+        sample_rate: Sample rate of the source
+
+    Returns:
+        Tuple of (start, end) frame offsets
+    """
+    frames = source.frames
+    scan = min(frames, int(sample_rate * MAX_TRIM_SECONDS))
+    if scan == 0:
+        return 0, frames
+    window = np.empty((scan, source.channels), dtype=np.float32)
+
+    source.read_into(0, window)
+    loud = np.flatnonzero(np.abs(window).max(axis=1) > SILENCE_THRESHOLD)
+    start = int(loud[0]) if len(loud) else scan
+
+    source.read_into(frames - scan, window)
+    loud = np.flatnonzero(np.abs(window).max(axis=1) > SILENCE_THRESHOLD)
+    end = frames - scan + int(loud[-1]) + 1 if len(loud) else frames - scan
+
+    if end <= start:
+        return 0, frames  # Silent or tiny file, loop it untouched
+    return start, end
+
+
+class LoopSource:
+    """
+    Endless view of a source region with a pre-rendered crossfade seam.
+
+    The loop timeline plays ``[start + fade, end - fade)`` straight from the
+    underlying source, followed by ``fade`` resident frames blending the tail
+    out and the head in, then wraps back to its own start.
+    """
+
+    def __init__(self, source, start: int, end: int, crossfade_frames: int = 0):
+        self.source = source
+        self.channels = source.channels
+        self.start = start
+        self.end = end
+        fade = max(0, crossfade_frames)
+        if (end - start) < 4 * fade:
+            fade = 0  # Too short to crossfade without eating the whole sound
+        self.fade = fade
+        self.body_frames = end - start - 2 * fade
+        self.frames = self.body_frames + fade
+        self.seam = self._render_seam()
+
+    def _render_seam(self) -> np.ndarray:
+        """Blend the last ``fade`` frames into the first ``fade`` frames with equal power."""
+        seam = np.zeros((self.fade, self.channels), dtype=np.float32)
+        if self.fade == 0:
+            return seam
+        head = np.empty_like(seam)
+        self.source.read_into(self.end - self.fade, seam)
+        self.source.read_into(self.start, head)
+        angle = (np.arange(self.fade, dtype=np.float32) + 0.5) * (np.pi / 2 / self.fade)
+        seam *= np.cos(angle)[:, None]
+        seam += head * np.sin(angle)[:, None]
+        return seam
+
+    def read_into(self, start: int, out: np.ndarray) -> None:
+        """Copy len(out) frames of the loop timeline starting at ``start`` into ``out``."""
+        count = len(out)
+        body = min(count, max(0, self.body_frames - start))
+        if body:
+            self.source.read_into(self.start + self.fade + start, out[:body])
+        if body < count:
+            seam_start = start + body - self.body_frames
+            out[body:] = self.seam[seam_start:seam_start + count - body]
+
+    def to_loop_position(self, position: int) -> int:
+        """Map a position in the underlying source to the loop timeline."""
+        return min(max(0, position - self.start - self.fade), max(0, self.frames - 1))
+
+    def to_source_position(self, position: int) -> int:
+        """Map a loop timeline position back to the underlying source."""
+        if position < self.body_frames:
+            return self.start + self.fade + position
+        return self.start + (position - self.body_frames)
@@ -0,0 +1,159 @@
+"""
+Master Module
+
+Master bus applied to the summed mix: gain, an optional tanh soft clipper and
+a look-ahead peak limiter.
+Everything runs on whole blocks of the already summed signal, so the cost is
+a fixed handful of vectorized passes per block whatever the number of tracks.
+The limiter delays the audio by its look-ahead and computes a per-frame gain
+without any per-sample Python loop: the gain each frame needs is min-filtered
+over the look-ahead window, released at a constant rate in dB (a running
+minimum once the release slope is factored out) and smoothed with a moving
+average as long as the window, so the gain is fully down by the time a peak
+leaves the delay line.
+"""
+
+import math
+
+import numpy as np
+
+
+def db_to_gain(db: float) -> float:
+    """Convert decibels to a linear gain."""
+    return 10.0 ** (db / 20.0)
+
+
+class MasterBus:
+    """
+    Master gain, soft clipper and peak limiter (audio thread).
+
+    Buffers are sized once for blocks of up to ``block_frames`` frames, so
+    processing never allocates arrays.
+    """
+
+    CEILING_DB = -1.0  # Highest peak the limiter lets through
+    LOOKAHEAD_MS = 5.0
+    RELEASE_DB_PER_S = 30.0
+    FLOOR_DB = -120.0  # Peaks below this are treated as silence
+
+    def __init__(self, sample_rate: int, channels: int, block_frames: int):
+        self.gain = 1.0
+        self.limiter = True
+        self.soft_clip = False
+        self.reduction_db = 0.0  # Deepest limiter gain reduction since last taken
+        self._applied_gain = self.gain
+        self._release = self.RELEASE_DB_PER_S / sample_rate  # dB per frame
+        self._held_db = 0.0  # Released gain at the end of the last block
+
+        lookahead = max(1, int(round(self.LOOKAHEAD_MS * sample_rate / 1000)))
+        self.lookahead = lookahead
+        size = lookahead + block_frames
+        self._delay = np.zeros((size, channels), dtype=np.float32)  # Last ``lookahead`` frames, then the block
+        self._needed = np.zeros(size, dtype=np.float64)  # Gain each frame needs, in dB
+        self._smooth = np.ones(size, dtype=np.float64)  # Released gain, linear
+        self._work = np.empty(size, dtype=np.float64)
+        self._spare = np.empty(size, dtype=np.float64)
+        self._sum = np.zeros(size + 1, dtype=np.float64)
+        self._steps = np.arange(block_frames, dtype=np.float64) * self._release
+        self._ramp = np.arange(1, block_frames + 1, dtype=np.float32)
+        self._peaks = np.empty(block_frames, dtype=np.float32)
+
+    def configure(self, gain: float, limiter: bool, soft_clip: bool) -> None:
+        """Set the master gain and switch the limiter and soft clipper."""
+        self.gain = max(0.0, gain)
+        if limiter != self.limiter:
+            self._reset_limiter()
+        self.limiter = limiter
+        self.soft_clip = soft_clip
+
+    def take_reduction(self) -> float:
+        """Get the deepest gain reduction in dB since the last call and start over."""
+        reduction, self.reduction_db = self.reduction_db, 0.0
+        return reduction
+
+    def _reset_limiter(self) -> None:
+        """Empty the delay line and release all gain reduction."""
+        self._delay.fill(0.0)
+        self._needed.fill(0.0)
+        self._smooth.fill(1.0)
+        self._held_db = 0.0
+
+    def process(self, block: np.ndarray) -> None:
+        """Apply the master stage to a block in place."""
+        frames = len(block)
+        if frames == 0:
+            return
+        if self.gain != self._applied_gain:
+            # Ramp to the new gain across the block to avoid zipper noise
+            gains = self._peaks[:frames]
+            np.multiply(self._ramp[:frames], (self.gain - self._applied_gain) / frames, out=gains)
+            gains += self._applied_gain
+            block *= gains[:, None]
+            self._applied_gain = self.gain
+        elif self.gain != 1.0:
+            block *= self.gain
+        if self.soft_clip:
+            np.tanh(block, out=block)
+        if self.limiter:
+            self._limit(block)
+
+    def _limit(self, block: np.ndarray) -> None:
+        """Delay the block by the look-ahead and scale it under the ceiling."""
+        frames = len(block)
+        lookahead = self.lookahead
+        window = lookahead + 1
+        total = lookahead + frames
+
+        # Gain needed by each new frame to stay under the ceiling, in dB (0 when already under)
+        peaks = self._peaks[:frames]
+        np.abs(block, out=self._delay[lookahead:total])
+        np.max(self._delay[lookahead:total], axis=1, out=peaks)
+        needed = self._needed[lookahead:total]
+        np.maximum(peaks, db_to_gain(self.FLOOR_DB), out=needed)
+        np.log10(needed, out=needed)
+        needed *= -20.0
+        needed += self.CEILING_DB
+        np.minimum(needed, 0.0, out=needed)
+        self._delay[lookahead:total] = block
+
+        # Look ahead: minimum over each delayed frame and the ``lookahead`` frames after it,
+        # built from doubling windows
+        work, spare = self._work, self._spare
+        work[:total] = self._needed[:total]
+        width = 1
+        while width * 2 <= window:
+            np.minimum(work[:total - width], work[width:total], out=spare[:total - width])
+            work, spare = spare, work
+            width *= 2
+        peak_db = spare[:frames]
+        np.minimum(work[:frames], work[window - width:window - width + frames], out=peak_db)
+
+        # Release at a constant rate: g[i] = min(held + r(i+1), min over k<=i of peak[k] + r(i-k))
+        steps = self._steps[:frames]
+        peak_db -= steps
+        np.minimum.accumulate(peak_db, out=peak_db)
+        np.minimum(peak_db, self._held_db + self._release, out=peak_db)
+        peak_db += steps
+        np.minimum(peak_db, 0.0, out=peak_db)
+        self._held_db = float(peak_db[-1])
+
+        # Linear gains appended to the history, then a moving average over the window
+        smooth = self._smooth[lookahead:total]
+        np.multiply(peak_db, math.log(10.0) / 20.0, out=smooth)
+        np.exp(smooth, out=smooth)
+        np.cumsum(self._smooth[:total], out=self._sum[1:total + 1])
+        gains = self._work[:frames]
+        np.subtract(self._sum[window:window + frames], self._sum[:frames], out=gains)
+        gains *= 1.0 / window
+
+        # Emit the delayed frames scaled by the gain and keep the tails for the next block
+        np.multiply(self._delay[:frames], gains[:, None], out=block)
+        self._delay[:lookahead] = self._delay[frames:total]
+        self._needed[:lookahead] = self._needed[frames:total]
+        self._smooth[:lookahead] = self._smooth[frames:total]
+
+        lowest = float(gains.min())
+        if lowest < 1.0:
+            reduction = -20.0 * math.log10(max(lowest, 1e-6))
+            if reduction > self.reduction_db:
+                self.reduction_db = reduction
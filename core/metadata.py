@@ -0,0 +1,106 @@
+"""
+Metadata Module
+
+Background extraction of duration, sample rate, channel count and bitrate
+for library sounds.
+Headers are read on a small thread pool in batches, and each batch is
+written to the library index in a single transaction, so the metadata
+survives restarts and is only read again for new or changed files.
+"""
+
+import os
+import threading
+from typing import Iterable, List
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from core.audio_info import probe
+from core.library_index import LibraryIndex
+
+
+class _MetadataSignals(QObject):
+    """Signals of metadata tasks, which are not QObjects themselves."""
+
+    done = Signal(list, list)  # Paths handled, paths whose metadata was stored
+
+
+class _MetadataTask(QRunnable):
+    """Reads the headers of a batch of sounds on a worker thread."""
+
+    def __init__(self, index: LibraryIndex, file_paths: List[str], cancelled: threading.Event,
+                 signals: _MetadataSignals):
+        super().__init__()
+        self.index = index
+        self.file_paths = file_paths
+        self.cancelled = cancelled
+        self.signals = signals
+
+    def run(self):
+        rows = []
+        for path in self.file_paths:
+            if self.cancelled.is_set():
+                break
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            rows.append((path, stat.st_size, stat.st_mtime_ns, probe(path)))
+        if rows:
+            self.index.set_infos(rows)
+        try:
+            self.signals.done.emit(self.file_paths, [path for path, _, _, _ in rows])
+        except RuntimeError:
+            pass  # Extractor was deleted while the task was running
+
+
+class MetadataExtractor(QObject):
+    """Reads and stores the metadata of library sounds in the background."""
+
+    extracted = Signal(list)  # Emitted with the paths of each batch just stored
+    finished = Signal()  # Emitted when nothing is left to read
+
+    DEFAULT_THREADS = 2  # Header reads are small and mostly wait on the disk
+    BATCH_SIZE = 32
+
+    def __init__(self, index: LibraryIndex, max_threads: int = DEFAULT_THREADS, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._pending = set()
+        self._cancelled = threading.Event()
+        self._signals = _MetadataSignals()
+        self._signals.done.connect(self._on_done)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether headers are still being read."""
+        return bool(self._pending)
+
+    def extract(self, file_paths: Iterable[str]) -> int:
+        """
+        Queue sounds for reading, skipping those already queued.
+
+        Returns:
+            Number of sounds queued
+        """
+        queued = [path for path in dict.fromkeys(file_paths) if path not in self._pending]
+        self._pending.update(queued)
+        for start in range(0, len(queued), self.BATCH_SIZE):
+            self.pool.start(_MetadataTask(self.index, queued[start:start + self.BATCH_SIZE],
+                                          self._cancelled, self._signals))
+        return len(queued)
+
+    def _on_done(self, file_paths: list, stored: list) -> None:
+        """Announce a finished batch."""
+        self._pending.difference_update(file_paths)
+        if stored:
+            self.extracted.emit(stored)
+        if not self._pending:
+            self.finished.emit()
+
+    def shutdown(self) -> None:
+        """Cancel queued work and wait for the running batches."""
+        self._cancelled.set()
+        self.pool.clear()
+        self.pool.waitForDone()
@@ -0,0 +1,267 @@
+"""
+PCM Cache Module
+
+Persistent on-disk cache of decoded sound files.
+Each entry is a small header followed by interleaved int16 frames, keyed by
+the source path, size and modification time. Entries are read back through
+memory mapping, so a second load costs no decoding and the OS page cache is
+shared between runs. Total size is capped with least-recently-used eviction.
+Sounds converted ahead of time by the library preparer are kept under their
+own key and take precedence over entries decoded on first play.
+"""
+
+import hashlib
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+from PySide6.QtCore import QStandardPaths
+
+
+class MappedSource:
+    """PCM source backed by a memory-mapped cache entry."""
+
+    def __init__(self, data: np.memmap):
+        self.data = data
+        self.frames = len(data)
+        self.channels = data.shape[1]
+
+    def read_into(self, start: int, out: np.ndarray) -> None:
+        """Convert len(out) frames starting at ``start`` to float32 into ``out``."""
+        np.multiply(self.data[start:start + len(out)], 1.0 / 32768.0, out=out)
+
+
+class PCMCache:
+    """Stores decoded PCM on disk and maps it back for playback."""
+
+    MAGIC = b"AMPC"
+    VERSION = 1
+    EXTENSION = ".pcm"
+    # magic, version, channels, sample rate, frames, source size, source mtime (ns), path length
+    HEADER = struct.Struct("<4sHHIQQqH")
+    ALIGNMENT = 64
+    DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        if cache_dir is None:
+            base_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+            cache_dir = os.path.join(base_dir or os.getcwd(), "pcm")
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, file_path: str, sample_rate: int, channels: int,
+                    prepared: bool = False) -> Optional[Path]:
+        """Get the cache file for a sound in the given format, or None if it cannot be stat'ed."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{sample_rate}|{channels}"
+        if prepared:
+            key += "|prepared"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}{self.EXTENSION}"
+
+    def _read_header(self, entry: Path):
+        """Read an entry header, returning (fields, source path, data offset) or None."""
+        try:
+            with open(entry, "rb") as f:
+                fields = self.HEADER.unpack(f.read(self.HEADER.size))
+                source_path = f.read(fields[7]).decode("utf-8")
+        except (OSError, struct.error, UnicodeDecodeError):
+            return None
+        if fields[0] != self.MAGIC or fields[1] != self.VERSION:
+            return None
+        return fields, source_path, self._data_offset(fields[7])
+
+    def _data_offset(self, path_length: int) -> int:
+        """Offset of the PCM data, aligned so the mapping starts on a clean boundary."""
+        size = self.HEADER.size + path_length
+        return (size + self.ALIGNMENT - 1) // self.ALIGNMENT * self.ALIGNMENT
+
+    def open(self, file_path: str, sample_rate: int, channels: int) -> Optional[MappedSource]:
+        """
+        Map a cached sound if a fresh entry exists, preferring a prepared one.
+
+        Args:
+            file_path: Path of the original sound file
+            sample_rate: Sample rate the PCM was decoded at
+            channels: Channel count the PCM was decoded with
+
+        Returns:
+            MappedSource on a cache hit, None otherwise
+        """
+        for prepared in (True, False):
+            entry = self._entry_path(file_path, sample_rate, channels, prepared)
+            if entry is not None and entry.exists():
+                return self._map(entry, file_path, channels)
+        return None
+
+    def is_prepared(self, file_path: str, sample_rate: int, channels: int) -> bool:
+        """Check if a sound has a fresh prepared entry in the given format."""
+        entry = self._entry_path(file_path, sample_rate, channels, prepared=True)
+        return entry is not None and entry.exists()
+
+    def _map(self, entry: Path, file_path: str, channels: int) -> Optional[MappedSource]:
+        """Map the PCM data of an entry."""
+        header = self._read_header(entry)
+        if header is None:
+            return None
+        fields, _, offset = header
+        frames = fields[4]
+
+        try:
+            if frames == 0:
+                data = np.zeros((0, channels), dtype=np.int16)
+            else:
+                data = np.memmap(entry, dtype=np.int16, mode="r", offset=offset, shape=(frames, channels))
+            os.utime(entry)  # Mark as recently used for LRU eviction
+        except (OSError, ValueError) as e:
+            print(f"Error mapping cache entry for {file_path}: {e}")
+            return None
+        return MappedSource(data)
+
+    def store(self, file_path: str, data: np.ndarray, sample_rate: int,
+              prepared: bool = False) -> Optional[MappedSource]:
+        """
+        Write decoded float32 frames to the cache and map them back.
+
+        Args:
+            file_path: Path of the original sound file
+            data: Float32 frames shaped (frames, channels)
+            sample_rate: Sample rate of the frames
+            prepared: True if the frames were converted ahead of time; the
+                entry then replaces one decoded on first play
+
+        Returns:
+            MappedSource for the new entry, None if it could not be written
+        """
+        channels = data.shape[1]
+        entry = self._entry_path(file_path, sample_rate, channels, prepared)
+        if entry is None:
+            return None
+
+        stat = os.stat(file_path)
+        path_bytes = os.path.abspath(file_path).encode("utf-8")
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, channels, sample_rate, len(data),
+                                  stat.st_size, stat.st_mtime_ns, len(path_bytes))
+        padding = self._data_offset(len(path_bytes)) - len(header) - len(path_bytes)
+        pcm = (np.clip(data, -1.0, 1.0) * 32767.0).astype("<i2")
+
+        temp_entry = entry.with_name(f"{entry.name}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_entry, "wb") as f:
+                f.write(header)
+                f.write(path_bytes)
+                f.write(b"\0" * padding)
+                f.write(pcm.tobytes())
+            os.replace(temp_entry, entry)
+        except OSError as e:
+            print(f"Error writing cache entry for {file_path}: {e}")
+            try:
+                temp_entry.unlink()
+            except OSError:
+                pass
+            return None
+
+        if prepared:
+            superseded = self._entry_path(file_path, sample_rate, channels)
+            try:
+                superseded.unlink()
+            except OSError:
+                pass  # Missing, or still mapped on platforms that lock open files
+        self._evict(keep=entry)
+        return self._map(entry, file_path, channels)
+
+    def _entries(self):
+        """List cache entries as (path, size, last use) tuples, oldest first."""
+        entries = []
+        for entry in self.cache_dir.glob(f"*{self.EXTENSION}"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((entry, stat.st_size, stat.st_mtime))
+        entries.sort(key=lambda item: item[2])
+        return entries
+
+    def size(self) -> int:
+        """Get the total size of the cache in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self, keep: Path = None) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for entry, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                if entry == keep:
+                    continue
+                try:
+                    entry.unlink()
+                    total -= size
+                except OSError:
+                    pass  # Still mapped on platforms that lock open files
+
+    def prune(self, known_files: Iterable[str]) -> int:
+        """
+        Drop entries whose source file changed or left the library.
+
+        Args:
+            known_files: Sound files currently in the library, as listed by SoundManager
+
+        Returns:
+            Number of entries removed
+        """
+        known = {os.path.abspath(path) for path in known_files}
+        removed = 0
+        with self._lock:
+            for entry, _, _ in self._entries():
+                header = self._read_header(entry)
+                stale = header is None
+                if not stale:
+                    fields, source_path, _ = header
+                    try:
+                        stat = os.stat(source_path)
+                        stale = (source_path not in known
+                                 or (stat.st_size, stat.st_mtime_ns) != (fields[5], fields[6]))
+                    except OSError:
+                        stale = True
+                if stale:
+                    try:
+                        entry.unlink()
+                        removed += 1
+                    except OSError:
+                        pass
+        return removed
+
+    def retain_format(self, sample_rate: int, channels: int) -> int:
+        """
+        Drop entries decoded for any other output format.
+
+        Args:
+            sample_rate: Sample rate of the entries to keep
+            channels: Channel count of the entries to keep
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        with self._lock:
+            for entry, _, _ in self._entries():
+                header = self._read_header(entry)
+                if header is not None and (header[0][3], header[0][2]) == (sample_rate, channels):
+                    continue
+                try:
+                    entry.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
@@ -0,0 +1,297 @@
+"""
+Peaks Module
+
+Multi-resolution waveform overviews for sound files.
+Each file is decoded once on a worker thread into a pyramid of min/max
+peaks, where every level merges four buckets of the level below. Levels are
+stored as 8-bit pairs in a small cache file that records the size and
+modification time of the source, and widgets map only the level matching
+their pixel width.
+"""
+
+import hashlib
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+from PySide6.QtCore import QObject, QRunnable, QStandardPaths, QThreadPool, Signal
+
+from core.decoder import decode_stream
+
+
+class PeakBuilder:
+    """Accumulates min/max peaks per bucket from chunks of any length."""
+
+    def __init__(self, bucket_frames: int):
+        self.bucket_frames = bucket_frames
+        self.frames = 0
+        self._buckets: List[np.ndarray] = []
+        self._remainder = np.zeros((2, 0), dtype=np.float32)  # (lows, highs) not yet filling a bucket
+
+    def add(self, chunk: np.ndarray) -> None:
+        """Add float32 frames shaped (frames, channels); channels are merged by their extremes."""
+        self.frames += len(chunk)
+        lows = chunk.min(axis=1)
+        highs = chunk.max(axis=1)
+        if self._remainder.shape[1]:
+            lows = np.concatenate((self._remainder[0], lows))
+            highs = np.concatenate((self._remainder[1], highs))
+        whole = len(lows) // self.bucket_frames * self.bucket_frames
+        if whole:
+            buckets = np.empty((whole // self.bucket_frames, 2), dtype=np.float32)
+            buckets[:, 0] = lows[:whole].reshape(-1, self.bucket_frames).min(axis=1)
+            buckets[:, 1] = highs[:whole].reshape(-1, self.bucket_frames).max(axis=1)
+            self._buckets.append(buckets)
+        self._remainder = np.stack((lows[whole:], highs[whole:]))
+
+    def finish(self) -> np.ndarray:
+        """Get the base level peaks shaped (buckets, 2), including the last partial bucket."""
+        if self._remainder.shape[1]:
+            self._buckets.append(np.array([[self._remainder[0].min(), self._remainder[1].max()]], dtype=np.float32))
+            self._remainder = np.zeros((2, 0), dtype=np.float32)
+        if not self._buckets:
+            return np.zeros((0, 2), dtype=np.float32)
+        return np.concatenate(self._buckets)
+
+
+def build_pyramid(base: np.ndarray, factor: int, min_buckets: int) -> List[np.ndarray]:
+    """Build coarser levels from base peaks until a level holds at most ``min_buckets`` buckets."""
+    levels = [base]
+    while len(levels[-1]) > min_buckets:
+        level = levels[-1]
+        pad = -len(level) % factor
+        if pad:
+            level = np.concatenate((level, np.repeat(level[-1:], pad, axis=0)))
+        grouped = level.reshape(-1, factor, 2)
+        levels.append(np.stack((grouped[:, :, 0].min(axis=1), grouped[:, :, 1].max(axis=1)), axis=1))
+    return levels
+
+
+class PeakCache:
+    """Stores peak pyramids on disk and reads back single levels."""
+
+    MAGIC = b"AMPK"
+    VERSION = 1
+    EXTENSION = ".peaks"
+    # magic, version, sample rate, frames, source size, source mtime (ns), base bucket, factor, levels, path length
+    HEADER = struct.Struct("<4sHIQQqIHHH")
+    LEVEL_COUNT = struct.Struct("<Q")
+
+    SAMPLE_RATE = 11025  # Decode rate for peaks; plenty for an overview
+    BASE_BUCKET = 64  # Frames per bucket at the finest level
+    FACTOR = 4
+    MIN_BUCKETS = 32
+
+    def __init__(self, cache_dir: str = None):
+        if cache_dir is None:
+            base_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+            cache_dir = os.path.join(base_dir or os.getcwd(), "peaks")
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, file_path: str) -> Path:
+        """Get the cache file of a sound; the file version is checked against its header."""
+        digest = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}{self.EXTENSION}"
+
+    def _read_layout(self, entry: Path):
+        """Read an entry's header, returning (fields, source path, level counts, data offset) or None."""
+        try:
+            with open(entry, "rb") as f:
+                fields = self.HEADER.unpack(f.read(self.HEADER.size))
+                if fields[0] != self.MAGIC or fields[1] != self.VERSION:
+                    return None
+                source_path = f.read(fields[9]).decode("utf-8")
+                counts = [self.LEVEL_COUNT.unpack(f.read(self.LEVEL_COUNT.size))[0] for _ in range(fields[8])]
+                return fields, source_path, counts, f.tell()
+        except (OSError, struct.error, UnicodeDecodeError):
+            return None
+
+    def is_current(self, file_path: str) -> bool:
+        """Check if a fresh pyramid exists for a file."""
+        return self._current_layout(file_path) is not None
+
+    def _current_layout(self, file_path: str):
+        """Get the layout of a file's entry if it matches the file's size and modification time."""
+        entry = self._entry_path(file_path)
+        if not entry.exists():
+            return None
+        layout = self._read_layout(entry)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        if layout is None or (layout[0][4], layout[0][5]) != (stat.st_size, stat.st_mtime_ns):
+            return None
+        return entry, layout
+
+    def read_level(self, file_path: str, width: int) -> Optional[np.ndarray]:
+        """
+        Read the coarsest level that still has at least ``width`` buckets.
+
+        Args:
+            file_path: Path of the sound file
+            width: Number of columns the caller will draw
+
+        Returns:
+            Float32 peaks shaped (buckets, 2) as (min, max), or None if the file has no fresh entry
+        """
+        current = self._current_layout(file_path)
+        if current is None:
+            return None
+        entry, (_, _, counts, offset) = current
+        if not counts:
+            return np.zeros((0, 2), dtype=np.float32)
+
+        level = 0
+        while level + 1 < len(counts) and counts[level + 1] >= width:
+            level += 1
+        offset += sum(counts[:level]) * 2
+        if counts[level] == 0:
+            return np.zeros((0, 2), dtype=np.float32)
+        try:
+            data = np.memmap(entry, dtype=np.int8, mode="r", offset=offset, shape=(counts[level], 2))
+        except (OSError, ValueError):
+            return None
+        return data.astype(np.float32) / 127.0
+
+    def store(self, file_path: str, levels: List[np.ndarray], sample_rate: int, frames: int,
+              signature: tuple) -> None:
+        """Write a pyramid for a file, quantizing peaks to 8 bits."""
+        entry = self._entry_path(file_path)
+        path_bytes = os.path.abspath(file_path).encode("utf-8")
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, sample_rate, frames, signature[0], signature[1],
+                                  self.BASE_BUCKET, self.FACTOR, len(levels), len(path_bytes))
+        temp_entry = entry.with_name(f"{entry.name}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_entry, "wb") as f:
+                f.write(header)
+                f.write(path_bytes)
+                for level in levels:
+                    f.write(self.LEVEL_COUNT.pack(len(level)))
+                for level in levels:
+                    f.write(np.round(np.clip(level, -1.0, 1.0) * 127.0).astype(np.int8).tobytes())
+            os.replace(temp_entry, entry)
+        except OSError as e:
+            print(f"Error writing peaks for {file_path}: {e}")
+            try:
+                temp_entry.unlink()
+            except OSError:
+                pass
+
+    def compute(self, file_path: str, cancelled: threading.Event = None) -> bool:
+        """
+        Decode a file and store its pyramid.
+
+        Returns:
+            True if the pyramid was stored
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        builder = PeakBuilder(self.BASE_BUCKET)
+
+        def on_chunk(chunk: np.ndarray) -> bool:
+            builder.add(chunk)
+            return not (cancelled and cancelled.is_set())
+
+        if not decode_stream(file_path, self.SAMPLE_RATE, 1, on_chunk):
+            return False
+        if cancelled and cancelled.is_set():
+            return False
+        levels = build_pyramid(builder.finish(), self.FACTOR, self.MIN_BUCKETS)
+        self.store(file_path, levels, self.SAMPLE_RATE, builder.frames, (stat.st_size, stat.st_mtime_ns))
+        return True
+
+    def prune(self, known_files: Iterable[str]) -> None:
+        """Remove entries of files that left the library."""
+        known = {os.path.abspath(path) for path in known_files}
+        for entry in self.cache_dir.glob(f"*{self.EXTENSION}"):
+            layout = self._read_layout(entry)
+            if layout is None or layout[1] not in known:
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+
+class _PeakSignals(QObject):
+    """Signals of peak tasks, which are not QObjects themselves."""
+
+    done = Signal(str, bool)
+
+
+class _PeakTask(QRunnable):
+    """Computes one file's pyramid on a worker thread."""
+
+    def __init__(self, cache: PeakCache, file_path: str, cancelled: threading.Event, signals: _PeakSignals):
+        super().__init__()
+        self.cache = cache
+        self.file_path = file_path
+        self.cancelled = cancelled
+        self.signals = signals
+
+    def run(self):
+        ok = False
+        if not self.cancelled.is_set():
+            ok = self.cache.compute(self.file_path, self.cancelled)
+        try:
+            self.signals.done.emit(self.file_path, ok)
+        except RuntimeError:
+            pass  # Service was deleted while the task was running
+
+
+class PeakService(QObject):
+    """Serves waveform peaks to widgets, computing missing pyramids in the background."""
+
+    peaks_ready = Signal(str)  # Emitted with the path of a file whose pyramid was just stored
+
+    DEFAULT_THREADS = 2
+
+    def __init__(self, cache: PeakCache = None, max_threads: int = DEFAULT_THREADS, parent=None):
+        super().__init__(parent)
+        self.cache = cache if cache is not None else PeakCache()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._pending = set()
+        self._failed = set()  # Files that could not be decoded, not retried until refreshed
+        self._cancelled = threading.Event()
+        self._signals = _PeakSignals()
+        self._signals.done.connect(self._on_done)
+
+    def peaks(self, file_path: str, width: int) -> Optional[np.ndarray]:
+        """Get peaks for drawing ``width`` columns, queueing the file if its pyramid is missing."""
+        peaks = self.cache.read_level(file_path, width)
+        if peaks is None:
+            self.request(file_path)
+        return peaks
+
+    def request(self, file_path: str) -> None:
+        """Queue a file's pyramid for computation."""
+        if file_path in self._pending or file_path in self._failed:
+            return
+        self._pending.add(file_path)
+        self.pool.start(_PeakTask(self.cache, file_path, self._cancelled, self._signals))
+
+    def _on_done(self, file_path: str, ok: bool) -> None:
+        """Announce a finished pyramid."""
+        self._pending.discard(file_path)
+        if ok:
+            self.peaks_ready.emit(file_path)
+        else:
+            self._failed.add(file_path)
+
+    def prune(self, known_files: Iterable[str]) -> None:
+        """Drop cached pyramids of files that left the library and retry failed files."""
+        self._failed.clear()
+        self.cache.prune(known_files)
+
+    def shutdown(self) -> None:
+        """Cancel queued work and stop decoding as soon as possible."""
+        self._cancelled.set()
+        self.pool.clear()
+        self.pool.waitForDone()
@@ -0,0 +1,129 @@
+"""
+Headless Player Module
+
+Plays a saved session without any user interface.
+Only QtCore and QtMultimedia are loaded: the tracks are restored straight
+into the mixing engine from the same state fields MixerTrackWidget saves,
+which keeps startup time and memory far below the full GUI.
+
+Usage:
+    python -m core.play sessions/foo.json [--duration 8h]
+"""
+
+import argparse
+import os
+import signal
+import sys
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer
+
+from core.analysis import LoudnessIndex
+from core.audio_info import probe
+from core.engine import EngineTrack, MixerEngine
+from core.master import db_to_gain
+from core.pcm_cache import PCMCache
+from core.render import parse_duration
+from core.session import SessionManager
+from core.settings import SettingsManager
+
+
+def _probe_duration(file_path: str) -> Optional[float]:
+    """Read a file's duration from its header."""
+    info = probe(file_path)
+    return info["duration"] if info else None
+
+
+class HeadlessPlayer(QObject):
+    """Restores a session into the mixing engine and drives its auto-playback."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        settings = SettingsManager()
+        cache = PCMCache(max_bytes=settings.get_pcm_cache_limit_mb() * 1024 * 1024)
+        buffer_ms, period_ms = settings.get_buffering()
+        self.engine = MixerEngine(cache, _probe_duration, self, buffer_ms=buffer_ms, period_ms=period_ms)
+        self.engine.loop_crossfade_ms = settings.get_loop_crossfade_ms()
+        self.engine.streaming_threshold = settings.get_streaming_threshold()
+        self.engine.stream_lookahead = settings.get_stream_lookahead()
+        self.engine.set_voice_limits(*settings.get_voice_limits())
+        gain_db, limiter, soft_clip = settings.get_master()
+        self.engine.set_master(db_to_gain(gain_db), limiter, soft_clip)
+        if settings.get_normalize_loudness():
+            self.engine.set_normalization(LoudnessIndex().normalization_gain)
+        self.tracks: List[EngineTrack] = []
+
+    def load(self, session: Dict[str, Any], seed: Optional[int] = None) -> int:
+        """
+        Restore and start the tracks of a session.
+
+        Args:
+            session: Session data as loaded by SessionManager
+            seed: Seed of the auto-playback intervals, overriding the session's own
+
+        Returns:
+            Number of tracks restored
+        """
+        self.engine.seed = seed if seed is not None else session.get("seed", 0)
+        for state in session.get("tracks", []):
+            sound_file = state.get("sound_file")
+            if not sound_file or not os.path.exists(sound_file):
+                print(f"Skipping missing sound file: {sound_file}")
+                continue
+
+            track = self.engine.create_track(sound_file)
+            track.apply_state(state)
+            self.tracks.append(track)
+
+            if state.get("playback_auto", False):
+                self.engine.set_auto_playback(track, True, state.get("interval", 20), state.get("interval_type", 0))
+            else:
+                track.play()
+        return len(self.tracks)
+
+    def stop(self) -> None:
+        """Stop all playback."""
+        for track in self.tracks:
+            self.engine.remove_track(track)
+        self.tracks.clear()
+        self.engine.stop()
+
+
+def main(argv=None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Play a mixer session without the user interface.")
+    parser.add_argument("session", help="Session JSON file")
+    parser.add_argument("--duration", type=parse_duration, default=None,
+                        help="Stop after this long, e.g. 8h, 45m, 90s (default: play until interrupted)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for random auto-playback intervals (default: the session's own seed)")
+    args = parser.parse_args(argv)
+
+    app = QCoreApplication(sys.argv[:1])
+    app.setApplicationName("Ambient Sound Mixer")
+    app.setOrganizationName("Ambient Mixer")
+
+    session = SessionManager().load_session(os.path.abspath(args.session))
+    if session is None:
+        return 1
+
+    player = HeadlessPlayer()
+    count = player.load(session, args.seed)
+    print(f"Playing {count} track(s) from {args.session}")
+    app.aboutToQuit.connect(player.stop)
+
+    if args.duration:
+        QTimer.singleShot(int(args.duration * 1000), app.quit)
+
+    # Let Ctrl+C stop the event loop: Python only handles signals between Qt events
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    signal.signal(signal.SIGTERM, lambda *_: app.quit())
+    wakeup = QTimer()
+    wakeup.timeout.connect(lambda: None)
+    wakeup.start(500)
+
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Prepare Module
+
+Ahead-of-time conversion of the sound library to the output format.
+Each sound is decoded in its native rate and channel layout, converted once
+with the windowed-sinc resampler and stored in the PCM cache as a prepared
+entry, so playback maps audio that already matches the device and the mixing
+path never resamples. Original files are only ever read.
+"""
+
+import threading
+from typing import Callable, Iterable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from core.decoder import decode_converted
+from core.pcm_cache import PCMCache
+
+
+class _PrepareSignals(QObject):
+    """Signals of prepare tasks, which are not QObjects themselves."""
+
+    done = Signal(str, bool)
+
+
+class _PrepareTask(QRunnable):
+    """Converts one sound on a worker thread."""
+
+    def __init__(self, preparer: "LibraryPreparer", file_path: str, cancelled: threading.Event,
+                 signals: _PrepareSignals):
+        super().__init__()
+        self.cache = preparer.cache
+        self.sample_rate = preparer.sample_rate
+        self.channels = preparer.channels
+        self.file_path = file_path
+        self.cancelled = cancelled
+        self.signals = signals
+
+    def run(self):
+        ok = False
+        if not self.cancelled.is_set():
+            data = decode_converted(self.file_path, self.sample_rate, self.channels)
+            # Int16 entries take half the float32 size; never evict other sounds to fit one in
+            fits = data is not None and self.cache.size() + data.nbytes // 2 <= self.cache.max_bytes
+            if fits and not self.cancelled.is_set():
+                ok = self.cache.store(self.file_path, data, self.sample_rate, prepared=True) is not None
+        try:
+            self.signals.done.emit(self.file_path, ok)
+        except RuntimeError:
+            pass  # Preparer was deleted while the task was running
+
+
+class LibraryPreparer(QObject):
+    """Converts library sounds to the output format in the background."""
+
+    progress = Signal(int, int)  # Sounds handled so far, sounds in the batch
+    finished = Signal(int)  # Emitted with the number of sounds converted
+
+    DEFAULT_THREADS = 1  # Conversion is CPU bound; leave cores to playback loads
+
+    def __init__(self, cache: PCMCache, sample_rate: int, channels: int,
+                 duration_lookup: Callable[[str], Optional[float]] = None,
+                 streaming_threshold: float = None, max_threads: int = DEFAULT_THREADS, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.duration_lookup = duration_lookup
+        self.streaming_threshold = streaming_threshold
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._pending = set()
+        self._total = 0
+        self._handled = 0
+        self._converted = 0
+        self._cancelled = threading.Event()
+        self._signals = _PrepareSignals()
+        self._signals.done.connect(self._on_done)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether a batch is in progress."""
+        return bool(self._pending)
+
+    def _needs_preparing(self, file_path: str) -> bool:
+        """Check if a sound is played from the cache and not converted yet."""
+        if self.streaming_threshold is not None and self.duration_lookup is not None:
+            duration = self.duration_lookup(file_path)
+            if duration is not None and duration > self.streaming_threshold:
+                return False  # Streamed sounds are decoded while playing, never cached
+        return not self.cache.is_prepared(file_path, self.sample_rate, self.channels)
+
+    def prepare(self, files: Iterable[str]) -> int:
+        """
+        Queue the sounds that have no prepared entry yet.
+
+        Returns:
+            Number of sounds queued
+        """
+        queued = [path for path in files if path not in self._pending and self._needs_preparing(path)]
+        if not self._pending:
+            self._total = self._handled = self._converted = 0
+        self._total += len(queued)
+        for path in queued:
+            self._pending.add(path)
+            self.pool.start(_PrepareTask(self, path, self._cancelled, self._signals))
+        if not self._pending:
+            self.finished.emit(0)
+        return len(queued)
+
+    def _on_done(self, file_path: str, ok: bool) -> None:
+        """Count a finished sound and report the end of the batch."""
+        self._pending.discard(file_path)
+        self._handled += 1
+        self._converted += int(ok)
+        self.progress.emit(self._handled, self._total)
+        if not self._pending:
+            self.finished.emit(self._converted)
+
+    def shutdown(self) -> None:
+        """Cancel queued work and wait for the running conversion."""
+        self._cancelled.set()
+        self.pool.clear()
+        self.pool.waitForDone()
@@ -0,0 +1,277 @@
+"""
+Offline Render Module
+
+Renders a saved session to an audio file faster than real time.
+Tracks are mixed by the same Mixer used for live playback, with their
+volume, loop, volume automation and auto-playback settings, and written to
+disk chunk by chunk so memory stays flat however long the render is.
+Auto-playback triggers run on the mixer's sample clock with per-track
+random streams derived from the session seed, so a render is reproducible
+and triggers on the same frames as live playback of the session.
+
+Usage:
+    python -m core.render sessions/foo.json sleep.wav --duration 8h --seed 42
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from PySide6.QtCore import QCoreApplication
+
+from core.analysis import LoudnessIndex
+from core.audio_info import probe
+from core.automation import playback_rng
+from core.engine import EngineTrack, Mixer, MixerEngine, load_sound
+from core.master import db_to_gain
+from core.pcm_cache import PCMCache
+from core.session import SessionManager
+from core.settings import SettingsManager
+from core.streaming import StreamingSource
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None  # Only needed for compressed output formats
+
+
+class WavWriter:
+    """
+    Streaming 16-bit PCM WAV writer.
+
+    A JUNK chunk is reserved after the RIFF header so the file can be
+    promoted to RF64 in place when the data grows past the 4 GB RIFF limit,
+    as happens with long stereo renders.
+    """
+
+    RIFF_LIMIT = 0xFFFFFFFF
+
+    def __init__(self, path: str, sample_rate: int, channels: int):
+        self.file = open(path, "wb")
+        self.channels = channels
+        self.data_bytes = 0
+        block_align = channels * 2
+        self.file.write(b"RIFF" + struct.pack("<I", 0) + b"WAVE")
+        self.file.write(b"JUNK" + struct.pack("<I", 28) + b"\0" * 28)
+        self.file.write(b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate,
+                                              sample_rate * block_align, block_align, 16))
+        self.file.write(b"data" + struct.pack("<I", 0))
+        self.header_bytes = self.file.tell()
+
+    def write(self, frames: np.ndarray) -> None:
+        """Append float32 frames, converting them to 16-bit PCM."""
+        pcm = (np.clip(frames, -1.0, 1.0) * 32767.0).astype("<i2")
+        self.file.write(pcm.tobytes())
+        self.data_bytes += pcm.nbytes
+
+    def close(self) -> None:
+        """Patch the chunk sizes into the header and close the file."""
+        riff_size = self.header_bytes - 8 + self.data_bytes
+        if riff_size <= self.RIFF_LIMIT:
+            self.file.seek(4)
+            self.file.write(struct.pack("<I", riff_size))
+            self.file.seek(self.header_bytes - 4)
+            self.file.write(struct.pack("<I", self.data_bytes))
+        else:
+            sample_count = self.data_bytes // (self.channels * 2)
+            self.file.seek(0)
+            self.file.write(b"RF64" + struct.pack("<I", self.RIFF_LIMIT))
+            self.file.seek(12)
+            self.file.write(b"ds64" + struct.pack("<IQQQI", 28, riff_size, self.data_bytes, sample_count, 0))
+            self.file.seek(self.header_bytes - 4)
+            self.file.write(struct.pack("<I", self.RIFF_LIMIT))
+        self.file.close()
+
+
+class _SoundFileWriter:
+    """Writer for compressed formats backed by the optional soundfile package."""
+
+    FORMATS = {".ogg": ("OGG", "VORBIS"), ".flac": ("FLAC", "PCM_16")}
+
+    def __init__(self, path: str, sample_rate: int, channels: int):
+        file_format, subtype = self.FORMATS[os.path.splitext(path)[1].lower()]
+        self.file = soundfile.SoundFile(path, "w", sample_rate, channels, subtype, format=file_format)
+
+    def write(self, frames: np.ndarray) -> None:
+        """Append float32 frames."""
+        self.file.write(frames)
+
+    def close(self) -> None:
+        """Finish and close the file."""
+        self.file.close()
+
+
+def writer_class(path: str):
+    """
+    Get the writer class for an output file based on its extension.
+
+    Raises:
+        ValueError: If the format is not supported or its package is not installed
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".wav":
+        return WavWriter
+    if extension in _SoundFileWriter.FORMATS:
+        if soundfile is None:
+            raise ValueError(f"Writing {extension} files requires the 'soundfile' package")
+        return _SoundFileWriter
+    raise ValueError(f"Unsupported output format: {extension or path}")
+
+
+def open_writer(path: str, sample_rate: int, channels: int):
+    """Open a chunked writer for the output file based on its extension."""
+    return writer_class(path)(path, sample_rate, channels)
+
+
+class SessionRenderer:
+    """Mixes the tracks of a session offline."""
+
+    CHUNK_SECONDS = 1.0
+
+    def __init__(self, session: Dict[str, Any], sample_rate: int = MixerEngine.DEFAULT_SAMPLE_RATE,
+                 seed: Optional[int] = None, cache: PCMCache = None,
+                 normalization: Optional[Callable[[str], float]] = None,
+                 loop_crossfade_ms: int = MixerEngine.DEFAULT_LOOP_CROSSFADE_MS,
+                 streaming_threshold: float = MixerEngine.DEFAULT_STREAMING_THRESHOLD,
+                 stream_lookahead: float = MixerEngine.DEFAULT_STREAM_LOOKAHEAD):
+        self.session = session
+        self.normalization = normalization  # Loudness gain per file, as in live playback
+        # Loop and streaming choices made the same way as by the live engine
+        self.loop_crossfade_ms = loop_crossfade_ms
+        self.streaming_threshold = streaming_threshold
+        self.stream_lookahead = stream_lookahead
+        self.sample_rate = sample_rate
+        self.channels = MixerEngine.CHANNELS
+        self.seed = seed if seed is not None else session.get("seed", 0)
+        self.cache = cache if cache is not None else PCMCache()
+        self.mixer = Mixer(sample_rate, self.channels)
+        self.states: List[Dict[str, Any]] = []
+        self._load_tracks()
+
+    def _load_tracks(self) -> None:
+        """Load every available track of the session and apply its saved state."""
+        crossfade_frames = self.sample_rate * self.loop_crossfade_ms // 1000
+        for state in self.session.get("tracks", []):
+            sound_file = state.get("sound_file")
+            if not sound_file or not os.path.exists(sound_file):
+                print(f"Skipping missing sound file: {sound_file}")
+                continue
+
+            track = EngineTrack(sound_file)
+            info = probe(sound_file)
+            if info and info["duration"] > self.streaming_threshold:
+                source = StreamingSource(sound_file, self.sample_rate, self.channels,
+                                         int(info["duration"] * self.sample_rate),
+                                         int(self.stream_lookahead * self.sample_rate),
+                                         blocking=True)
+                track.set_source(source)
+            else:
+                source, loop_source = load_sound(sound_file, self.sample_rate, self.channels,
+                                                 self.cache, crossfade_frames)
+                if source is None:
+                    print(f"Could not decode sound file: {sound_file}")
+                    continue
+                track.set_source(source, loop_source)
+
+            track.apply_state(state)
+            if self.normalization:
+                track.set_trim(self.normalization(sound_file))
+
+            self.states.append(state)
+            self.mixer.add_track(track)
+            if state.get("playback_auto", False):
+                self.mixer.set_auto_playback(track, (state.get("interval", 20), state.get("interval_type", 0),
+                                                     playback_rng(self.seed, sound_file)))
+            else:
+                track.play()
+
+    def render(self, output_path: str, duration: float,
+               progress: Optional[Callable[[float], None]] = None) -> None:
+        """
+        Render the session to a file.
+
+        Args:
+            output_path: Destination file (.wav, or .ogg/.flac with soundfile installed)
+            duration: Length of the render in seconds
+            progress: Optional callback receiving the completed fraction
+        """
+        total = int(duration * self.sample_rate)
+        chunk = int(self.CHUNK_SECONDS * self.sample_rate)
+        writer = open_writer(output_path, self.sample_rate, self.channels)
+        try:
+            position = 0
+            while position < total:
+                end = min(total, position + chunk)
+                writer.write(self.mixer.render(end - position))
+                position = end
+                if progress:
+                    progress(position / total)
+        finally:
+            for track in self.mixer.tracks:
+                if isinstance(track.source, StreamingSource):
+                    track.source.close()
+            writer.close()
+
+
+def parse_duration(text: str) -> float:
+    """Parse a duration such as '8h', '45m', '90s' or '120' (seconds)."""
+    units = {"h": 3600, "m": 60, "s": 1}
+    text = text.strip().lower()
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def main(argv=None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Render a mixer session to an audio file.")
+    parser.add_argument("session", help="Session JSON file")
+    parser.add_argument("output", help="Output file (.wav, .ogg or .flac)")
+    parser.add_argument("--duration", required=True, type=parse_duration,
+                        help="Length of the render, e.g. 8h, 45m, 90s")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for random auto-playback intervals (default: the session's own seed)")
+    parser.add_argument("--sample-rate", type=int, default=MixerEngine.DEFAULT_SAMPLE_RATE)
+    args = parser.parse_args(argv)
+    try:
+        writer_class(args.output)  # Checked before any sound is decoded
+    except ValueError as e:
+        parser.error(str(e))
+
+    app = QCoreApplication(sys.argv[:1])
+    app.setApplicationName("Ambient Sound Mixer")
+    app.setOrganizationName("Ambient Mixer")
+
+    session = SessionManager().load_session(os.path.abspath(args.session))
+    if session is None:
+        return 1
+
+    normalization = None
+    settings = SettingsManager()
+    if settings.get_normalize_loudness():
+        normalization = LoudnessIndex().normalization_gain
+    renderer = SessionRenderer(session, args.sample_rate, args.seed, normalization=normalization,
+                               loop_crossfade_ms=settings.get_loop_crossfade_ms(),
+                               streaming_threshold=settings.get_streaming_threshold(),
+                               stream_lookahead=settings.get_stream_lookahead())
+    renderer.mixer.voices.set_limits(*settings.get_voice_limits())
+    gain_db, limiter, soft_clip = settings.get_master()
+    renderer.mixer.master.configure(db_to_gain(gain_db), limiter, soft_clip)
+    started = time.perf_counter()
+
+    def report(fraction: float):
+        elapsed = time.perf_counter() - started
+        speed = fraction * args.duration / elapsed if elapsed else 0.0
+        print(f"\rRendering {fraction:6.1%} ({speed:.0f}x real time)", end="", flush=True)
+
+    renderer.render(args.output, args.duration, report)
+    print(f"\nWrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
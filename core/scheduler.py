@@ -0,0 +1,153 @@
+"""
+Scheduler Module
+
+Central event scheduler for the mixer.
+All pending automation refreshes and auto-playback triggers are kept in one
+priority queue driven by a single QTimer, which only wakes for the next due
+event and dispatches every event falling due within a short window together.
+"""
+
+import heapq
+import itertools
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer
+
+
+class ScheduledEvent:
+    """Handle to an event queued in the scheduler."""
+
+    __slots__ = ("due", "seq", "callback", "interval", "owner", "cancelled")
+
+    def __init__(self, due: float, seq: int, callback: Callable[[], None],
+                 interval: Optional[float], owner: Any):
+        self.due = due
+        self.seq = seq
+        self.callback = callback
+        self.interval = interval
+        self.owner = owner
+        self.cancelled = False
+
+    def __lt__(self, other: "ScheduledEvent") -> bool:
+        return (self.due, self.seq) < (other.due, other.seq)
+
+
+class EventScheduler(QObject):
+    """Dispatches timed callbacks from a heap using a single timer."""
+
+    BATCH_WINDOW_MS = 50  # Events due this close together are dispatched in one wakeup
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue: List[ScheduledEvent] = []
+        self._counter = itertools.count()
+        self._paused_at: Optional[float] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._dispatch)
+
+    @staticmethod
+    def _now() -> float:
+        """Current time in milliseconds on a monotonic clock."""
+        return time.monotonic() * 1000.0
+
+    def schedule(self, delay_ms: float, callback: Callable[[], None], owner: Any = None) -> ScheduledEvent:
+        """Run ``callback`` once after ``delay_ms`` milliseconds."""
+        return self._push(delay_ms, callback, None, owner)
+
+    def schedule_repeating(self, interval_ms: float, callback: Callable[[], None],
+                           owner: Any = None) -> ScheduledEvent:
+        """Run ``callback`` every ``interval_ms`` milliseconds until cancelled."""
+        return self._push(interval_ms, callback, interval_ms, owner)
+
+    def _push(self, delay_ms: float, callback, interval, owner) -> ScheduledEvent:
+        base = self._paused_at if self._paused_at is not None else self._now()
+        event = ScheduledEvent(base + max(0.0, delay_ms), next(self._counter), callback, interval, owner)
+        heapq.heappush(self._queue, event)
+        self._rearm()
+        return event
+
+    def cancel(self, event: Optional[ScheduledEvent]) -> None:
+        """Cancel a pending event; cancelled events are dropped lazily from the queue."""
+        if event is not None and not event.cancelled:
+            event.cancelled = True
+            self._rearm()
+
+    def cancel_owner(self, owner: Any) -> None:
+        """Cancel every pending event registered by ``owner``."""
+        for event in self._queue:
+            if event.owner is owner:
+                event.cancelled = True
+        self._rearm()
+
+    def clear(self) -> None:
+        """Drop every pending event."""
+        self._queue.clear()
+        self._timer.stop()
+
+    def pause(self) -> None:
+        """Freeze the schedule; remaining delays are kept until resume()."""
+        if self._paused_at is None:
+            self._paused_at = self._now()
+            self._timer.stop()
+
+    def resume(self) -> None:
+        """Continue a paused schedule, shifting every event by the paused time."""
+        if self._paused_at is None:
+            return
+        shift = self._now() - self._paused_at
+        self._paused_at = None
+        for event in self._queue:
+            event.due += shift
+        self._rearm()
+
+    @property
+    def is_paused(self) -> bool:
+        """Check if the schedule is paused."""
+        return self._paused_at is not None
+
+    def pending_count(self) -> int:
+        """Get the number of pending (not cancelled) events."""
+        return sum(1 for event in self._queue if not event.cancelled)
+
+    def next_due(self, limit: int = 10) -> List[Tuple[float, Any]]:
+        """Get (milliseconds until due, owner) for the next pending events, soonest first."""
+        now = self._paused_at if self._paused_at is not None else self._now()
+        pending = heapq.nsmallest(limit, (event for event in self._queue if not event.cancelled))
+        return [(max(0.0, event.due - now), event.owner) for event in pending]
+
+    def _drop_cancelled(self) -> None:
+        """Pop cancelled events sitting at the head of the queue."""
+        while self._queue and self._queue[0].cancelled:
+            heapq.heappop(self._queue)
+
+    def _rearm(self) -> None:
+        """Point the timer at the next due event."""
+        self._drop_cancelled()
+        if self._paused_at is not None:
+            return
+        if not self._queue:
+            self._timer.stop()
+            return
+        delay = max(0, int(self._queue[0].due - self._now()))
+        if not self._timer.isActive() or self._timer.remainingTime() != delay:
+            self._timer.start(delay)
+
+    def _dispatch(self) -> None:
+        """Run every event due within the batch window, then re-arm for the next one."""
+        horizon = self._now() + self.BATCH_WINDOW_MS
+        batch = []
+        while self._queue and self._queue[0].due <= horizon:
+            event = heapq.heappop(self._queue)
+            if event.cancelled:
+                continue
+            batch.append(event)
+            if event.interval is not None:
+                event.due += event.interval
+                heapq.heappush(self._queue, event)
+
+        for event in batch:
+            if not event.cancelled:
+                event.callback()
+        self._rearm()
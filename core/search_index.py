@@ -0,0 +1,191 @@
+"""
+Search Index Module
+
+In-memory token index for search-as-you-type over the sound library.
+Every sound is indexed by the words of its name and category and a few
+format terms (extension, channel layout, sample rate). Each word typed is
+matched as a prefix: one- and two-letter prefixes map straight to their
+sounds, longer ones are looked up as a range of a sorted token list, so a
+keystroke costs a few set operations whatever the size of the library.
+"""
+
+import bisect
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase words, breaking on spaces, punctuation and underscores."""
+    return _WORD.findall(text.casefold())
+
+
+class SearchMatches:
+    """Result of a search, valid until the index changes."""
+
+    def __init__(self, index: "SearchIndex", ids: Set[int]):
+        self._index = index
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, file_path: str) -> bool:
+        return self._index._ids.get(file_path) in self._ids
+
+    def has_category(self, category: str) -> bool:
+        """Check if any sound of a category matched."""
+        ids = self._index._categories.get(category)
+        return ids is not None and not ids.isdisjoint(self._ids)
+
+    def last_path(self, category: str) -> Optional[str]:
+        """Get the last matching path of a category in sorted order, or None."""
+        ids = self._index._categories.get(category)
+        if not ids:
+            return None
+        return max((self._index._entries[i][0] for i in ids & self._ids), default=None)
+
+    def paths(self) -> List[str]:
+        """Get the matching paths, sorted."""
+        return sorted(self._index._entries[i][0] for i in self._ids)
+
+
+class SearchIndex:
+    """Prefix search over sound names, categories and formats."""
+
+    SHORT_PREFIX = 2  # Prefixes up to this length are stored directly
+
+    def __init__(self):
+        # Sounds are numbered so the posting sets hold small ints instead of paths
+        self._ids: Dict[str, int] = {}  # path -> id
+        self._entries: Dict[int, Tuple[str, str, Tuple[str, ...]]] = {}  # id -> (path, category, tokens)
+        self._free: List[int] = []
+        self._postings: Dict[str, Set[int]] = {}  # token -> ids
+        self._prefixes: Dict[str, Set[int]] = {}  # short prefix -> ids
+        self._categories: Dict[str, Set[int]] = {}  # category -> ids
+        self._sorted_tokens: Optional[List[str]] = None  # Rebuilt on the next search after tokens change
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, file_path: str) -> bool:
+        return file_path in self._ids
+
+    @staticmethod
+    def _terms(file_path: str, category: str, info: Optional[Dict[str, Any]]) -> Tuple[str, ...]:
+        """Get the searchable words of a sound: name, extension, category and format."""
+        terms = _WORD.findall(f"{os.path.basename(file_path)} {category}".casefold())
+        if info:
+            layout = {1: "mono", 2: "stereo"}.get(info.get("channels"))
+            if layout:
+                terms.append(layout)
+            if info.get("sample_rate"):
+                terms.append(str(info["sample_rate"]))
+        return tuple(dict.fromkeys(terms))
+
+    def rebuild(self, sounds: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]]) -> None:
+        """
+        Index a whole library at once, replacing the current entries.
+
+        Args:
+            sounds: (path, category, metadata or None) tuples
+        """
+        self.__init__()
+        occurrences: Dict[str, List[int]] = {}
+        for entry_id, (file_path, category, info) in enumerate(sounds):
+            tokens = self._terms(file_path, category, info)
+            self._ids[file_path] = entry_id
+            self._entries[entry_id] = (file_path, category, tokens)
+            for key in tokens + ("\0" + category,):
+                ids = occurrences.get(key)
+                if ids is None:
+                    occurrences[key] = [entry_id]
+                else:
+                    ids.append(entry_id)
+        # Short prefixes are merged per distinct word rather than per occurrence
+        prefixes: Dict[str, List[int]] = {}
+        for key, ids in occurrences.items():
+            if key[0] == "\0":
+                self._categories[key[1:]] = set(ids)
+                continue
+            self._postings[key] = set(ids)
+            for prefix in {key[:1], key[:self.SHORT_PREFIX]}:
+                prefixes.setdefault(prefix, []).extend(ids)
+        self._prefixes = {prefix: set(ids) for prefix, ids in prefixes.items()}
+
+    def add(self, file_path: str, category: str, info: Optional[Dict[str, Any]] = None) -> None:
+        """Index a sound, replacing its previous entry."""
+        if file_path in self._ids:
+            self.remove(file_path)
+        entry_id = self._free.pop() if self._free else len(self._ids)
+        tokens = self._terms(file_path, category, info)
+        self._ids[file_path] = entry_id
+        self._entries[entry_id] = (file_path, category, tokens)
+        self._categories.setdefault(category, set()).add(entry_id)
+        postings, prefixes = self._postings, self._prefixes
+        for token in tokens:
+            if token not in postings:
+                postings[token] = {entry_id}
+                self._sorted_tokens = None
+            else:
+                postings[token].add(entry_id)
+            for prefix in {token[:1], token[:self.SHORT_PREFIX]}:
+                if prefix in prefixes:
+                    prefixes[prefix].add(entry_id)
+                else:
+                    prefixes[prefix] = {entry_id}
+
+    def remove(self, file_path: str) -> None:
+        """Drop a sound from the index."""
+        entry_id = self._ids.pop(file_path, None)
+        if entry_id is None:
+            return
+        _, category, tokens = self._entries.pop(entry_id)
+        self._free.append(entry_id)
+        for table, keys in ((self._categories, (category,)), (self._postings, tokens),
+                            (self._prefixes, {prefix for token in tokens
+                                              for prefix in (token[:1], token[:self.SHORT_PREFIX])})):
+            for key in keys:
+                ids = table[key]
+                ids.discard(entry_id)
+                if not ids:
+                    del table[key]
+                    if table is self._postings:
+                        self._sorted_tokens = None
+
+    def category(self, file_path: str) -> Optional[str]:
+        """Get the category a sound is indexed under."""
+        entry_id = self._ids.get(file_path)
+        return self._entries[entry_id][1] if entry_id is not None else None
+
+    def _matching(self, term: str) -> Set[int]:
+        """Get the sounds with a word starting with ``term`` (may return an internal set)."""
+        if len(term) <= self.SHORT_PREFIX:
+            return self._prefixes.get(term, set())
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        tokens = self._sorted_tokens
+        start = bisect.bisect_left(tokens, term)
+        end = bisect.bisect_left(tokens, term + "\U0010ffff", start)
+        if end - start == 1:
+            return self._postings[tokens[start]]
+        return set().union(*(self._postings[token] for token in tokens[start:end]))
+
+    def search(self, query: str) -> Optional[SearchMatches]:
+        """
+        Find the sounds matching every word of a query as a prefix.
+
+        Returns:
+            The matches, or None if the query has no words
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+        candidates = sorted((self._matching(term) for term in dict.fromkeys(terms)), key=len)
+        ids = candidates[0]
+        if len(candidates) > 1:
+            ids = ids.intersection(*candidates[1:])
+        return SearchMatches(self, ids)
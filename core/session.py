@@ -51,6 +51,9 @@ class SessionManager(QObject):
                     "description": ""
                 })
             }
+            if session_data.get("seed") is not None:
+                # Seed of the auto-playback random streams, so the session replays identically
+                session["seed"] = int(session_data["seed"])
             
             with open(session_file, 'w', encoding='utf-8') as f:
                 json.dump(session, f, indent=2, ensure_ascii=False)
@@ -62,12 +65,13 @@ class SessionManager(QObject):
             print(f"Error saving session: {e}")
             return False
     
-    def load_session(self, filename: str) -> Optional[Dict[str, Any]]:
+    def load_session(self, filename: str, notify: bool = True) -> Optional[Dict[str, Any]]:
         """
         Load a mixer session from a JSON file.
         
         Args:
             filename: Name of the session file (with or without extension)
+            notify: Emit session_loaded with the data; off when the caller applies it itself
         
         Returns:
             Session data dictionary if successful, None otherwise
@@ -90,7 +94,8 @@ class SessionManager(QObject):
                 print("Invalid session format: missing 'tracks' key")
                 return None
             
-            self.session_loaded.emit(session)
+            if notify:
+                self.session_loaded.emit(session)
             return session
             
         except json.JSONDecodeError as e:
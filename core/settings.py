@@ -1,11 +1,10 @@
 """
 Settings Manager for Ambient Sound Mixer
 
-Handles application settings persistence (themes, language, future settings).
+Handles application settings persistence (themes, language, caches, future settings).
 """
 
 from PySide6.QtCore import QSettings, QLocale
-from PySide6.QtWidgets import QApplication
 
 
 class SettingsManager:
@@ -14,6 +13,31 @@ class SettingsManager:
     LIGHT_THEME = "light"
     DARK_THEME = "dark"
 
+    DEFAULT_PCM_CACHE_LIMIT_MB = 2048
+    DEFAULT_LOOP_CROSSFADE_MS = 25
+    DEFAULT_STREAMING_THRESHOLD = 600.0
+    DEFAULT_STREAM_LOOKAHEAD = 10.0
+
+    # Audio buffering profiles as (buffer ms, period ms)
+    LOW_LATENCY = "low_latency"
+    BALANCED = "balanced"
+    POWER_SAVER = "power_saver"
+    CUSTOM = "custom"
+    BUFFER_PROFILES = {
+        LOW_LATENCY: (20, 5),
+        BALANCED: (92, 23),
+        POWER_SAVER: (400, 100),
+    }
+    DEFAULT_BUFFER_PROFILE = BALANCED
+
+    DEFAULT_SESSION_CROSSFADE = 5.0
+
+    MIN_MASTER_GAIN_DB = -24.0
+    MAX_MASTER_GAIN_DB = 12.0
+
+    DEFAULT_MAX_VOICES = 32
+    DEFAULT_MAX_TRACK_VOICES = 4
+
     def __init__(self):
         self.settings = QSettings("Ambient Mixer", "Ambient Sound Mixer")
 
@@ -35,6 +59,117 @@ class SettingsManager:
         """Save the language setting."""
         self.settings.setValue("language", locale)
 
+    def get_pcm_cache_limit_mb(self) -> int:
+        """Get the size cap of the decoded PCM cache in megabytes."""
+        return int(self.settings.value("cache/pcm_limit_mb", self.DEFAULT_PCM_CACHE_LIMIT_MB))
+
+    def set_pcm_cache_limit_mb(self, limit_mb: int):
+        """Save the size cap of the decoded PCM cache."""
+        self.settings.setValue("cache/pcm_limit_mb", max(0, int(limit_mb)))
+
+    def get_loop_crossfade_ms(self) -> int:
+        """Get the crossfade applied at the loop seam in milliseconds (0 disables it)."""
+        return int(self.settings.value("audio/loop_crossfade_ms", self.DEFAULT_LOOP_CROSSFADE_MS))
+
+    def set_loop_crossfade_ms(self, crossfade_ms: int):
+        """Save the loop seam crossfade length."""
+        self.settings.setValue("audio/loop_crossfade_ms", max(0, int(crossfade_ms)))
+
+    def get_streaming_threshold(self) -> float:
+        """Get the duration in seconds above which sounds are streamed instead of cached."""
+        return float(self.settings.value("audio/streaming_threshold_s", self.DEFAULT_STREAMING_THRESHOLD))
+
+    def set_streaming_threshold(self, seconds: float):
+        """Save the streaming threshold."""
+        self.settings.setValue("audio/streaming_threshold_s", max(0.0, float(seconds)))
+
+    def get_stream_lookahead(self) -> float:
+        """Get how many seconds streaming tracks decode ahead of playback."""
+        return float(self.settings.value("audio/stream_lookahead_s", self.DEFAULT_STREAM_LOOKAHEAD))
+
+    def set_stream_lookahead(self, seconds: float):
+        """Save the streaming look-ahead window."""
+        self.settings.setValue("audio/stream_lookahead_s", max(1.0, float(seconds)))
+
+    def get_normalize_loudness(self) -> bool:
+        """Get whether sounds are normalized to a common loudness."""
+        return self.settings.value("audio/normalize_loudness", True, type=bool)
+
+    def set_normalize_loudness(self, enabled: bool):
+        """Save the loudness normalization setting."""
+        self.settings.setValue("audio/normalize_loudness", bool(enabled))
+
+    def get_buffer_profile(self) -> str:
+        """Get the audio buffering profile, defaulting to balanced."""
+        profile = self.settings.value("audio/buffer_profile", self.DEFAULT_BUFFER_PROFILE)
+        return profile if profile in self.BUFFER_PROFILES or profile == self.CUSTOM else self.DEFAULT_BUFFER_PROFILE
+
+    def set_buffer_profile(self, profile: str):
+        """Save the audio buffering profile."""
+        if profile in self.BUFFER_PROFILES or profile == self.CUSTOM:
+            self.settings.setValue("audio/buffer_profile", profile)
+
+    def get_custom_buffering(self) -> tuple:
+        """Get the custom (buffer ms, period ms) used by the custom profile."""
+        default_buffer, default_period = self.BUFFER_PROFILES[self.DEFAULT_BUFFER_PROFILE]
+        buffer_ms = int(self.settings.value("audio/buffer_ms", default_buffer))
+        period_ms = int(self.settings.value("audio/period_ms", default_period))
+        return buffer_ms, period_ms
+
+    def set_custom_buffering(self, buffer_ms: int, period_ms: int):
+        """Save the custom buffer and period sizes; the period never exceeds the buffer."""
+        period_ms = max(1, int(period_ms))
+        self.settings.setValue("audio/buffer_ms", max(period_ms, int(buffer_ms)))
+        self.settings.setValue("audio/period_ms", period_ms)
+
+    def get_buffering(self) -> tuple:
+        """Get the (buffer ms, period ms) of the current buffering profile."""
+        profile = self.get_buffer_profile()
+        if profile == self.CUSTOM:
+            return self.get_custom_buffering()
+        return self.BUFFER_PROFILES[profile]
+
+    def get_voice_limits(self) -> tuple:
+        """Get the caps on one-shot voices as (whole mix, per track)."""
+        max_voices = int(self.settings.value("audio/max_voices", self.DEFAULT_MAX_VOICES))
+        max_track_voices = int(self.settings.value("audio/max_track_voices", self.DEFAULT_MAX_TRACK_VOICES))
+        return max_voices, max_track_voices
+
+    def set_voice_limits(self, max_voices: int, max_track_voices: int):
+        """Save the caps on one-shot voices."""
+        self.settings.setValue("audio/max_voices", max(1, int(max_voices)))
+        self.settings.setValue("audio/max_track_voices", max(1, int(max_track_voices)))
+
+    def get_session_crossfade(self) -> float:
+        """Get the length in seconds of the crossfade when switching sessions."""
+        return float(self.settings.value("audio/session_crossfade_s", self.DEFAULT_SESSION_CROSSFADE))
+
+    def set_session_crossfade(self, seconds: float):
+        """Save the session switch crossfade length."""
+        self.settings.setValue("audio/session_crossfade_s", max(0.0, float(seconds)))
+
+    def get_master(self) -> tuple:
+        """Get the master bus settings as (gain in dB, limiter enabled, soft clipper enabled)."""
+        gain_db = float(self.settings.value("audio/master_gain_db", 0.0))
+        limiter = self.settings.value("audio/master_limiter", True, type=bool)
+        soft_clip = self.settings.value("audio/master_soft_clip", False, type=bool)
+        return gain_db, limiter, soft_clip
+
+    def set_master(self, gain_db: float, limiter: bool, soft_clip: bool):
+        """Save the master bus settings."""
+        gain_db = max(self.MIN_MASTER_GAIN_DB, min(self.MAX_MASTER_GAIN_DB, float(gain_db)))
+        self.settings.setValue("audio/master_gain_db", gain_db)
+        self.settings.setValue("audio/master_limiter", bool(limiter))
+        self.settings.setValue("audio/master_soft_clip", bool(soft_clip))
+
+    def get_output_format(self) -> str:
+        """Get the output format ("rate/channels") the PCM cache was last filled for."""
+        return self.settings.value("audio/output_format", "")
+
+    def set_output_format(self, sample_rate: int, channels: int):
+        """Save the output format the PCM cache is filled for."""
+        self.settings.setValue("audio/output_format", f"{int(sample_rate)}/{int(channels)}")
+
     def is_dark_theme(self) -> bool:
         """Check if current theme is dark."""
         return self.get_theme() == self.DARK_THEME
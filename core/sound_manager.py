@@ -2,23 +2,73 @@
 Sound Manager Module
 
 Handles loading and managing sound files from the 'sounds/' directory.
-Provides functionality to scan for audio files (.mp3, .wav, .ogg) organized by categories.
+Provides functionality to scan for audio files (.mp3, .wav, .ogg) organized by categories
+and to read their duration and format from the file headers.
+The library is kept in a persistent index, so the scan at startup only lists
+the category directories that changed since the last one; a manual refresh
+lists them all.
+The library directories are watched for changes; bursts of events are
+debounced into one rescan of the affected directories, reported as lists of
+added, removed and modified sounds.
+Duration and format of new or changed sounds are read in the background and
+stored in the index alongside them.
+A prefix search index over names, categories and formats is built in the
+background once the library is loaded, and then kept up to date with the
+same changes.
 """
 
 import os
 import sys
 import shutil
 from pathlib import Path
-from typing import Dict, List, Optional
-from PySide6.QtCore import QObject, Signal
+from typing import Any, Dict, List, Optional, Set, Tuple
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, QFileSystemWatcher, QTimer, QElapsedTimer
+from core.audio_info import probe
+from core.library_index import AUDIO_EXTENSIONS, LibraryChanges, LibraryIndex
+from core.metadata import MetadataExtractor
+from core.search_index import SearchIndex, SearchMatches
+
+
+class _SearchIndexSignals(QObject):
+    """Signals of the search index task, which is not a QObject itself."""
+
+    done = Signal()
+
+
+class _SearchIndexTask(QRunnable):
+    """Builds the search index of a library snapshot on a worker thread."""
+
+    def __init__(self, index: LibraryIndex, sounds: List[Tuple[str, str]], signals: _SearchIndexSignals):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.index = index
+        self.sounds = sounds
+        self.signals = signals
+        self.search_index = SearchIndex()
+
+    def run(self):
+        library_info = self.index.all_info()
+        self.search_index.rebuild((path, category, library_info.get(path)) for path, category in self.sounds)
+        try:
+            self.signals.done.emit()
+        except RuntimeError:
+            pass  # Sound manager was deleted while the index was being built
 
 
 class SoundManager(QObject):
     """Manages sound file discovery and organization."""
 
-    sounds_updated = Signal()
+    sounds_updated = Signal()  # Emitted after any change to the library
+    sounds_added = Signal(list)  # [(category, path), ...]
+    sounds_removed = Signal(list)  # [(category, path), ...]
+    sounds_modified = Signal(list)  # [(category, path), ...]
+    metadata_updated = Signal(list)  # Paths whose duration and format were just read
+
+    USER_CATEGORY = "User Sounds"
+    DEBOUNCE_MS = 500  # Quiet time after the last change before rescanning
+    MAX_DEBOUNCE_MS = 3000  # Longest a steady stream of changes can postpone the rescan
 
-    def __init__(self, sounds_dir: str = None):
+    def __init__(self, sounds_dir: str = None, index: LibraryIndex = None):
         super().__init__()
         if sounds_dir is None:
             if getattr(sys, '_MEIPASS', False):
@@ -39,8 +89,29 @@ class SoundManager(QObject):
         # Set up user sounds directory (always alongside the program/exe)
         self.user_sounds_dir = self._get_user_sounds_dir()
 
+        self.index = index if index is not None else LibraryIndex()
         self.categories: Dict[str, List[str]] = {}
+        self._audio_info: Dict[str, tuple] = {}  # path -> (size, mtime_ns, info) for sounds outside the library
+        self.extractor = MetadataExtractor(self.index, parent=self)
+        self.extractor.extracted.connect(self._on_metadata_extracted)
+        self._search_index: Optional[SearchIndex] = None  # Set once the background build is done
+        self._search_build: Optional[_SearchIndexTask] = None
+        self._search_backlog: List[Tuple[List[str], List[tuple], List[str]]] = []  # Changes during the build
+        self._search_pool = QThreadPool(self)
+        self._search_pool.setMaxThreadCount(1)
+        self._search_signals = _SearchIndexSignals()
+        self._search_signals.done.connect(self._on_search_index_built)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+        self._dirty: Set[str] = set()  # Directories changed since the last rescan
+        self._dirty_since = QElapsedTimer()
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._apply_changes)
         self._scan_sounds()
+        self._build_search_index()
 
     def _get_user_sounds_dir(self) -> Path:
         """Get the directory for user imported sounds (alongside the program/exe)."""
@@ -54,47 +125,85 @@ class SoundManager(QObject):
 
         return Path(exe_dir) / 'user_sounds'
 
-    def _scan_sounds(self) -> None:
-        """Scan the sounds directory for audio files (.mp3, .wav, .ogg) organized by category."""
-        self.categories.clear()
+    def _scan_sounds(self, force: Set[str] = frozenset(), full: bool = False) -> None:
+        """
+        Rescan the category directories (.mp3, .wav, .ogg files) and reload the categories from the index.
 
-        if not self.sounds_dir.exists():
+        Args:
+            force: Directories to list even if their modification time is unchanged
+            full: List every directory; a file rewritten in place leaves its directory's
+                modification time unchanged, so only a full listing notices it
+        """
+        directories = []
+        if self.sounds_dir.exists():
+            # Each subdirectory is a category
+            try:
+                with os.scandir(self.sounds_dir) as entries:
+                    directories = [(os.path.join(str(self.sounds_dir), entry.name), entry.name)
+                                   for entry in entries if entry.is_dir()]
+            except OSError as e:
+                print(f"Error scanning sounds directory: {e}")
+        else:
             print(f"Warning: Sounds directory '{self.sounds_dir}' does not exist")
-            return
-
-        # Supported audio file extensions
-        audio_extensions = ['*.mp3', '*.wav', '*.ogg']
-
-        # Scan each subdirectory as a category
-        for category_dir in self.sounds_dir.iterdir():
-            if category_dir.is_dir():
-                category_name = category_dir.name
-                sound_files = []
-
-                # Find all audio files in this category
-                for ext in audio_extensions:
-                    for sound_file in category_dir.glob(ext):
-                        if sound_file.is_file():
-                            sound_files.append(str(sound_file))
-
-                if sound_files:
-                    self.categories[category_name] = sorted(sound_files)
 
-        # Scan user sounds directory for imported files
+        # User sounds directory for imported files
         if self.user_sounds_dir.exists():
-            user_sound_files = []
-            for ext in audio_extensions:
-                for sound_file in self.user_sounds_dir.glob(ext):
-                    if sound_file.is_file():
-                        user_sound_files.append(str(sound_file))
-
-            if user_sound_files:
-                self.categories["User Sounds"] = sorted(user_sound_files)
+            directories.append((str(self.user_sounds_dir), self.USER_CATEGORY))
         else:
             # Create the directory if it doesn't exist
             self.user_sounds_dir.mkdir(parents=True, exist_ok=True)
 
-        self.sounds_updated.emit()
+        self._watch([str(self.sounds_dir)] + [directory for directory, _ in directories])
+        if full:
+            force = {directory for directory, _ in directories}
+        changes = self.index.rescan(directories, force)
+        if not changes and self.categories:
+            return  # Nothing to read back: the categories already match the index
+        categories = self.index.categories()
+        if changes or categories != self.categories:
+            if not changes:
+                changes = self._diff(self.categories, categories)
+            self.categories = categories
+            self._update_search_index([path for _, path in changes.removed],
+                                      changes.added + changes.modified, [])
+            if changes.removed:
+                self.sounds_removed.emit(changes.removed)
+            if changes.added:
+                self.sounds_added.emit(changes.added)
+            if changes.modified:
+                self.sounds_modified.emit(changes.modified)
+            self.sounds_updated.emit()
+            self.extractor.extract(path for _, path in changes.added + changes.modified)
+
+    @staticmethod
+    def _diff(old: Dict[str, List[str]], new: Dict[str, List[str]]) -> LibraryChanges:
+        """Get the sounds added and removed between two category listings."""
+        old_sounds = {(category, path) for category, paths in old.items() for path in paths}
+        new_sounds = {(category, path) for category, paths in new.items() for path in paths}
+        return LibraryChanges(sorted(new_sounds - old_sounds), sorted(old_sounds - new_sounds), [])
+
+    def _watch(self, paths: List[str]) -> None:
+        """Watch exactly the given directories for changes."""
+        wanted = {path for path in paths if os.path.isdir(path)}
+        watched = set(self.watcher.directories())
+        if watched - wanted:
+            self.watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self.watcher.addPaths(sorted(wanted - watched))
+
+    def _on_directory_changed(self, path: str) -> None:
+        """Note a changed directory and (re)start the debounce timer."""
+        if not self._dirty:
+            self._dirty_since.start()
+        self._dirty.add(path)
+        # Restart on every event, unless changes have kept coming for too long
+        if not self._debounce.isActive() or self._dirty_since.elapsed() < self.MAX_DEBOUNCE_MS:
+            self._debounce.start()
+
+    def _apply_changes(self) -> None:
+        """Rescan the directories changed since the last rescan."""
+        dirty, self._dirty = self._dirty, set()
+        self._scan_sounds(dirty)
     
     def get_categories(self) -> List[str]:
         """Get list of available sound categories."""
@@ -113,18 +222,130 @@ class SoundManager(QObject):
         return Path(file_path).stem
     
     def refresh(self) -> None:
-        """Refresh the sound library by re-scanning the directory."""
-        self._scan_sounds()
+        """Refresh the sound library by listing every category directory again."""
+        self._debounce.stop()
+        self._dirty = set()
+        self._scan_sounds(full=True)
     
     def get_all_sounds(self) -> Dict[str, List[str]]:
         """Get all sounds organized by category."""
         return self.categories.copy()
     
+    def get_audio_info(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Get duration, sample rate, channels and bitrate of a sound file, read once per file version."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        indexed = self.index.get_info(file_path)
+        if indexed is not None:
+            size, mtime_ns, probed, info = indexed
+            if probed and (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                return info
+        else:
+            cached = self._audio_info.get(file_path)
+            if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+                return cached[2]
+        info = probe(file_path)
+        if indexed is not None:
+            self.index.set_info(file_path, stat.st_size, stat.st_mtime_ns, info)
+        else:
+            self._audio_info[file_path] = (stat.st_size, stat.st_mtime_ns, info)
+        return info
+
+    def _on_metadata_extracted(self, file_paths: List[str]) -> None:
+        """Make newly read formats searchable and announce them."""
+        self._update_search_index([], [], file_paths)
+        self.metadata_updated.emit(file_paths)
+
+    def _build_search_index(self) -> None:
+        """Start indexing the loaded library for search in the background."""
+        sounds = [(path, category) for category, paths in self.categories.items() for path in paths]
+        self._search_build = _SearchIndexTask(self.index, sounds, self._search_signals)
+        self._search_pool.start(self._search_build)
+
+    def _on_search_index_built(self) -> None:
+        """Use the index built in the background, with the changes made meanwhile."""
+        task, self._search_build = self._search_build, None
+        if task is None:
+            return  # Already taken by a search that waited for it
+        self._search_index = task.search_index
+        backlog, self._search_backlog = self._search_backlog, []
+        for removed, added, extracted in backlog:
+            self._update_search_index(removed, added, extracted)
+
+    def _update_search_index(self, removed: List[str], added: List[tuple], extracted: List[str]) -> None:
+        """
+        Apply library changes to the search index, or keep them until its build is done.
+
+        Args:
+            removed: Paths of removed sounds
+            added: (category, path) tuples of added or modified sounds
+            extracted: Paths whose metadata was just read
+        """
+        if self._search_index is None:
+            if self._search_build is not None:
+                self._search_backlog.append((removed, added, extracted))
+            return  # Without a build running, the changes are part of the next snapshot
+        for path in removed:
+            self._search_index.remove(path)
+        for category, path in added:
+            self._search_index.add(path, category)
+        for path in extracted:
+            category = self._search_index.category(path)
+            if category is not None:
+                self._search_index.add(path, category, self.get_known_audio_info(path))
+
+    def search(self, query: str) -> Optional[SearchMatches]:
+        """
+        Find the sounds whose name, category or format words start with each word of a query.
+
+        A search made while the index is still being built waits for it.
+
+        Returns:
+            The matches, or None if the query has no words
+        """
+        if self._search_build is not None:
+            self._search_pool.waitForDone()
+            self._on_search_index_built()
+        return self._search_index.search(query)
+
+    def get_known_audio_info(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Get the stored metadata of a library sound without reading the file, or None if not read yet."""
+        indexed = self.index.get_info(file_path)
+        return indexed[3] if indexed is not None else None
+
+    def get_library_info(self) -> Dict[str, Dict[str, Any]]:
+        """Get the stored metadata of every library sound read so far."""
+        return self.index.all_info()
+
+    def extract_metadata(self) -> int:
+        """
+        Read in the background the metadata of every sound not read yet.
+
+        Returns:
+            Number of sounds queued
+        """
+        return self.extractor.extract(self.index.unprobed())
+
+    def shutdown(self) -> None:
+        """Stop reading metadata."""
+        self.extractor.shutdown()
+        self._search_pool.waitForDone()
+
+    def get_duration(self, file_path: str) -> Optional[float]:
+        """Get the duration of a sound file in seconds, or None if unknown."""
+        info = self.get_audio_info(file_path)
+        return info["duration"] if info else None
+
+    def get_all_sound_files(self) -> List[str]:
+        """Get a flat list of every sound file found by the last scan."""
+        return [path for sounds in self.categories.values() for path in sounds]
+
     def is_valid_sound_file(self, file_path: str) -> bool:
         """Check if the given path is a valid audio file (.mp3, .wav, .ogg)."""
         path = Path(file_path)
-        supported_extensions = ['.mp3', '.wav', '.ogg']
-        return path.exists() and path.suffix.lower() in supported_extensions and path.is_file()
+        return path.exists() and path.suffix.lower() in AUDIO_EXTENSIONS and path.is_file()
 
     def import_sounds(self, file_paths: List[str]) -> tuple[int, List[str]]:
         """
@@ -0,0 +1,365 @@
+"""
+Streaming Module
+
+Bounded-memory playback for long sound files.
+A background thread decodes ahead into a fixed-size ring buffer holding a
+configurable look-ahead window, so memory per track stays constant whatever
+the file length. The first window of the file is kept resident, which lets
+a looping stream wrap without a gap while the decoder restarts.
+Reads come from the audio thread, which never waits on the decoder nor
+allocates: the ring is lock-free, a jump forward just moves its read
+position (the decoder keeps going and drops the frames jumped over) and a
+jump back is posted to the decoder thread, which starts a new pass while the
+reader plays silence.
+"""
+
+import time
+from typing import Optional
+
+import numpy as np
+from PySide6.QtCore import QEventLoop, QThread
+
+from core.decoder import convert_buffer, create_decoder
+
+
+# Workers are kept referenced until they finish, even after their source is closed
+_workers = []
+
+
+class _RingBuffer:
+    """
+    Lock-free single-producer, single-consumer frame ring.
+
+    Positions are absolute frames of the file. The reader only stores
+    ``read``, ``target`` and ``request``; the decoder thread only stores
+    ``written``, ``serial``, ``start_frame`` and ``finished``, and resets
+    ``read`` while the reader waits for a new pass. Each store is a single
+    attribute assignment, atomic under the interpreter lock, so neither side
+    takes a lock; the decoder polls when it has to wait.
+    """
+
+    WAIT_SECONDS = 0.002  # First poll interval of the decoder thread
+    MAX_WAIT_SECONDS = 0.1  # Longest poll interval, reached while the ring stays full
+
+    def __init__(self, capacity: int, channels: int):
+        self.data = np.zeros((capacity, channels), dtype=np.float32)
+        self.capacity = capacity
+        self.start_frame = 0  # First frame of the current pass
+        self.written = 0  # Frames before this one have been produced
+        self.read = 0  # Frames before this one have been consumed
+        self.finished = False
+        self.closed = False
+        self.target = 0  # Frame the reader wants the next pass to start at
+        self.request = 1  # Bumped by the reader to ask for a new pass
+        self.serial = 0  # Request served by the current pass
+
+    @property
+    def ready(self) -> bool:
+        """Check if the current pass serves the reader's latest request."""
+        return self.serial == self.request
+
+    def ask(self, start: int) -> None:
+        """Ask the decoder for a new pass starting at ``start`` (reader)."""
+        self.target = start
+        self.request += 1  # Published once the target is set
+
+    def begin(self, start: int, serial: int) -> None:
+        """Start a pass at ``start`` serving request ``serial`` (decoder)."""
+        self.finished = False
+        self.start_frame = start
+        self.written = start
+        self.read = start
+        self.serial = serial  # Published last: the reader waits until then
+
+    def write(self, chunk: np.ndarray, chunk_start: int) -> bool:
+        """
+        Store the frames of a chunk not written yet, waiting while the ring is full (decoder).
+
+        Returns:
+            False if the ring was closed or a new pass was requested first
+        """
+        end = chunk_start + len(chunk)
+        wait = self.WAIT_SECONDS
+        while self.written < end:
+            if self.closed or self.request != self.serial:
+                return False
+            read = self.read
+            written = self.written
+            if read > written:
+                # Drop frames the reader already moved past, on underrun or after a jump
+                self.written = min(read, end)
+                continue
+            free = self.capacity - (written - read)
+            if free <= 0:
+                time.sleep(wait)
+                wait = min(wait * 2, self.MAX_WAIT_SECONDS)
+                continue
+            wait = self.WAIT_SECONDS
+            count = min(free, end - written)
+            offset = written - chunk_start
+            index = written % self.capacity
+            first = min(count, self.capacity - index)
+            self.data[index:index + first] = chunk[offset:offset + first]
+            self.data[:count - first] = chunk[offset + first:offset + count]
+            self.written = written + count  # Published once the frames are in place
+        return True
+
+    def read_into(self, start: int, out: np.ndarray, wait: bool = False) -> None:
+        """Fill ``out`` with the frames from ``start``, padding with silence on underrun unless waiting (reader)."""
+        if start > self.read:
+            self.read = start  # Jump forward: the decoder drops what was jumped over
+        end = start + len(out)
+        while wait and not self.finished and not self.closed and self.written < end:
+            time.sleep(self.WAIT_SECONDS)
+        count = min(len(out), max(0, self.written - start))
+        index = start % self.capacity
+        first = min(count, self.capacity - index)
+        out[:first] = self.data[index:index + first]
+        out[first:count] = self.data[:count - first]
+        out[count:] = 0.0
+        self.read = end
+
+    def finish(self) -> None:
+        """Mark the end of the file (decoder)."""
+        self.finished = True
+
+    def close(self) -> None:
+        """Stop the decoder thread."""
+        self.closed = True
+
+
+class _StreamWorker(QThread):
+    """
+    Decodes a file into a ring buffer, one pass per reader request.
+
+    A pass starting at or after the decoder's position keeps the same
+    decoder, which decodes on and drops the frames before the start; only a
+    pass starting before it restarts decoding from the top of the file.
+    """
+
+    def __init__(self, source: "StreamingSource", ring: _RingBuffer):
+        super().__init__()
+        self.source = source
+        self.ring = ring
+        self.decoder = None
+        self.generation = 0  # Numbers decoders, so late signals of a stopped one are ignored
+        self.loop: Optional[QEventLoop] = None
+        self.decoded = 0  # Frames the decoder has produced since the start of the file
+        self.pending: Optional[tuple] = None  # (start frame, chunk) interrupted by a request
+        self.decoder_done = False  # The decoder reached the end of the file or failed
+
+    def run(self):
+        ring = self.ring
+        self.loop = QEventLoop()
+        wait = ring.WAIT_SECONDS
+        while not ring.closed:
+            request = ring.request
+            if request == ring.serial:
+                # The pass ended (or was interrupted by close): wait for the next request
+                time.sleep(wait)
+                wait = min(wait * 2, ring.MAX_WAIT_SECONDS)
+                continue
+            wait = ring.WAIT_SECONDS
+            self._serve(ring.target, request)
+        self._stop_decoder()
+
+    def _serve(self, target: int, request: int) -> None:
+        """Run one pass starting at ``target`` until it ends or is interrupted."""
+        source = self.source
+        ring = self.ring
+        start = target
+        if source.head_complete and target < source.head_frames:
+            start = source.head_frames  # The reader serves the resident head itself
+        position = self.pending[0] if self.pending else self.decoded
+        if self.decoder is None or position > start:
+            self._start_decoder()
+        ring.begin(start, request)
+
+        if self.pending:
+            chunk_start, chunk = self.pending
+            if not ring.write(chunk, chunk_start):
+                return
+            self.pending = None
+        if self._drain() and not self.decoder_done:
+            self.loop.exec()
+
+    def _start_decoder(self) -> None:
+        """Start decoding from the top of the file."""
+        self._stop_decoder()
+        source = self.source
+        self.decoded = 0
+        self.pending = None
+        self.decoder_done = False
+        self.generation += 1
+        generation = self.generation
+        # Plain callables run on this thread; the worker object itself lives on the thread that created it
+        self.decoder = create_decoder(source.file_path, source.sample_rate, source.channels)
+        self.decoder.bufferReady.connect(lambda: generation == self.generation and self._drain())
+        self.decoder.finished.connect(lambda: generation == self.generation and self._on_finished())
+        self.decoder.error.connect(lambda error: generation == self.generation and self._on_error())
+        self.decoder.start()
+
+    def _stop_decoder(self) -> None:
+        """Stop and drop the current decoder."""
+        if self.decoder is not None:
+            self.decoder.stop()
+            self.decoder = None
+
+    def _drain(self) -> bool:
+        """
+        Write every decoded buffer available into the ring.
+
+        Returns:
+            False if the pass was interrupted, keeping the unwritten chunk for the next one
+        """
+        source = self.source
+        decoder = self.decoder
+        if decoder is None:
+            return True
+        while decoder.bufferAvailable():
+            buffer = decoder.read()
+            if not buffer.isValid():
+                continue
+            chunk = convert_buffer(buffer, source.sample_rate, source.channels)
+            chunk_start = self.decoded
+            self.decoded += len(chunk)
+            source.capture_head(chunk_start, chunk)
+            if not self.ring.write(chunk, chunk_start):
+                self.pending = (chunk_start, chunk)
+                self.loop.quit()
+                return False
+        if self.decoder_done:
+            self._end_pass()
+        return True
+
+    def _on_finished(self) -> None:
+        """Write what is left and end the pass once the decoder reaches the end of the file."""
+        self.decoder_done = True
+        self._drain()
+
+    def _on_error(self) -> None:
+        """End the pass on a decoding error; the next pass tries again from the top."""
+        print(f"Error streaming {self.source.file_path}: {self.decoder.errorString()}")
+        self._stop_decoder()
+        self.ring.finish()
+        self.loop.quit()
+
+    def _end_pass(self) -> None:
+        """Record the end of the file once every decoded frame has been written."""
+        if self.pending is None and not self.decoder.bufferAvailable():
+            self.source.set_total_frames(self.decoded)
+            self.ring.finish()
+            self.loop.quit()
+
+
+class StreamingSource:
+    """
+    PCM source that decodes a long file ahead of playback in a bounded window.
+
+    Reads are expected to be sequential. Reading further on keeps the
+    decoder running; reading from an earlier position asks it for a new pass
+    there, and plays silence (or the resident head) until the pass begins.
+    ``frames`` starts as an estimate taken from the file header and becomes
+    exact once the decoder has reached the end.
+    """
+
+    def __init__(self, file_path: str, sample_rate: int, channels: int,
+                 estimated_frames: int, lookahead_frames: int, blocking: bool = False):
+        self.file_path = file_path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.blocking = blocking  # Wait for the decoder instead of playing silence (offline rendering)
+        self.lookahead_frames = max(1, lookahead_frames)
+        self._estimated_frames = estimated_frames
+        self._total_frames: Optional[int] = None
+
+        # Resident copy of the first window so loops wrap while the decoder restarts
+        self.head = np.zeros((self.lookahead_frames, channels), dtype=np.float32)
+        self.head_frames = 0
+        self.head_complete = False
+
+        self._position = 0  # Frame the next sequential read starts at
+        self._ring: Optional[_RingBuffer] = None
+        self._worker: Optional[_StreamWorker] = None
+        self.open()
+
+    @property
+    def frames(self) -> int:
+        """Total frames, exact once known, otherwise never behind what was decoded."""
+        if self._total_frames is not None:
+            return self._total_frames
+        return max(self._estimated_frames, self._ring.written + 1)
+
+    def set_total_frames(self, frames: int) -> None:
+        """Record the exact length once a decoder pass reaches the end."""
+        self._total_frames = frames
+        if frames <= len(self.head):
+            self.head_complete = True
+
+    def capture_head(self, start: int, chunk: np.ndarray) -> None:
+        """Keep the first look-ahead window of the file resident (decoder thread)."""
+        if self.head_complete or start > self.head_frames:
+            return
+        count = min(len(chunk) - (self.head_frames - start), len(self.head) - self.head_frames)
+        if count > 0:
+            offset = self.head_frames - start
+            self.head[self.head_frames:self.head_frames + count] = chunk[offset:offset + count]
+            self.head_frames += count
+        if self.head_frames == len(self.head):
+            self.head_complete = True
+
+    def open(self) -> None:
+        """Start the decoder thread at the top of the file, unless it is running."""
+        if self._worker is not None and not self._ring.closed:
+            return
+        _workers[:] = [worker for worker in _workers if not worker.isFinished()]
+        self._ring = _RingBuffer(self.lookahead_frames, self.channels)
+        self._position = 0
+        self._worker = _StreamWorker(self, self._ring)
+        _workers.append(self._worker)
+        self._worker.start()
+
+    def _seek(self, start: int) -> None:
+        """Continue reading from ``start`` instead of the next frame (audio thread)."""
+        ring = self._ring
+        if start > self._position and ring.ready:
+            return  # The ring moves its read position forward on the next read
+        ring.ask(start)
+
+    def read_into(self, start: int, out: np.ndarray) -> None:
+        """Copy len(out) frames starting at ``start`` into ``out``."""
+        if start != self._position:
+            self._seek(start)
+        self._position = start + len(out)
+
+        count = len(out)
+        served = 0
+        if self.head_complete and start < self.head_frames:
+            # The head is resident, whatever the decoder is doing
+            served = min(count, self.head_frames - start)
+            out[:served] = self.head[start:start + served]
+        ring = self._ring
+        if served == count:
+            if ring.ready and ring.read < self._position:
+                ring.read = self._position  # A pass started inside the head keeps pace with it
+            return
+        while self.blocking and not ring.ready and not ring.closed:
+            time.sleep(ring.WAIT_SECONDS)
+        if ring.ready:
+            ring.read_into(start + served, out[served:], wait=self.blocking)
+        else:
+            out[served:] = 0.0  # The new pass has not begun yet
+
+    def skip(self, start: int, frames: int) -> None:
+        """Move past ``frames`` frames from ``start`` without reading them, keeping the decoder in step."""
+        if start != self._position:
+            self._seek(start)
+        self._position = start + frames
+        ring = self._ring
+        if ring.ready and self._position > ring.read:
+            ring.read = self._position
+
+    def close(self) -> None:
+        """Stop the decoder thread; open() starts it again."""
+        if self._ring:
+            self._ring.close()
@@ -8,6 +8,7 @@ by layering .ogg sounds with volume control, loop behavior, and automation.
 
 import sys
 import os
+import multiprocessing
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QDir, QTranslator, QLocale
 from PySide6.QtGui import QIcon
@@ -77,4 +78,5 @@ def load_translator(app: QApplication, locale: str):
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # Loudness analysis workers in the bundled executable
     sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Diagnostics Dialog
+
+Shows live audio output statistics: underruns, block mixing times, buffer
+fill, active voices and scheduler load, with export to JSON or CSV.
+Statistics are only polled while the dialog is visible.
+"""
+
+import os
+import time
+from typing import Any, Dict
+
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QPushButton,
+                               QPlainTextEdit, QFileDialog, QMessageBox, QApplication)
+from PySide6.QtCore import QTimer
+
+from core.diagnostics import export_csv, export_json
+
+
+class DiagnosticsDialog(QDialog):
+    """Live view of the audio engine diagnostics."""
+
+    REFRESH_MS = 500
+
+    def __init__(self, engine, scheduler=None, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.scheduler = scheduler
+        self._shown_events = 0.0  # Timestamp of the newest event already listed
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self._refresh)
+        self._setup_ui()
+        self.retranslate_ui()
+
+    def tr(self, text: str) -> str:
+        """Translate text using QApplication's translate method."""
+        return QApplication.translate("DiagnosticsDialog", text)
+
+    def _setup_ui(self):
+        """Set up the user interface."""
+        layout = QVBoxLayout(self)
+
+        self.form = QFormLayout()
+        self.values: Dict[str, QLabel] = {}
+        for key in ("latency", "underruns", "blocks", "block_time", "load", "buffer_fill",
+                    "voices", "sink", "scheduler"):
+            self.values[key] = QLabel("-")
+            self.form.addRow(QLabel(), self.values[key])
+        layout.addLayout(self.form)
+
+        self.events_label = QLabel()
+        layout.addWidget(self.events_label)
+        self.events_view = QPlainTextEdit()
+        self.events_view.setReadOnly(True)
+        self.events_view.setMaximumBlockCount(200)
+        layout.addWidget(self.events_view)
+
+        buttons = QHBoxLayout()
+        self.reset_btn = QPushButton()
+        self.reset_btn.clicked.connect(self._reset)
+        buttons.addWidget(self.reset_btn)
+        buttons.addStretch()
+        self.json_btn = QPushButton()
+        self.json_btn.clicked.connect(lambda: self._export("json"))
+        buttons.addWidget(self.json_btn)
+        self.csv_btn = QPushButton()
+        self.csv_btn.clicked.connect(lambda: self._export("csv"))
+        buttons.addWidget(self.csv_btn)
+        self.close_btn = QPushButton()
+        self.close_btn.clicked.connect(self.close)
+        buttons.addWidget(self.close_btn)
+        layout.addLayout(buttons)
+
+        self.resize(460, 480)
+
+    def retranslate_ui(self):
+        """Retranslate all UI elements."""
+        self.setWindowTitle(self.tr("Audio Diagnostics"))
+        labels = {
+            "latency": self.tr("Output latency:"),
+            "underruns": self.tr("Underruns:"),
+            "blocks": self.tr("Blocks mixed:"),
+            "block_time": self.tr("Block time (p50 / p95 / p99 / max):"),
+            "load": self.tr("Load at p99:"),
+            "buffer_fill": self.tr("Buffer fill (now / min):"),
+            "voices": self.tr("Active voices (now / max):"),
+            "sink": self.tr("Output state:"),
+            "scheduler": self.tr("Scheduled events:"),
+        }
+        for row, key in enumerate(self.values):
+            self.form.itemAt(row, QFormLayout.ItemRole.LabelRole).widget().setText(labels[key])
+        self.events_label.setText(self.tr("Recent events:"))
+        self.reset_btn.setText(self.tr("Reset"))
+        self.json_btn.setText(self.tr("Export JSON..."))
+        self.csv_btn.setText(self.tr("Export CSV..."))
+        self.close_btn.setText(self.tr("Close"))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the engine diagnostics together with the output and scheduler settings."""
+        snapshot = self.engine.diagnostics.snapshot()
+        snapshot["output"] = {
+            "sample_rate": self.engine.sample_rate,
+            "channels": self.engine.CHANNELS,
+            "buffer_ms": self.engine.buffer_ms,
+            "period_ms": self.engine.period_ms,
+            "latency_ms": self.engine.latency_ms,
+        }
+        if self.scheduler is not None:
+            upcoming = self.scheduler.next_due(1)
+            snapshot["scheduler"] = {
+                "pending": self.scheduler.pending_count(),
+                "next_due_ms": upcoming[0][0] if upcoming else None,
+            }
+        return snapshot
+
+    def _refresh(self):
+        """Update the labels from a new snapshot."""
+        snapshot = self.snapshot()
+        block = snapshot["block_ms"]
+        self.values["latency"].setText(self.tr("{:.0f} ms (buffer {} ms, period {} ms)").format(
+            snapshot["output"]["latency_ms"], snapshot["output"]["buffer_ms"], snapshot["output"]["period_ms"]))
+        self.values["underruns"].setText(str(snapshot["underruns"]))
+        self.values["blocks"].setText(str(snapshot["blocks"]))
+        self.values["block_time"].setText("{:.2f} / {:.2f} / {:.2f} / {:.2f} ms".format(
+            block["p50"], block["p95"], block["p99"], block["max"]))
+        self.values["load"].setText("{:.0%}".format(snapshot["load_p99"]))
+        self.values["buffer_fill"].setText("{:.0%} / {:.0%}".format(snapshot["buffer_fill"],
+                                                                    snapshot["buffer_fill_min"]))
+        self.values["voices"].setText("{} / {}".format(snapshot["voices"], snapshot["voices_max"]))
+        errors = snapshot["sink_errors"]
+        self.values["sink"].setText(self.tr("{} ({} error(s))").format(snapshot["sink_state"] or "-", errors))
+        scheduler = snapshot.get("scheduler")
+        if scheduler is None:
+            self.values["scheduler"].setText("-")
+        elif scheduler["next_due_ms"] is None:
+            self.values["scheduler"].setText(str(scheduler["pending"]))
+        else:
+            self.values["scheduler"].setText(self.tr("{} (next in {:.0f} ms)").format(
+                scheduler["pending"], scheduler["next_due_ms"]))
+
+        for timestamp, kind, detail in snapshot["events"]:
+            if timestamp > self._shown_events:
+                stamp = time.strftime("%H:%M:%S", time.localtime(timestamp))
+                self.events_view.appendPlainText(f"{stamp}  {kind}: {detail}")
+                self._shown_events = timestamp
+
+    def _reset(self):
+        """Clear the counters and the event list."""
+        self.engine.diagnostics.reset()
+        self.events_view.clear()
+        self._shown_events = 0.0
+        self._refresh()
+
+    def _export(self, file_format: str):
+        """Save a snapshot as JSON or CSV."""
+        default_name = time.strftime(f"audio-diagnostics-%Y%m%d-%H%M%S.{file_format}")
+        file_filter = self.tr("JSON Files (*.json)") if file_format == "json" else self.tr("CSV Files (*.csv)")
+        file_path, _ = QFileDialog.getSaveFileName(self, self.tr("Export Diagnostics"),
+                                                   os.path.join(os.getcwd(), default_name), file_filter)
+        if not file_path:
+            return
+        try:
+            if file_format == "json":
+                export_json(self.snapshot(), file_path)
+            else:
+                export_csv(self.snapshot(), file_path)
+        except OSError as e:
+            QMessageBox.warning(self, self.tr("Export Error"), self.tr("Could not export diagnostics: {}").format(e))
@@ -6,18 +6,29 @@ and mixer panel (right) with session management features.
 """
 
 import os
+import random
 from typing import Dict, List, Any
 from pathlib import Path
 
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
                              QPushButton, QLabel, QFileDialog, QMessageBox, QMenuBar, QMenu,
-                             QTreeView, QSizePolicy, QStatusBar, QScrollArea, QApplication)
+                             QTreeView, QSizePolicy, QStatusBar, QScrollArea, QApplication,
+                             QInputDialog, QSlider, QCheckBox, QProgressBar)
 from PySide6.QtCore import Qt, Signal, QSize, QTimer, QLocale
-from PySide6.QtGui import QAction, QIcon
+from PySide6.QtGui import QAction, QActionGroup, QIcon
 import qtawesome as qta
 from core.sound_manager import SoundManager
 from core.session import SessionManager
 from core.themes import ThemeManager
+from core.analysis import LoudnessAnalyzer, LoudnessIndex
+from core.engine import MixerEngine
+from core.master import db_to_gain
+from core.pcm_cache import PCMCache
+from core.peaks import PeakService
+from core.prepare import LibraryPreparer
+from core.scheduler import EventScheduler
+from core.settings import SettingsManager
+from ui.diagnostics_dialog import DiagnosticsDialog
 from ui.mixer_track_widget import MixerTrackWidget
 from ui.sound_library_widget import SoundLibraryWidget
 
@@ -26,13 +37,46 @@ class MainWindow(QMainWindow):
     """Main application window."""
 
     language_changed = Signal(str) # Signal to notify main.py of language change
+
+    SWITCH_TIMEOUT_MS = 15000  # Longest wait for a switched-to session's tracks to decode
+    METER_MS = 50  # Refresh interval of the gain reduction meter
+    METER_RANGE_DB = 20  # Gain reduction shown by a full meter
+    METER_FALL_DB = 1.0  # Meter fall per refresh, so short reductions stay visible
     
     def __init__(self):
         super().__init__()
         self.sound_manager = SoundManager()
         self.session_manager = SessionManager()
         self.theme_manager = ThemeManager()
+        self.settings_manager = SettingsManager()
+        cache_limit = self.settings_manager.get_pcm_cache_limit_mb() * 1024 * 1024
+        buffer_ms, period_ms = self.settings_manager.get_buffering()
+        self.engine = MixerEngine(PCMCache(max_bytes=cache_limit), self.sound_manager.get_duration, self,
+                                  buffer_ms=buffer_ms, period_ms=period_ms)
+        self.engine.loop_crossfade_ms = self.settings_manager.get_loop_crossfade_ms()
+        self.engine.streaming_threshold = self.settings_manager.get_streaming_threshold()
+        self.engine.stream_lookahead = self.settings_manager.get_stream_lookahead()
+        self.engine.set_voice_limits(*self.settings_manager.get_voice_limits())
+        gain_db, limiter, soft_clip = self.settings_manager.get_master()
+        self.engine.set_master(db_to_gain(gain_db), limiter, soft_clip)
+        self.engine.seed = random.randrange(2 ** 31)  # Kept when the session is saved
+        self._check_output_format()
+        self.preparer = LibraryPreparer(self.engine.cache, self.engine.sample_rate, self.engine.CHANNELS,
+                                        self.sound_manager.get_duration, self.engine.streaming_threshold,
+                                        parent=self)
+        self.scheduler = EventScheduler(self)
+        self.peak_service = PeakService(parent=self)
+        self.loudness_index = LoudnessIndex()
+        self.analyzer = LoudnessAnalyzer(self.loudness_index, self.engine.sample_rate, self.engine.CHANNELS,
+                                         str(self.engine.cache.cache_dir), parent=self)
+        self._set_normalization(self.settings_manager.get_normalize_loudness())
         self.tracks: Dict[str, MixerTrackWidget] = {}
+        self.diagnostics_dialog = None
+        self._switch_session_data = None  # Session being switched to, until its crossfade starts
+        self._switch_incoming: List[MixerTrackWidget] = []  # Tracks added silently for the switch
+        self._switch_pending = set()  # Engine tracks of incoming tracks still decoding
+        self._switch_outgoing: List[MixerTrackWidget] = []  # Tracks fading out, removed after the fade
+        self._switch_timeout = None
 
         self._setup_ui()
         self._setup_menus()
@@ -74,6 +118,8 @@ class MainWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Ready - Add sounds from the library to start mixing")
+        self.latency_label = QLabel()
+        self.status_bar.addPermanentWidget(self.latency_label)
     
     def _create_sound_library_panel(self) -> QWidget:
         """Create the sound library panel with category tree view."""
@@ -87,6 +133,7 @@ class MainWindow(QMainWindow):
         # Sound library tree view
         self.sound_library = SoundLibraryWidget()
         self.sound_library.set_sound_manager(self.sound_manager)
+        self.sound_library.set_peak_service(self.peak_service)
         self.sound_library.sound_selected.connect(self._on_sound_selected)
         
         
@@ -122,6 +169,14 @@ class MainWindow(QMainWindow):
         self.play_all_btn.setMinimumHeight(35)
         header_layout.addWidget(self.play_all_btn)
 
+        # Pause/Resume Mix button
+        self.pause_icon = qta.icon('fa5s.pause-circle', color='#ff9800')
+        self.resume_icon = qta.icon('fa5s.play-circle', color='#ff9800')
+        self.pause_mix_btn = QPushButton(self.pause_icon, self.tr(" Pause Mix"))
+        self.pause_mix_btn.clicked.connect(self._toggle_mix_pause)
+        self.pause_mix_btn.setMinimumHeight(35)
+        header_layout.addWidget(self.pause_mix_btn)
+
         # Clear Mixer button
         clear_icon = qta.icon('fa5s.trash-alt', color='#f44336')
         self.clear_btn = QPushButton(clear_icon, self.tr(" Clear Mixer"))
@@ -165,6 +220,40 @@ class MainWindow(QMainWindow):
         # Add scroll area to the layout
         layout.addWidget(scroll_area, 1)  # The '1' makes it stretch to fill available space
         
+        # Master bus: gain, limiter, soft clipper and gain reduction meter
+        master_layout = QHBoxLayout()
+        gain_db, limiter, soft_clip = self.settings_manager.get_master()
+        self.master_label = QLabel(self.tr("Master"))
+        master_layout.addWidget(self.master_label)
+        self.master_slider = QSlider(Qt.Orientation.Horizontal)
+        self.master_slider.setRange(int(SettingsManager.MIN_MASTER_GAIN_DB), int(SettingsManager.MAX_MASTER_GAIN_DB))
+        self.master_slider.setValue(int(round(gain_db)))
+        self.master_slider.valueChanged.connect(self._on_master_changed)
+        master_layout.addWidget(self.master_slider, 1)
+        self.master_gain_label = QLabel()
+        self.master_gain_label.setMinimumWidth(60)
+        master_layout.addWidget(self.master_gain_label)
+        self.limiter_check = QCheckBox(self.tr("Limiter"))
+        self.limiter_check.setChecked(limiter)
+        self.limiter_check.toggled.connect(self._on_master_changed)
+        master_layout.addWidget(self.limiter_check)
+        self.soft_clip_check = QCheckBox(self.tr("Soft Clip"))
+        self.soft_clip_check.setChecked(soft_clip)
+        self.soft_clip_check.toggled.connect(self._on_master_changed)
+        master_layout.addWidget(self.soft_clip_check)
+        self.reduction_meter = QProgressBar()
+        self.reduction_meter.setRange(0, self.METER_RANGE_DB * 10)  # Tenths of a dB
+        self.reduction_meter.setMaximumWidth(160)
+        master_layout.addWidget(self.reduction_meter)
+        layout.addLayout(master_layout)
+        self._meter_reduction = 0.0
+        self._update_master_labels()
+
+        self.meter_timer = QTimer(self)
+        self.meter_timer.setInterval(self.METER_MS)
+        self.meter_timer.timeout.connect(self._update_reduction_meter)
+        self.meter_timer.start()
+
         # Track count label
         self.track_count_label = QLabel(self.tr("No tracks loaded"))
         layout.addWidget(self.track_count_label)
@@ -201,6 +290,12 @@ class MainWindow(QMainWindow):
         self.load_action.triggered.connect(self._load_session)
         self.file_menu.addAction(self.load_action)
 
+        # Switch session action: preload the next session and crossfade into it
+        self.switch_action = QAction(self.tr("S&witch to Session..."), self)
+        self.switch_action.setShortcut("Ctrl+Shift+O")
+        self.switch_action.triggered.connect(self._switch_session)
+        self.file_menu.addAction(self.switch_action)
+
         self.file_menu.addSeparator()
         
         # Exit action
@@ -232,6 +327,41 @@ class MainWindow(QMainWindow):
         self.refresh_action.setShortcut("F5")
         self.refresh_action.triggered.connect(self._refresh_sound_library)
         self.view_menu.addAction(self.refresh_action)
+
+        # Convert the library to the output format ahead of time
+        self.prepare_action = QAction(self.tr("&Prepare Library for Output Device"), self)
+        self.prepare_action.triggered.connect(self._prepare_library)
+        self.view_menu.addAction(self.prepare_action)
+
+        # Loudness normalization toggle
+        self.normalize_action = QAction(self.tr("&Normalize Loudness"), self)
+        self.normalize_action.setCheckable(True)
+        self.normalize_action.setChecked(self.settings_manager.get_normalize_loudness())
+        self.normalize_action.toggled.connect(self._on_normalize_toggled)
+        self.view_menu.addAction(self.normalize_action)
+
+        # Audio buffering submenu
+        self.buffering_menu = self.view_menu.addMenu(self.tr("Audio &Buffering"))
+        self.buffering_group = QActionGroup(self)
+        self.buffering_actions = {}
+        for profile, text in self._buffering_profile_names().items():
+            action = QAction(text, self)
+            action.setCheckable(True)
+            action.triggered.connect(lambda checked, p=profile: self._set_buffer_profile(p))
+            self.buffering_group.addAction(action)
+            self.buffering_menu.addAction(action)
+            self.buffering_actions[profile] = action
+        self.buffering_actions[self.settings_manager.get_buffer_profile()].setChecked(True)
+
+        # Session switch crossfade length
+        self.session_crossfade_action = QAction(self.tr("Session &Crossfade..."), self)
+        self.session_crossfade_action.triggered.connect(self._set_session_crossfade)
+        self.view_menu.addAction(self.session_crossfade_action)
+
+        # Audio diagnostics panel
+        self.diagnostics_action = QAction(self.tr("Audio &Diagnostics..."), self)
+        self.diagnostics_action.triggered.connect(self._show_diagnostics)
+        self.view_menu.addAction(self.diagnostics_action)
         
         # Language submenu
         self.language_menu = self.view_menu.addMenu(self.tr("&Language"))
@@ -256,7 +386,14 @@ class MainWindow(QMainWindow):
 
     def _setup_connections(self):
         """Set up signal connections."""
-        self.sound_manager.sounds_updated.connect(self._populate_sound_library)
+        self.sound_manager.sounds_added.connect(self._on_sounds_added)
+        self.sound_manager.sounds_removed.connect(self._on_sounds_removed)
+        self.sound_manager.sounds_modified.connect(self._on_sounds_modified)
+        self.analyzer.analyzed.connect(self.engine.update_normalization)
+        self.analyzer.finished.connect(self._on_analysis_finished)
+        self.engine.latency_changed.connect(self._update_latency_label)
+        self.preparer.progress.connect(self._on_prepare_progress)
+        self.preparer.finished.connect(self._on_prepare_finished)
         self.session_manager.session_loaded.connect(self._restore_session)
         
     def _set_language(self, locale: str):
@@ -270,9 +407,15 @@ class MainWindow(QMainWindow):
         self.refresh_btn.setText(self.tr(" Refresh Library"))
         self.mixer_panel_header.setText(self.tr("Mixer Panel"))
         self.play_all_btn.setText(self.tr(" Play All"))
+        self._update_pause_button()
+        self._update_latency_label()
         self.clear_btn.setText(self.tr(" Clear Mixer"))
         self.save_btn.setText(self.tr(" Save Session"))
         self.load_btn.setText(self.tr(" Load Session"))
+        self.master_label.setText(self.tr("Master"))
+        self.limiter_check.setText(self.tr("Limiter"))
+        self.soft_clip_check.setText(self.tr("Soft Clip"))
+        self._update_master_labels()
         self._update_track_count()
         
         # Retranslate menus
@@ -280,6 +423,7 @@ class MainWindow(QMainWindow):
         self.import_action.setText(self.tr("&Import Sounds"))
         self.save_action.setText(self.tr("&Save Session"))
         self.load_action.setText(self.tr("&Load Session"))
+        self.switch_action.setText(self.tr("S&witch to Session..."))
         self.exit_action.setText(self.tr("E&xit"))
         
         self.view_menu.setTitle(self.tr("&View"))
@@ -287,6 +431,13 @@ class MainWindow(QMainWindow):
         self.light_theme_action.setText(self.tr("&Light Theme"))
         self.dark_theme_action.setText(self.tr("&Dark Theme"))
         self.refresh_action.setText(self.tr("&Refresh Library"))
+        self.prepare_action.setText(self.tr("&Prepare Library for Output Device"))
+        self.normalize_action.setText(self.tr("&Normalize Loudness"))
+        self.buffering_menu.setTitle(self.tr("Audio &Buffering"))
+        for profile, text in self._buffering_profile_names().items():
+            self.buffering_actions[profile].setText(text)
+        self.session_crossfade_action.setText(self.tr("Session &Crossfade..."))
+        self.diagnostics_action.setText(self.tr("Audio &Diagnostics..."))
         self.language_menu.setTitle(self.tr("&Language"))
         self.en_action.setText(self.tr("&English"))
         self.it_action.setText(self.tr("&Italian"))
@@ -298,15 +449,151 @@ class MainWindow(QMainWindow):
         for track_widget in self.tracks.values():
             track_widget.retranslate_ui() # Assuming MixerTrackWidget has a retranslate_ui method
         self.sound_library.retranslate_ui() # Assuming SoundLibraryWidget has a retranslate_ui method
+        if self.diagnostics_dialog is not None:
+            self.diagnostics_dialog.retranslate_ui()
 
     def _load_initial_sounds(self):
         """Load initial sound library."""
-        self._populate_sound_library()
-    
-    def _populate_sound_library(self):
-        """Trigger refresh of the sound library tree view."""
-        self.sound_library._update_tree()
+        self._prune_caches()
+        # Start measuring once the window is up; only new or changed sounds are analyzed
+        QTimer.singleShot(0, self._analyze_library)
+        QTimer.singleShot(0, self.sound_manager.extract_metadata)
     
+    def _prune_caches(self):
+        """Drop decoded PCM and waveform peaks of sounds that changed or left the library."""
+        sound_files = self.sound_manager.get_all_sound_files()
+        self.engine.cache.prune(sound_files)
+        self.peak_service.prune(sound_files)
+
+    def _check_output_format(self):
+        """Drop decoded audio of another output format once the device format has changed."""
+        current = f"{self.engine.sample_rate}/{self.engine.CHANNELS}"
+        previous = self.settings_manager.get_output_format()
+        if previous != current:
+            if previous:
+                self.engine.cache.retain_format(self.engine.sample_rate, self.engine.CHANNELS)
+            self.settings_manager.set_output_format(self.engine.sample_rate, self.engine.CHANNELS)
+
+    def _prepare_library(self):
+        """Convert every sound to the output format in the background."""
+        queued = self.preparer.prepare(self.sound_manager.get_all_sound_files())
+        if queued:
+            self.status_bar.showMessage(self.tr("Preparing {} sound(s) for the output device...").format(queued))
+
+    def _on_prepare_progress(self, handled: int, total: int):
+        """Show how far library preparation has come."""
+        self.status_bar.showMessage(self.tr("Preparing sounds for the output device: {}/{}").format(handled, total))
+
+    def _on_prepare_finished(self, count: int):
+        """Report the end of library preparation."""
+        self.status_bar.showMessage(self.tr("Prepared {} sound(s) for the output device").format(count), 3000)
+
+    def _analyze_library(self):
+        """Measure the loudness of new or changed sounds in the background."""
+        sound_files = self.sound_manager.get_all_sound_files()
+        self.loudness_index.prune(sound_files)
+        self.analyzer.analyze(sound_files)
+
+    def _on_sounds_added(self, sounds: list):
+        """Measure the loudness of sounds that appeared in the library."""
+        self.analyzer.analyze([sound_path for _, sound_path in sounds])
+
+    def _on_sounds_removed(self, sounds: list):
+        """Drop cached data of sounds that left the library."""
+        self._prune_caches()
+        self.loudness_index.prune(self.sound_manager.get_all_sound_files())
+
+    def _on_sounds_modified(self, sounds: list):
+        """Drop stale cached data of changed sounds and measure them again."""
+        self._prune_caches()
+        self.analyzer.analyze([sound_path for _, sound_path in sounds])
+
+    def _on_analysis_finished(self, count: int):
+        """Report the end of a loudness analysis batch."""
+        if count:
+            self.status_bar.showMessage(self.tr("Analyzed loudness of {} sound(s)").format(count), 3000)
+
+    def _set_normalization(self, enabled: bool):
+        """Apply or remove loudness normalization on every track."""
+        self.engine.set_normalization(self.loudness_index.normalization_gain if enabled else None)
+
+    def _on_normalize_toggled(self, checked: bool):
+        """Handle the loudness normalization toggle."""
+        self.settings_manager.set_normalize_loudness(checked)
+        self._set_normalization(checked)
+
+    def _buffering_profile_names(self) -> Dict[str, str]:
+        """Get the menu text of each audio buffering profile."""
+        return {
+            SettingsManager.LOW_LATENCY: self.tr("&Low Latency"),
+            SettingsManager.BALANCED: self.tr("&Balanced"),
+            SettingsManager.POWER_SAVER: self.tr("&Power Saver"),
+            SettingsManager.CUSTOM: self.tr("&Custom..."),
+        }
+
+    def _set_buffer_profile(self, profile: str):
+        """Switch the audio buffering profile, asking for the sizes of the custom one."""
+        if profile == SettingsManager.CUSTOM:
+            buffer_ms, period_ms = self.settings_manager.get_custom_buffering()
+            buffer_ms, ok = QInputDialog.getInt(self, self.tr("Custom Buffering"),
+                                                self.tr("Buffer size (ms):"), buffer_ms, 5, 2000)
+            if ok:
+                period_ms, ok = QInputDialog.getInt(self, self.tr("Custom Buffering"),
+                                                    self.tr("Period size (ms):"), min(period_ms, buffer_ms),
+                                                    1, buffer_ms)
+            if not ok:
+                self.buffering_actions[self.settings_manager.get_buffer_profile()].setChecked(True)
+                return
+            self.settings_manager.set_custom_buffering(buffer_ms, period_ms)
+        self.settings_manager.set_buffer_profile(profile)
+        self.engine.set_buffering(*self.settings_manager.get_buffering())
+
+    def _on_master_changed(self, *args):
+        """Apply and save the master bus controls."""
+        gain_db = self.master_slider.value()
+        limiter = self.limiter_check.isChecked()
+        soft_clip = self.soft_clip_check.isChecked()
+        self.settings_manager.set_master(gain_db, limiter, soft_clip)
+        self.engine.set_master(db_to_gain(gain_db), limiter, soft_clip)
+        self._update_master_labels()
+
+    def _update_master_labels(self):
+        """Show the master gain and the meter's unit."""
+        self.master_gain_label.setText(self.tr("{:+d} dB").format(self.master_slider.value()))
+        self.reduction_meter.setEnabled(self.limiter_check.isChecked())
+        self.reduction_meter.setFormat(self.tr("GR {:.1f} dB").format(self._meter_reduction))
+        self.reduction_meter.setToolTip(self.tr("Gain reduction of the master limiter"))
+
+    def _update_reduction_meter(self):
+        """Show the deepest limiter gain reduction since the last refresh, falling back slowly."""
+        reduction = max(self.engine.take_gain_reduction(), self._meter_reduction - self.METER_FALL_DB, 0.0)
+        if reduction == self._meter_reduction:
+            return
+        self._meter_reduction = reduction
+        self.reduction_meter.setValue(int(min(reduction, self.METER_RANGE_DB) * 10))
+        self.reduction_meter.setFormat(self.tr("GR {:.1f} dB").format(reduction))
+
+    def _set_session_crossfade(self):
+        """Ask for the length of the crossfade used when switching sessions."""
+        seconds, ok = QInputDialog.getDouble(self, self.tr("Session Crossfade"),
+                                             self.tr("Crossfade length (seconds):"),
+                                             self.settings_manager.get_session_crossfade(), 0.0, 60.0, 1)
+        if ok:
+            self.settings_manager.set_session_crossfade(seconds)
+
+    def _update_latency_label(self, latency_ms: float = None):
+        """Show the output latency in the status bar."""
+        if latency_ms is None:
+            latency_ms = self.engine.latency_ms
+        self.latency_label.setText(self.tr("Latency: {:.0f} ms").format(latency_ms) if latency_ms else "")
+
+    def _show_diagnostics(self):
+        """Open the audio diagnostics panel."""
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self.engine, self.scheduler, self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+
     def _on_sound_selected(self, sound_path: str):
         """Handle sound selection from the library."""
         self._add_track(sound_path)
@@ -354,7 +641,7 @@ class MainWindow(QMainWindow):
             return
         
         # Create track widget
-        track_widget = MixerTrackWidget(sound_file)
+        track_widget = MixerTrackWidget(sound_file, self.engine, self.scheduler, self.peak_service)
         track_widget.track_removed.connect(self._remove_track)
         
         # Insert before the stretch
@@ -371,6 +658,7 @@ class MainWindow(QMainWindow):
         if sound_file in self.tracks:
             track_widget = self.tracks[sound_file]
             track_widget.stop()
+            self.engine.remove_track(track_widget.track)
             self.mixer_layout.removeWidget(track_widget)
             track_widget.deleteLater()
             del self.tracks[sound_file]
@@ -407,6 +695,7 @@ class MainWindow(QMainWindow):
             
             session_data = {
                 "tracks": tracks_data,
+                "seed": self.engine.seed,
                 "metadata": {
                     "name": Path(filename).stem,
                     "description": f"Ambient mixer session with {len(tracks_data)} tracks"
@@ -429,11 +718,114 @@ class MainWindow(QMainWindow):
             if session:
                 self.status_bar.showMessage(self.tr("Loaded session: {}").format(Path(filename).stem), 3000)
     
+    def _switch_session(self):
+        """Switch to another session without stopping the current mix."""
+        if self._switch_session_data is not None or self._switch_outgoing:
+            self.status_bar.showMessage(self.tr("A session switch is already in progress"), 2000)
+            return
+
+        filename, ok = QFileDialog.getOpenFileName(
+            self, self.tr("Switch to Session"), "sessions", self.tr("JSON Files (*.json)"))
+
+        if ok and filename:
+            session = self.session_manager.load_session(filename, notify=False)
+            if session:
+                self._begin_session_switch(session)
+                self.status_bar.showMessage(self.tr("Preparing session: {}").format(Path(filename).stem))
+
+    def _begin_session_switch(self, session: Dict[str, Any]):
+        """
+        Add the incoming session's new tracks silently and start decoding them.
+
+        The current mix keeps playing; the crossfade starts once every new
+        track is ready, or after SWITCH_TIMEOUT_MS if some are slow to load.
+        """
+        self._switch_session_data = session
+        seed = session.get("seed")
+        self.engine.seed = int(seed) if seed is not None else random.randrange(2 ** 31)
+
+        for track_data in session.get("tracks", []):
+            sound_file = track_data.get("sound_file")
+            if sound_file in self.tracks or not (sound_file and os.path.exists(sound_file)):
+                continue
+            self._add_track(sound_file)
+            track_widget = self.tracks.get(sound_file)
+            if track_widget is None:
+                continue
+            track = track_widget.track
+            track.fade(False)  # Silent, auto-playback voices included, until the crossfade
+            self._switch_incoming.append(track_widget)
+            # Listen before anything loads: a pooled source reports ready as soon as it is attached
+            track.ready.connect(self._on_switch_track_settled)
+            track.failed.connect(self._on_switch_track_settled)
+            self._switch_pending.add(track)
+            track_widget.set_state(track_data)
+            track.load()
+            if track.is_ready:
+                self._switch_pending.discard(track)
+
+        if self._switch_pending:
+            self._switch_timeout = self.scheduler.schedule(self.SWITCH_TIMEOUT_MS, self._start_session_crossfade,
+                                                           owner=self)
+        else:
+            self._start_session_crossfade()
+
+    def _on_switch_track_settled(self):
+        """Count an incoming track as loaded (or failed) and crossfade once none are left."""
+        self._switch_pending.discard(self.sender())
+        if self._switch_session_data is not None and not self._switch_pending:
+            self._start_session_crossfade()
+
+    def _start_session_crossfade(self):
+        """Fade the incoming session in and the tracks it does not use out."""
+        session, self._switch_session_data = self._switch_session_data, None
+        self.scheduler.cancel(self._switch_timeout)
+        self._switch_timeout = None
+        self._switch_pending.clear()  # Late signals find no switch and are ignored
+
+        states = {data.get("sound_file"): data for data in session.get("tracks", [])}
+        incoming = [widget for widget in self._switch_incoming if self.tracks.get(widget.sound_file) is widget]
+        self._switch_incoming = []
+        self._switch_outgoing = [widget for sound_file, widget in self.tracks.items() if sound_file not in states]
+        for track_widget in self.tracks.values():
+            if track_widget not in incoming and track_widget.sound_file in states:
+                # Shared tracks take the new settings without restarting
+                track_widget.set_state(states[track_widget.sound_file])
+        for track_widget in incoming:
+            if not track_widget.is_playing and not track_widget.playback_auto_check.isChecked():
+                track_widget._toggle_playback()
+
+        seconds = self.settings_manager.get_session_crossfade()
+        self.engine.crossfade([widget.track for widget in incoming],
+                              [widget.track for widget in self._switch_outgoing], seconds)
+        # Outgoing tracks are removed once the fade has been heard
+        self.scheduler.schedule(seconds * 1000 + self.engine.latency_ms, self._finish_session_switch, owner=self)
+
+    def _finish_session_switch(self):
+        """Remove the tracks faded out by a session switch."""
+        for track_widget in self._switch_outgoing:
+            if self.tracks.get(track_widget.sound_file) is track_widget:
+                self._remove_track(track_widget.sound_file)
+        self._switch_outgoing = []
+        self.status_bar.showMessage(self.tr("Switched session: {} track(s) in the mixer").format(len(self.tracks)),
+                                    3000)
+
     def _restore_session(self, session: Dict[str, Any]):
         """Restore mixer state from session data."""
+        # A hard load replaces any session switch in progress
+        self.scheduler.cancel_owner(self)
+        self._switch_session_data = None
+        self._switch_incoming = []
+        self._switch_pending.clear()
+        self._switch_outgoing = []
+
         # Clear existing tracks
         for sound_file in list(self.tracks.keys()):
             self._remove_track(sound_file)
+
+        # Replay the session's auto-playback pattern; older sessions get a fresh seed
+        seed = session.get("seed")
+        self.engine.seed = int(seed) if seed is not None else random.randrange(2 ** 31)
         
         # Add tracks from session
         tracks_data = session.get("tracks", [])
@@ -468,6 +860,27 @@ class MainWindow(QMainWindow):
         else:
             self.status_bar.showMessage(self.tr("Started {} track(s)").format(played_count), 2000)
 
+    def _toggle_mix_pause(self):
+        """Pause or resume the whole mix, including pending automation and auto-playback."""
+        if self.scheduler.is_paused:
+            self.engine.resume()
+            self.scheduler.resume()
+            self.status_bar.showMessage(self.tr("Mix resumed"), 2000)
+        else:
+            self.engine.pause()
+            self.scheduler.pause()
+            self.status_bar.showMessage(self.tr("Mix paused"), 2000)
+        self._update_pause_button()
+
+    def _update_pause_button(self):
+        """Reflect the mix pause state on the Pause/Resume button."""
+        if self.scheduler.is_paused:
+            self.pause_mix_btn.setIcon(self.resume_icon)
+            self.pause_mix_btn.setText(self.tr(" Resume Mix"))
+        else:
+            self.pause_mix_btn.setIcon(self.pause_icon)
+            self.pause_mix_btn.setText(self.tr(" Pause Mix"))
+
     def _clear_mixer(self):
         """Clear all tracks from the mixer."""
         if not self.tracks:
@@ -486,5 +899,11 @@ class MainWindow(QMainWindow):
         # Stop all tracks
         for track_widget in self.tracks.values():
             track_widget.stop()
+        self.scheduler.clear()
+        self.analyzer.shutdown()
+        self.preparer.shutdown()
+        self.peak_service.shutdown()
+        self.sound_manager.shutdown()
+        self.engine.stop()
 
         event.accept()
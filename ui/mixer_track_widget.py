@@ -2,40 +2,44 @@
 Mixer Track Widget
 
 Represents an individual sound track in the mixer panel.
-Contains QMediaPlayer for playback, volume control, loop toggle, and automation features.
+Controls a track of the shared MixerEngine: volume control, loop toggle, and automation features.
 """
 
-import random
 from typing import Optional, Callable, Dict, Any
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QSlider, QPushButton, QComboBox, QCheckBox,
                              QGroupBox, QSpinBox, QApplication)
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PySide6.QtCore import Qt, QTimer, QUrl, Signal
+from PySide6.QtCore import Qt, Signal
 import qtawesome as qta
+from core.engine import MixerEngine
+from core.peaks import PeakService
+from core.scheduler import EventScheduler
+from ui.waveform_widget import WaveformWidget
 
 
 class MixerTrackWidget(QWidget):
     """Individual track widget for the mixer panel."""
     
     track_removed = Signal(str)  # Emitted when track is removed
+
+    AUTOMATION_SYNC_INTERVAL = 1000  # ms between slider refreshes while automated
     
-    def __init__(self, sound_file: str, parent=None):
+    def __init__(self, sound_file: str, engine: MixerEngine, scheduler: EventScheduler,
+                 peak_service: PeakService, parent=None):
         super().__init__(parent)
         self.sound_file = sound_file
-        self.player = None
-        self.audio_output = None
-        self.automation_timer = QTimer()
-        self.playback_timer = QTimer()
+        self.engine = engine
+        self.scheduler = scheduler
+        self.peak_service = peak_service
+        self.track = None
+        self.automation_event = None
         
         # Track state
-        self.volume_direction = 1  # 1 for increasing, -1 for decreasing
         self.original_volume = 50
         self.is_playing = False
         
         self._setup_audio()
         self._setup_ui()
-        self._setup_timers()
         # Set default loop
         self._on_loop_toggled(self.loop_check.isChecked())
         self.retranslate_ui()  # Initial retranslation after setup
@@ -64,17 +68,12 @@ class MixerTrackWidget(QWidget):
         self.loop_check.setText(self.tr("Loop"))
 
     def _setup_audio(self):
-        """Initialize QMediaPlayer and audio output."""
-        self.player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.player.setAudioOutput(self.audio_output)
-        
-        # Set the sound file
-        url = QUrl.fromLocalFile(self.sound_file)
-        self.player.setSource(url)
+        """Create the engine track controlled by this widget."""
+        self.track = self.engine.create_track(self.sound_file)
+        self.track.finished.connect(self._on_playback_finished)
         
         # Set initial volume
-        self.audio_output.setVolume(0.5)
+        self.track.set_volume(0.5)
     
     def _setup_ui(self):
         """Set up the user interface."""
@@ -87,6 +86,10 @@ class MixerTrackWidget(QWidget):
         
         self.info_group = QGroupBox(self.tr(sound_name))
         info_layout = QVBoxLayout(self.info_group)
+
+        # Waveform overview
+        self.waveform = WaveformWidget(self.peak_service, self.sound_file)
+        info_layout.addWidget(self.waveform)
         
         # Volume control
         volume_layout = QHBoxLayout()
@@ -156,6 +159,7 @@ class MixerTrackWidget(QWidget):
         self.interval_combo = QComboBox()
         self.interval_combo.addItems([self.tr("Fixed"), self.tr("Random")])
         self.interval_combo.setCurrentIndex(0)
+        self.interval_combo.currentIndexChanged.connect(self._on_interval_changed)
         playback_layout.addWidget(self.interval_combo)
         
         # Interval settings
@@ -163,6 +167,7 @@ class MixerTrackWidget(QWidget):
         self.interval_spin.setRange(1, 120)
         self.interval_spin.setValue(20)
         self.interval_spin.setSuffix(self.tr("s"))
+        self.interval_spin.valueChanged.connect(self._on_interval_changed)
         self.every_label = QLabel(self.tr("Every"))
         playback_layout.addWidget(self.every_label)
         playback_layout.addWidget(self.interval_spin)
@@ -185,15 +190,10 @@ class MixerTrackWidget(QWidget):
         for child in self.findChildren(QComboBox):
             child.setMinimumHeight(30)
     
-    def _setup_timers(self):
-        """Set up automation timers."""
-        self.automation_timer.timeout.connect(self._update_volume_automation)
-        self.playback_timer.timeout.connect(self._handle_auto_playback)
-    
     def _on_volume_changed(self, value: int):
         """Handle volume slider changes."""
-        if self.audio_output:
-            self.audio_output.setVolume(value / 100.0)
+        if self.track:
+            self.track.set_volume(value / 100.0)
         self.volume_label.setText(f"{value}%")
         
         if not self.volume_auto_check.isChecked():
@@ -204,97 +204,78 @@ class MixerTrackWidget(QWidget):
         if checked and self.playback_auto_check.isChecked():
             # Disable auto playback when loop is enabled
             self.playback_auto_check.setChecked(False)
-        if self.player:
-            self.player.setLoops(-1 if checked else 1)
+        if self.track:
+            self.track.set_loop(checked)
     
     def _toggle_playback(self):
         """Toggle playback state."""
-        if not self.player:
+        if not self.track:
             return
             
         if self.is_playing:
-            self.player.pause()
+            self.track.pause()
             self.is_playing = False
         else:
-            self.player.play()
+            self.track.play()
             self.is_playing = True
+
+    def _on_playback_finished(self):
+        """Handle a non-looping track reaching its end."""
+        self.is_playing = False
     
     def _remove_track(self):
         """Remove this track from the mixer."""
-        if self.player:
-            self.player.stop()
+        if self.track:
+            self.track.stop()
         self.track_removed.emit(self.sound_file)
     
     def _on_volume_auto_toggled(self, checked: bool):
         """Handle volume automation toggle."""
         if checked:
             self.original_volume = self.volume_slider.value()
-            interval = self._get_automation_interval()
-            self.automation_timer.start(interval)
+            self.track.set_volume_automation(True, self.speed_combo.currentIndex())
+            self.scheduler.cancel(self.automation_event)
+            self.automation_event = self.scheduler.schedule_repeating(
+                self.AUTOMATION_SYNC_INTERVAL, self._sync_automation_ui, self)
         else:
-            self.automation_timer.stop()
+            self.scheduler.cancel(self.automation_event)
+            self.automation_event = None
+            self.track.set_volume_automation(False)
             # Restore original volume
             self.volume_slider.setValue(self.original_volume)
+            self.track.set_volume(self.original_volume / 100.0)
     
     def _on_speed_changed(self):
         """Handle automation speed change."""
         if self.volume_auto_check.isChecked():
-            interval = self._get_automation_interval()
-            self.automation_timer.start(interval)
+            self.track.set_volume_automation(True, self.speed_combo.currentIndex())
     
-    def _get_automation_interval(self) -> int:
-        """Get automation interval in milliseconds based on speed selection."""
-        speed_index = self.speed_combo.currentIndex()
-        intervals = [10000, 5000, 2000]  # Slow, Medium, Fast
-        return intervals[speed_index]
-    
-    def _update_volume_automation(self):
-        """Update volume during automation."""
-        current_volume = self.volume_slider.value()
-        
-        # Smooth volume changes between 20% and 80%
-        new_volume = current_volume + (self.volume_direction * 5)
-        
-        if new_volume >= 80:
-            new_volume = 80
-            self.volume_direction = -1
-        elif new_volume <= 20:
-            new_volume = 20
-            self.volume_direction = 1
-        
-        self.volume_slider.setValue(new_volume)
+    def _sync_automation_ui(self):
+        """Reflect the automated engine volume on the slider without feeding it back."""
+        value = round(self.track.current_volume * 100)
+        if value != self.volume_slider.value():
+            self.volume_slider.blockSignals(True)
+            self.volume_slider.setValue(value)
+            self.volume_slider.blockSignals(False)
+            self.volume_label.setText(f"{value}%")
     
     def _on_playback_auto_toggled(self, checked: bool):
         """Handle playback automation toggle."""
+        self._update_auto_playback()
         if checked:
-            self._schedule_next_playback()
             # Disable loop when auto playback is active
             self.loop_check.setChecked(False)
-        else:
-            self.playback_timer.stop()
-    
-    def _schedule_next_playback(self):
-        """Schedule the next automatic playback."""
-        if not self.playback_auto_check.isChecked():
-            return
-            
-        interval_seconds = self.interval_spin.value()
-        
-        if self.interval_combo.currentIndex() == 1:  # Index 1 is Random
-            # Random interval between half and double the specified value
-            min_interval = max(1, interval_seconds // 2)
-            max_interval = interval_seconds * 2
-            interval_seconds = random.randint(min_interval, max_interval)
-        
-        self.playback_timer.start(interval_seconds * 1000)
-    
-    def _handle_auto_playback(self):
-        """Handle automatic playback trigger."""
-        if not self.is_playing:
-            self._toggle_playback()
-        
-        # Schedule next playback
-        self._schedule_next_playback()
+
+    def _on_interval_changed(self):
+        """Apply a new playback interval; the next trigger is counted from now."""
+        if self.playback_auto_check.isChecked():
+            self._update_auto_playback()
+
+    def _update_auto_playback(self):
+        """Send the playback automation settings to the engine, which times the triggers."""
+        # Random intervals fall between half and double the specified value
+        self.engine.set_auto_playback(self.track, self.playback_auto_check.isChecked(),
+                                      self.interval_spin.value(), self.interval_combo.currentIndex())
 
     def get_state(self) -> Dict[str, Any]:
         """Get current track state for session saving."""
@@ -314,20 +295,22 @@ class MixerTrackWidget(QWidget):
         self.volume_slider.setValue(state.get("volume", 50))
         self.loop_check.setChecked(state.get("loop", True))
         self.volume_auto_check.setChecked(state.get("volume_auto", False))
-        self.playback_auto_check.setChecked(state.get("playback_auto", False))
         self.speed_combo.setCurrentIndex(state.get("speed", 1))
+        # Set the interval first so auto playback starts with the saved one
         self.interval_combo.setCurrentIndex(state.get("interval_type", 0))
         self.interval_spin.setValue(state.get("interval", 20))
+        self.playback_auto_check.setChecked(state.get("playback_auto", False))
 
-        # Apply loop setting to player
+        # Apply loop setting to the engine track
         self._on_loop_toggled(self.loop_check.isChecked())
     
     def stop(self):
         """Stop playback and cleanup."""
-        if self.player:
+        if self.track:
             try:
-                self.player.stop()
+                self.track.stop()
+                self.engine.set_auto_playback(self.track, False)
             except RuntimeError:
-                pass  # Player might be already deleted
-        self.automation_timer.stop()
-        self.playback_timer.stop()
+                pass  # Track might be already deleted
+        self.scheduler.cancel_owner(self)
+        self.automation_event = None
@@ -0,0 +1,356 @@
+"""
+Sound Library Model
+
+Item model of the sound library: categories at the top level, their sounds
+as children, with name, duration and format columns.
+Rows are only paths in sorted lists; names, icons and metadata are produced
+when a view asks for them, and each category exposes its sounds in batches
+through fetchMore as the view scrolls. Library changes are applied as
+single row inserts and removals, so views keep their expansion and
+selection.
+"""
+
+import bisect
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import Qt, QAbstractItemModel, QModelIndex
+from PySide6.QtWidgets import QApplication
+import qtawesome as qta
+
+# Mapping of categories to qtawesome icon names (using Font Awesome 5 free icons)
+CATEGORY_ICONS = {
+    "animals": "fa5s.paw",
+    "nature": "fa5s.tree",
+    "noise": "fa5s.volume-up",
+    "places": "fa5s.building",
+    "rain": "fa5s.cloud-rain",
+    "things": "fa5s.cogs",
+    "transport": "fa5s.car",
+    "urban": "fa5s.city",
+    "walking": "fa5s.walking",
+    "User Sounds": "fa5s.user",
+}
+
+CATEGORY_ROLE = Qt.ItemDataRole.UserRole + 1  # Untranslated category name of category items
+
+_UNKNOWN = object()  # Metadata not looked up yet
+
+
+class SoundLibraryModel(QAbstractItemModel):
+    """
+    Categories and sounds of a SoundManager, fetched on demand.
+
+    Top-level indexes carry internal id 0; sound indexes carry the id of
+    their category, which never changes while the category exists, so
+    persistent indexes stay valid when categories come and go.
+    """
+
+    FETCH_BATCH = 256  # Sounds exposed per fetchMore call
+    COLUMNS = 3  # Name, duration, format
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sound_manager = None
+        # Parallel lists in row order
+        self.categories: List[str] = []
+        self.paths: List[List[str]] = []  # Sorted sound paths of each category
+        self._fetched: List[int] = []  # Rows exposed to views for each category
+        self._ids: List[int] = []
+        self._id_categories: Dict[int, str] = {}
+        self._next_id = 1
+        self._icons: Dict[str, Any] = {}
+        self._info: Dict[str, Any] = {}  # path -> metadata or None, filled as rows are shown
+
+    def tr(self, text: str) -> str:
+        """Translate text using QApplication's translate method (shares the widget's translations)."""
+        return QApplication.translate("SoundLibraryWidget", text)
+
+    def set_sound_manager(self, sound_manager):
+        """Show the library of a sound manager and follow its changes."""
+        self.sound_manager = sound_manager
+        sound_manager.sounds_added.connect(self.add_sounds)
+        sound_manager.sounds_removed.connect(self.remove_sounds)
+        sound_manager.sounds_modified.connect(self.update_sounds)
+        sound_manager.metadata_updated.connect(self.update_metadata)
+        self.reload()
+
+    def reload(self):
+        """Read the whole library again."""
+        self.beginResetModel()
+        self.categories, self.paths, self._fetched, self._ids = [], [], [], []
+        self._id_categories = {}
+        self._info = {}
+        if self.sound_manager is not None:
+            for category in sorted(self.sound_manager.get_categories()):
+                self._insert_category(len(self.categories), category,
+                                      list(self.sound_manager.get_sounds_in_category(category)))
+        self.endResetModel()
+
+    def retranslate(self):
+        """Refresh the header and every shown text after a language change."""
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.COLUMNS - 1)
+        if self.categories:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.categories) - 1, 0))
+        for row, fetched in enumerate(self._fetched):
+            if fetched:
+                parent = self.index(row, 0)
+                self.dataChanged.emit(self.index(0, 0, parent), self.index(fetched - 1, self.COLUMNS - 1, parent))
+
+    # Structure
+
+    def _insert_category(self, row: int, category: str, paths: List[str]):
+        """Add a category to the parallel lists (rows must be announced by the caller)."""
+        category_id = self._next_id
+        self._next_id += 1
+        self.categories.insert(row, category)
+        self.paths.insert(row, paths)
+        self._fetched.insert(row, 0)
+        self._ids.insert(row, category_id)
+        self._id_categories[category_id] = category
+
+    def category_row(self, category: str) -> int:
+        """Get the row of a category, or -1 if it is not in the model."""
+        row = bisect.bisect_left(self.categories, category)
+        return row if row < len(self.categories) and self.categories[row] == category else -1
+
+    def category_index(self, category: str) -> QModelIndex:
+        """Get the index of a category."""
+        row = self.category_row(category)
+        return self.index(row, 0) if row >= 0 else QModelIndex()
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not parent.isValid():
+            if 0 <= row < len(self.categories) and 0 <= column < self.COLUMNS:
+                return self.createIndex(row, column, 0)
+            return QModelIndex()
+        if parent.internalId() == 0 and 0 <= row < self._fetched[parent.row()] and 0 <= column < self.COLUMNS:
+            return self.createIndex(row, column, self._ids[parent.row()])
+        return QModelIndex()
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        row = self.category_row(self._id_categories.get(index.internalId(), ""))
+        return self.createIndex(row, 0, 0) if row >= 0 else QModelIndex()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self.categories)
+        if parent.internalId() == 0 and parent.column() == 0:
+            return self._fetched[parent.row()]
+        return 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return self.COLUMNS
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if not parent.isValid():
+            return bool(self.categories)
+        return parent.internalId() == 0 and parent.column() == 0 and bool(self.paths[parent.row()])
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return (parent.isValid() and parent.internalId() == 0
+                and self._fetched[parent.row()] < len(self.paths[parent.row()]))
+
+    def fetchMore(self, parent: QModelIndex):
+        if not self.canFetchMore(parent):
+            return
+        row = parent.row()
+        first = self._fetched[row]
+        last = min(len(self.paths[row]), first + self.FETCH_BATCH) - 1
+        self.beginInsertRows(parent, first, last)
+        self._fetched[row] = last + 1
+        self.endInsertRows()
+
+    def fetch_to(self, row: int, count: int):
+        """Expose at least the first count sounds of a category, e.g. to show search matches."""
+        first = self._fetched[row]
+        last = min(len(self.paths[row]), count) - 1
+        if last >= first:
+            self.beginInsertRows(self.index(row, 0), first, last)
+            self._fetched[row] = last + 1
+            self.endInsertRows()
+
+    def release(self, row: int):
+        """Hide the fetched sounds of a category again; they are fetched back when it is expanded."""
+        fetched = self._fetched[row]
+        if fetched:
+            self.beginRemoveRows(self.index(row, 0), 0, fetched - 1)
+            self._fetched[row] = 0
+            self.endRemoveRows()
+
+    def path(self, index: QModelIndex) -> Optional[str]:
+        """Get the sound path of an index, or None for categories."""
+        if not index.isValid() or index.internalId() == 0:
+            return None
+        row = self.category_row(self._id_categories.get(index.internalId(), ""))
+        return self.paths[row][index.row()] if row >= 0 else None
+
+    # Data
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return (self.tr("Name"), self.tr("Duration"), self.tr("Format"))[section]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.internalId() == 0:
+            return self._category_data(self.categories[index.row()], index.column(), role)
+        path = self.path(index)
+        if path is None:
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.UserRole:
+            return path
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return os.path.splitext(os.path.basename(path))[0]
+            duration, file_format, _ = self._describe(path)
+            return duration if column == 1 else file_format
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self._describe(path)[2]
+        if role == Qt.ItemDataRole.TextAlignmentRole and column == 1:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def _category_data(self, category: str, column: int, role: int):
+        """Get the data of a category row."""
+        if role == CATEGORY_ROLE:
+            return category
+        if column != 0:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            # Translate category name if it's "User Sounds"
+            return self.tr(category) if category == "User Sounds" else category
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._category_icon(category)
+        return None
+
+    def _category_icon(self, category: str):
+        """Get the icon of a category, created on first use."""
+        if category not in self._icons:
+            icon = None
+            if category in CATEGORY_ICONS:
+                try:
+                    # For Material Design Icons, use 'mdi.' prefix
+                    icon_name = CATEGORY_ICONS[category]
+                    if icon_name.startswith('mdi6.'):
+                        # Remove the '6' as it's not needed in the icon name
+                        icon_name = 'mdi.' + icon_name[5:]
+
+                    # Create the icon with the correct name and colors
+                    # Note: icons will be styled by the overall theme
+                    icon = qta.icon(icon_name,
+                                    color='#555555',  # Default color (will be overridden by theme)
+                                    color_active='#4CAF50')  # Green for active state
+                except Exception as e:
+                    print(self.tr(f"Error loading icon '{CATEGORY_ICONS[category]}' for {category}: {str(e)}"))
+            self._icons[category] = icon
+        return self._icons[category]
+
+    def _describe(self, path: str) -> Tuple[str, str, str]:
+        """Get the duration text, format text and tooltip of a sound."""
+        info = self._info.get(path, _UNKNOWN)
+        if info is _UNKNOWN:
+            info = self._info[path] = self.sound_manager.get_known_audio_info(path)
+        if not info:
+            return "", "", path
+        seconds = int(round(info["duration"]))
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        duration = f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+        channels = info["channels"] or 0
+        layout = {1: self.tr("mono"), 2: self.tr("stereo")}.get(channels, self.tr("{} ch").format(channels))
+        rate = self.tr("{:g} kHz").format((info["sample_rate"] or 0) / 1000)
+        file_format = f"{rate} {layout}"
+        tooltip = self.tr("{}\nDuration: {}\nFormat: {}").format(path, duration, file_format)
+        if info["bitrate"]:
+            tooltip += "\n" + self.tr("Bitrate: {} kbps").format(round(info["bitrate"] / 1000))
+        return duration, file_format, tooltip
+
+    # Library changes
+
+    def add_sounds(self, sounds: List[Tuple[str, str]]):
+        """Insert rows for new sounds, creating their categories if needed."""
+        new_categories: Dict[str, List[str]] = {}
+        for category, path in sounds:
+            row = self.category_row(category)
+            if row < 0:
+                new_categories.setdefault(category, []).append(path)
+                continue
+            paths = self.paths[row]
+            position = bisect.bisect_left(paths, path)
+            if position < len(paths) and paths[position] == path:
+                continue
+            if position < self._fetched[row] or self._fetched[row] == len(paths):
+                # Among the rows views know about, or right after them once all are shown: announce it
+                self.beginInsertRows(self.index(row, 0), position, position)
+                paths.insert(position, path)
+                self._fetched[row] += 1
+                self.endInsertRows()
+            else:
+                paths.insert(position, path)
+        for category, paths in new_categories.items():
+            row = bisect.bisect(self.categories, category)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._insert_category(row, category, sorted(set(paths)))
+            self.endInsertRows()
+
+    def remove_sounds(self, sounds: List[Tuple[str, str]]):
+        """Remove the rows of deleted sounds, and their categories once empty."""
+        for category, path in sounds:
+            row = self.category_row(category)
+            if row < 0:
+                continue
+            paths = self.paths[row]
+            position = bisect.bisect_left(paths, path)
+            if position == len(paths) or paths[position] != path:
+                continue
+            self._info.pop(path, None)
+            if position < self._fetched[row]:
+                self.beginRemoveRows(self.index(row, 0), position, position)
+                del paths[position]
+                self._fetched[row] -= 1
+                self.endRemoveRows()
+            else:
+                del paths[position]
+            if not paths:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._id_categories[self._ids[row]]
+                for rows in (self.categories, self.paths, self._fetched, self._ids):
+                    del rows[row]
+                self.endRemoveRows()
+
+    def _sound_changed(self, path: str, category: Optional[str] = None):
+        """Forget the cached metadata of a sound and repaint its row if shown."""
+        self._info.pop(path, None)
+        rows = [self.category_row(category)] if category is not None else range(len(self.paths))
+        for row in rows:
+            if row < 0:
+                continue
+            paths = self.paths[row]
+            position = bisect.bisect_left(paths, path)
+            if position < len(paths) and paths[position] == path:
+                if position < self._fetched[row]:
+                    parent = self.index(row, 0)
+                    self.dataChanged.emit(self.index(position, 0, parent),
+                                          self.index(position, self.COLUMNS - 1, parent))
+                return
+
+    def update_sounds(self, sounds: List[Tuple[str, str]]):
+        """Clear the stale details of modified sounds."""
+        for category, path in sounds:
+            self._sound_changed(path, category)
+
+    def update_metadata(self, paths: List[str]):
+        """Show the duration and format of sounds whose metadata was just read."""
+        for path in paths:
+            self._sound_changed(path)
@@ -2,40 +2,67 @@
 Sound Library Widget
 
 A tree view widget that displays sound files organized by category.
+The tree shows a SoundLibraryModel, which follows the sound manager's
+changes row by row and exposes sounds as they are scrolled into view, so
+the tree keeps its expansion and selection and never rebuilds.
+The search box filters the tree through a proxy model using the sound
+manager's search index.
 """
 
-import os
-from typing import Dict, List, Optional, Any
+import bisect
+from typing import List, Optional
 
-from PySide6.QtWidgets import (QTreeView, QVBoxLayout,
+from PySide6.QtWidgets import (QTreeView, QVBoxLayout, QHeaderView, QLineEdit,
                              QWidget, QAbstractItemView, QMenu, QApplication)
-from PySide6.QtCore import Qt, QDir, Signal, QModelIndex, QPoint, QSize
-from PySide6.QtGui import QStandardItemModel, QStandardItem, QAction, QIcon, QFont, QColor
-import qtawesome as qta
-
-# Mapping of categories to qtawesome icon names (using Font Awesome 5 free icons)
-CATEGORY_ICONS = {
-    "animals": "fa5s.paw",
-    "nature": "fa5s.tree",
-    "noise": "fa5s.volume-up",
-    "places": "fa5s.building",
-    "rain": "fa5s.cloud-rain",
-    "things": "fa5s.cogs",
-    "transport": "fa5s.car",
-    "urban": "fa5s.city",
-    "walking": "fa5s.walking",
-    "User Sounds": "fa5s.user",
-}
+from PySide6.QtCore import Qt, Signal, QModelIndex, QPoint, QSortFilterProxyModel
+from PySide6.QtGui import QAction, QKeySequence, QShortcut
+from ui.sound_library_model import SoundLibraryModel
+from ui.waveform_widget import WaveformWidget
+
+
+class SoundFilterModel(QSortFilterProxyModel):
+    """
+    Shows only the sounds of a search result, and the categories containing them.
+
+    Rows are checked against the library model's path lists directly
+    instead of through its data(). The widget fetches each matching
+    category far enough to include its last match.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._matches = None
+        self._library: Optional[SoundLibraryModel] = None
+
+    def setSourceModel(self, source_model: SoundLibraryModel):
+        self._library = source_model
+        super().setSourceModel(source_model)
+
+    def set_matches(self, matches):
+        """Filter by a search result (None shows everything)."""
+        self._matches = matches
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if self._matches is None:
+            return True
+        if source_parent.isValid():
+            return self._library.paths[source_parent.row()][source_row] in self._matches
+        return self._matches.has_category(self._library.categories[source_row])
 
 
 class SoundLibraryWidget(QWidget):
     """Widget that displays sound files in a tree view by category."""
     
     sound_selected = Signal(str)  # Emitted when a sound is selected
+
+    AUTO_EXPAND_MATCHES = 500  # Search results up to this many are shown with their categories expanded
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.sound_manager = None
+        self.preview = None
+        self._expanded_before_search: Optional[List[str]] = None  # Categories to expand again once cleared
         self._setup_ui()
         self.retranslate_ui() # Initial retranslation after setup
 
@@ -45,16 +72,30 @@ class SoundLibraryWidget(QWidget):
 
     def retranslate_ui(self):
         """Retranslate all UI elements in the widget."""
-        self._update_tree() # Rebuild the tree to retranslate category names and context menu actions
+        self.search_box.setPlaceholderText(self.tr("Search sounds..."))
+        self.model.retranslate()  # Category names, columns and tooltips
+        metrics = self.tree_view.fontMetrics()
+        samples = {1: ["0:00:00"], 2: [self.tr("{:g} kHz").format(44.1) + " " + self.tr("stereo")]}
+        for column, texts in samples.items():
+            texts.append(self.model.headerData(column, Qt.Orientation.Horizontal))
+            self.tree_view.header().resizeSection(
+                column, max(metrics.horizontalAdvance(text) for text in texts) + 2 * metrics.averageCharWidth())
     
     def _setup_ui(self):
         """Set up the user interface."""
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         
+        # Search box, focused with the standard Find shortcut
+        self.search_box = QLineEdit()
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self._apply_search)
+        layout.addWidget(self.search_box)
+        QShortcut(QKeySequence.StandardKey.Find, self, self.search_box.setFocus)
+        
         # Create tree view
         self.tree_view = QTreeView()
-        self.tree_view.setHeaderHidden(True)
+        self.tree_view.setUniformRowHeights(True)
         self.tree_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.tree_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tree_view.doubleClicked.connect(self._on_item_double_clicked)
@@ -63,8 +104,14 @@ class SoundLibraryWidget(QWidget):
         self._apply_styling()
         
         # Set up model
-        self.model = QStandardItemModel()
-        self.tree_view.setModel(self.model)
+        self.model = SoundLibraryModel(self)
+        self.proxy = SoundFilterModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.tree_view.setModel(self.proxy)
+        # Detail columns are sized from sample texts: fitting them to their contents would read every row
+        header = self.tree_view.header()
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         
         layout.addWidget(self.tree_view)
     
@@ -76,66 +123,46 @@ class SoundLibraryWidget(QWidget):
     def set_sound_manager(self, sound_manager):
         """Set the sound manager and connect signals."""
         self.sound_manager = sound_manager
-        self.sound_manager.sounds_updated.connect(self._update_tree)
-        self._update_tree()
-    
-    def _update_tree(self):
-        """Update the tree view with current sounds from sound manager."""
-        if not self.sound_manager:
-            return
-            
-        self.model.clear()
-        
-        # Get categories and sort them
-        categories = self.sound_manager.get_categories()
-        categories.sort()
-        
-        for category in categories:
-            # Create category item with icon
-            # Translate category name if it's "User Sounds"
-            display_category = self.tr(category) if category == "User Sounds" else category
-            category_item = QStandardItem(display_category)
-            category_item.setData(None, Qt.ItemDataRole.UserRole)  # No path for categories
-            
-            # Set icon for category using qtawesome
-            if category in CATEGORY_ICONS:
-                try:
-                    # For Material Design Icons, use 'mdi.' prefix
-                    icon_name = CATEGORY_ICONS[category]
-                    if icon_name.startswith('mdi6.'):
-                        # Remove the '6' as it's not needed in the icon name
-                        icon_name = 'mdi.' + icon_name[5:]
-                    
-                    # Create the icon with the correct name and colors
-                    # Note: icons will be styled by the overall theme
-                    icon = qta.icon(icon_name,
-                                 color='#555555',  # Default color (will be overridden by theme)
-                                 color_active='#4CAF50')  # Green for active state
-                    category_item.setIcon(icon)
-                except Exception as e:
-                    print(self.tr(f"Error loading icon '{CATEGORY_ICONS[category]}' for {category}: {str(e)}"))
-            
-            # Add sound files as children
-            sounds = self.sound_manager.get_sounds_in_category(category)
-            for sound_path in sounds:
-                # Removed Path import, using os.path.splitext for stem
-                sound_name = os.path.splitext(os.path.basename(sound_path))[0]
-                sound_item = QStandardItem(sound_name)
-                sound_item.setData(sound_path, Qt.ItemDataRole.UserRole)  # Store full path
-                category_item.appendRow(sound_item)
-            
-            self.model.appendRow(category_item)
-        
+        self.model.set_sound_manager(sound_manager)
+        # Connected after the model, so searches see the updated rows
+        self.sound_manager.sounds_added.connect(self._refresh_search)
+        self.sound_manager.sounds_removed.connect(self._refresh_search)
+        self.sound_manager.sounds_modified.connect(self._on_sounds_modified)
+        self.sound_manager.metadata_updated.connect(self._refresh_search)
         # Collapse all categories by default
         self.tree_view.collapseAll()
+
+    def reload(self):
+        """Read the whole library again, e.g. after the sound manager was replaced."""
+        self.model.reload()
+        self._refresh_search()
+    
+    def set_peak_service(self, peak_service):
+        """Show a waveform preview of the selected sound using the given peak service."""
+        self.preview = WaveformWidget(peak_service)
+        self.layout().addWidget(self.preview)
+        self.tree_view.selectionModel().currentChanged.connect(self._on_current_changed)
+
+    def _on_current_changed(self, current: QModelIndex, previous: QModelIndex):
+        """Preview the waveform of the newly selected sound."""
+        if self.preview is not None:
+            self.preview.set_file(current.siblingAtColumn(0).data(Qt.ItemDataRole.UserRole)
+                                  if current.isValid() else None)
+
+    def _on_sounds_modified(self, sounds: list):
+        """Refresh the preview if the selected sound was modified."""
+        self._refresh_search()
+        if self.preview is None:
+            return
+        current = self.tree_view.currentIndex()
+        selected = current.siblingAtColumn(0).data(Qt.ItemDataRole.UserRole) if current.isValid() else None
+        if selected is not None and any(sound_path == selected for _, sound_path in sounds):
+            self.preview.set_file(None)
+            self.preview.set_file(selected)
     
     def _on_item_double_clicked(self, index: QModelIndex):
         """Handle double-click on an item."""
-        item = self.model.itemFromIndex(index)
-        if not item:
-            return
-            
-        sound_path = item.data(Qt.ItemDataRole.UserRole)
+        sound_path = index.siblingAtColumn(0).data(Qt.ItemDataRole.UserRole)
         if sound_path:  # Only emit if it's a sound file (not a category)
             self.sound_selected.emit(sound_path)
     
@@ -145,8 +172,7 @@ class SoundLibraryWidget(QWidget):
         if not index.isValid():
             return
             
-        item = self.model.itemFromIndex(index)
-        sound_path = item.data(Qt.ItemDataRole.UserRole)
+        sound_path = index.siblingAtColumn(0).data(Qt.ItemDataRole.UserRole)
         
         if not sound_path:  # Category item
             return
@@ -160,3 +186,42 @@ class SoundLibraryWidget(QWidget):
         
         # Show menu
         menu.exec(self.tree_view.viewport().mapToGlobal(position))
+
+    def _apply_search(self, text: str):
+        """Show only the sounds matching the search text, in expanded categories."""
+        matches = self.sound_manager.search(text) if self.sound_manager else None
+        if matches is not None and self._expanded_before_search is None:
+            self._expanded_before_search = [
+                category for category in self.model.categories
+                if self.tree_view.isExpanded(self.proxy.mapFromSource(self.model.category_index(category)))]
+        if matches is None and self._expanded_before_search is not None:
+            # Search cleared: back to the categories the user had open, dropping the rows
+            # fetched while searching so they are not all filtered back in
+            self.tree_view.collapseAll()
+            current = self.proxy.mapToSource(self.tree_view.currentIndex()).parent()
+            for row, category in enumerate(self.model.categories):
+                if category not in self._expanded_before_search and row != current.row():
+                    self.model.release(row)
+        self.proxy.set_matches(matches)
+        if matches is not None:
+            self._fetch_matches(matches)
+            if len(matches) <= self.AUTO_EXPAND_MATCHES:
+                self.tree_view.expandAll()
+        elif self._expanded_before_search is not None:
+            for category in self._expanded_before_search:
+                index = self.model.category_index(category)
+                if index.isValid():
+                    self.tree_view.expand(self.proxy.mapFromSource(index))
+            self._expanded_before_search = None
+
+    def _fetch_matches(self, matches):
+        """Fetch the sounds of every matching category up to its last match."""
+        for row, category in enumerate(self.model.categories):
+            last = matches.last_path(category)
+            if last is not None:
+                self.model.fetch_to(row, bisect.bisect_left(self.model.paths[row], last) + 1)
+
+    def _refresh_search(self, *args):
+        """Apply the current search again after the library changed."""
+        if self.search_box.text():
+            self._apply_search(self.search_box.text())
@@ -0,0 +1,103 @@
+"""
+Waveform Widget
+
+Draws the waveform overview of a sound file from the shared peak cache.
+Only the pyramid level matching the widget width is read, and it is kept
+until the widget is resized or the file changes.
+"""
+
+from typing import Optional
+
+import numpy as np
+from PySide6.QtWidgets import QWidget, QSizePolicy
+from PySide6.QtCore import QLineF, QSize
+from PySide6.QtGui import QPainter, QPalette
+
+from core.peaks import PeakService
+
+
+class WaveformWidget(QWidget):
+    """Min/max waveform overview of a sound file."""
+
+    def __init__(self, peak_service: PeakService, sound_file: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        self.peak_service = peak_service
+        self.sound_file = sound_file
+        self._lines = None  # Cached column lines for the current width
+        self._lines_width = 0
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.peak_service.peaks_ready.connect(self._on_peaks_ready)
+
+    def sizeHint(self) -> QSize:
+        return QSize(200, 40)
+
+    def minimumSizeHint(self) -> QSize:
+        return QSize(50, 24)
+
+    def set_file(self, sound_file: Optional[str]) -> None:
+        """Show the waveform of another file (None clears it)."""
+        if sound_file == self.sound_file:
+            return
+        self.sound_file = sound_file
+        self._lines = None
+        self.update()
+
+    def _on_peaks_ready(self, sound_file: str) -> None:
+        """Redraw once the pyramid of the shown file has been computed."""
+        if sound_file == self.sound_file:
+            self._lines = None
+            self.update()
+
+    def resizeEvent(self, event):
+        self._lines = None
+        super().resizeEvent(event)
+
+    def _columns(self, width: int) -> Optional[np.ndarray]:
+        """Get (min, max) per pixel column, or None while the peaks are not ready."""
+        peaks = self.peak_service.peaks(self.sound_file, width)
+        if peaks is None or len(peaks) == 0:
+            return None
+        count = len(peaks)
+        if count >= width:
+            # Merge the buckets falling into each column
+            edges = (np.arange(width) * count) // width
+            lows = np.minimum.reduceat(peaks[:, 0], edges)
+            highs = np.maximum.reduceat(peaks[:, 1], edges)
+        else:
+            # Short file: stretch the buckets across the columns
+            index = (np.arange(width) * count) // width
+            lows = peaks[index, 0]
+            highs = peaks[index, 1]
+        return np.stack((lows, highs), axis=1)
+
+    def _build_lines(self) -> None:
+        """Convert the columns for the current size into line segments."""
+        width = self.width()
+        self._lines_width = width
+        self._lines = []
+        if not self.sound_file or width <= 0:
+            return
+        columns = self._columns(width)
+        if columns is None:
+            return
+        middle = self.height() / 2.0
+        scale = middle - 1.0
+        tops = middle - columns[:, 1] * scale
+        bottoms = middle - columns[:, 0] * scale
+        self._lines = [QLineF(x + 0.5, float(top), x + 0.5, float(bottom))
+                       for x, (top, bottom) in enumerate(zip(tops, bottoms))]
+
+    def paintEvent(self, event):
+        if self._lines is None or self._lines_width != self.width():
+            self._build_lines()
+
+        painter = QPainter(self)
+        palette = self.palette()
+        painter.fillRect(self.rect(), palette.color(QPalette.ColorRole.Base))
+        painter.setPen(palette.color(QPalette.ColorRole.Mid))
+        middle = self.height() / 2.0
+        painter.drawLine(QLineF(0, middle, self.width(), middle))
+        if self._lines:
+            painter.setPen(palette.color(QPalette.ColorRole.Highlight))
+            painter.drawLines(self._lines)
+        painter.end()